@@ -0,0 +1,96 @@
+"""
+Cost per utterance of collecting microphone audio: AudioData list +
+b''.join (old path) versus AudioAccumulator (one bytearray grown in place,
+handed on as a memoryview). For each utterance length it reports the median
+time, the peak traced memory, how many audio buffers (bytes/bytearray
+objects) were created and how many bytes were copied into them.
+
+    python benchmarks/bench_audio_accumulator.py [sample_rate] [iterations]
+"""
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "source"))
+
+from audio_buffer import AudioAccumulator
+
+SAMPLE_WIDTH = 2
+CHUNK = 1024
+SEGMENT_SECONDS = 5
+UTTERANCE_SECONDS = (5, 30, 120)
+# capture_utterance is given phrase_time_limit as max_seconds.
+MAX_SECONDS = 120
+
+
+def chunks(seconds, sample_rate):
+    chunk_bytes = CHUNK * SAMPLE_WIDTH
+    total = int(seconds * sample_rate) * SAMPLE_WIDTH
+    payload = os.urandom(chunk_bytes)
+    for _ in range(total // chunk_bytes):
+        yield payload
+
+
+def old_path(seconds, sample_rate):
+    # recognizer.listen() joins its frames into one AudioData per <=5 s segment,
+    # then transcribe_and_translate joined all segments again.
+    buffers = copied = 0
+    segments = []
+    frames = []
+    segment_bytes = SEGMENT_SECONDS * sample_rate * SAMPLE_WIDTH
+    size = 0
+    for chunk in chunks(seconds, sample_rate):
+        frames.append(bytes(chunk))
+        buffers, copied = buffers + 1, copied + len(chunk)
+        size += len(chunk)
+        if size >= segment_bytes:
+            segments.append(b"".join(frames))
+            buffers, copied = buffers + 1, copied + size
+            frames, size = [], 0
+    if frames:
+        segments.append(b"".join(frames))
+        buffers, copied = buffers + 1, copied + size
+    audio = b"".join(segments)
+    return len(audio), buffers + 1, copied + len(audio)
+
+
+def new_path(seconds, sample_rate):
+    accumulator = AudioAccumulator(sample_rate, SAMPLE_WIDTH, max_seconds=MAX_SECONDS)
+    for chunk in chunks(seconds, sample_rate):
+        accumulator.append(chunk)
+    view = accumulator.view()
+    # Appends copy each chunk once; a reallocation copies everything collected so far.
+    return len(view), 1 + accumulator.reallocations, len(view) * (1 + accumulator.reallocations)
+
+
+def measure(func, seconds, sample_rate, iterations):
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func(seconds, sample_rate)
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    size, buffers, copied = func(seconds, sample_rate)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size, peak, buffers, copied, statistics.median(timings)
+
+
+def main():
+    sample_rate = int(sys.argv[1]) if len(sys.argv) > 1 else 44100
+    iterations = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    print(f"{sample_rate} Hz, {SAMPLE_WIDTH * 8}-bit mono, max_seconds={MAX_SECONDS}")
+    print(f"{'utterance':>9} {'method':>12} {'median ms':>10} {'peak MB':>8} {'buffers':>8} {'copied MB':>10}")
+    for seconds in UTTERANCE_SECONDS:
+        for name, func in (("join", old_path), ("accumulator", new_path)):
+            size, peak, buffers, copied, elapsed = measure(func, seconds, sample_rate, iterations)
+            print(f"{seconds:>7} s {name:>12} {elapsed * 1000:10.1f} {peak / 1e6:8.1f} "
+                  f"{buffers:8d} {copied / 1e6:10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Recognizer upload encoding: speech_recognition's get_flac_data (flac
+subprocess) against the in-process encode_for_upload, per utterance length
+and microphone sample rate. Reports encode time and upload bytes.
+
+    python benchmarks/bench_audio_encoding.py [iterations]
+"""
+import os
+import statistics
+import sys
+import tempfile
+import time
+import wave
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "source"))
+
+import speech_recognition as sr
+
+from audio_encoding import encode_for_upload, HAS_SOUNDFILE, HAS_SOXR, CODEC_FLAC, CODEC_L16
+from fake_audio import write_speech_like_wav
+
+CASES = [(16000, 5.0), (16000, 30.0), (44100, 5.0), (48000, 30.0)]
+
+
+def load_audio(path):
+    with wave.open(str(path), "rb") as wav:
+        return sr.AudioData(wav.readframes(wav.getnframes()), wav.getframerate(), wav.getsampwidth())
+
+
+def timed(func, iterations):
+    timings, size = [], 0
+    for _ in range(iterations):
+        start = time.perf_counter()
+        size = len(func())
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), size
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    directory = Path(tempfile.mkdtemp(prefix="overlay-translator-encoding-"))
+    codecs = [CODEC_L16] + ([CODEC_FLAC] if HAS_SOUNDFILE else [])
+    print(f"soundfile: {HAS_SOUNDFILE}, soxr: {HAS_SOXR}")
+    print(f"{'input':>14} {'method':>22} {'median ms':>10} {'upload KiB':>11}")
+    for rate, seconds in CASES:
+        path = write_speech_like_wav(directory / f"{rate}-{seconds:.0f}.wav", sample_rate=rate,
+                                     lead_silence=0.5, speech=seconds - 1.0, tail_silence=0.5)
+        audio = load_audio(path)
+        label = f"{rate // 1000} kHz {seconds:.0f} s"
+        # Exactly what recognize_google sends.
+        rows = [("flac subprocess", lambda: audio.get_flac_data(
+            convert_rate=None if audio.sample_rate >= 8000 else 8000, convert_width=2))]
+        rows += [(f"in-process {codec}", lambda codec=codec: encode_for_upload(audio, codec).data) for codec in codecs]
+        for name, func in rows:
+            median, size = timed(func, iterations)
+            print(f"{label:>14} {name:>22} {median * 1000:10.1f} {size / 1024:11.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Cold start of the app in fast-start mode under Qt's offscreen platform.
+Runs `python -X importtime translator_main.py --fast-start --exit-after-startup`
+in a fresh process (and a throwaway HOME, so no saved settings are picked up),
+prints the slowest imports and the app's own startup timing report.
+
+    python benchmarks/bench_cold_start.py [runs] [top_imports]
+"""
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+
+SOURCE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "source")
+
+IMPORT_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+MARK_LINE = re.compile(r"^\[Startup\]\s+([\d.]+)\s+\(\+\s*[\d.]+\)\s+(.+?)\s+\[")
+
+
+def run_once():
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    with tempfile.TemporaryDirectory() as home:
+        env["HOME"] = home
+        env["APPDATA"] = home
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "translator_main.py", "--fast-start", "--exit-after-startup"],
+            cwd=SOURCE_DIR, env=env, capture_output=True, text=True, timeout=60,
+        )
+    imports = []
+    for line in result.stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            imports.append((int(cumulative_us), int(self_us), (len(indent) - 1) // 2, name))
+    marks = {}
+    report = []
+    for line in result.stdout.splitlines():
+        match = MARK_LINE.match(line)
+        if match:
+            marks[match.group(2)] = float(match.group(1))
+            report.append(line)
+    return imports, marks, report
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    top = int(sys.argv[2]) if len(sys.argv) > 2 else 15
+    results = [run_once() for _ in range(runs)]
+    imports, _, report = results[-1]
+
+    print("Slowest top-level imports (last run, cumulative):")
+    for cumulative_us, self_us, depth, name in sorted((i for i in imports if i[2] == 0), reverse=True)[:top]:
+        print(f"  {cumulative_us / 1000:8.1f} ms  (self {self_us / 1000:6.1f} ms)  {name}")
+    print("Slowest imports at any depth (last run, cumulative):")
+    for cumulative_us, self_us, depth, name in sorted(imports, reverse=True)[:top]:
+        print(f"  {cumulative_us / 1000:8.1f} ms  {'  ' * depth}{name}")
+
+    print()
+    print("\n".join(report) if report else "No startup report (did the app fail to start?)")
+    print()
+    for mark in ("tray visible", "event loop running", "background warm-up done"):
+        values = [marks[mark] for _, marks, _ in results if mark in marks]
+        if values:
+            print(f"{mark:>24}: median {statistics.median(values):7.1f} ms over {len(values)} runs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Tail latency of LibreTranslate requests spread over several replicas.
+
+Three stub replicas, one of them overloaded (a slice of its requests take
+much longer). Concurrent utterances go through a single endpoint, then
+through EndpointPool with each routing policy, with and without hedging.
+
+    python benchmarks/bench_endpoints.py [requests] [concurrency]
+"""
+import os
+import sys
+import time
+from contextlib import ExitStack
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "source"))
+
+from translation_client import LibreTranslateClient
+from endpoint_pool import EndpointPool
+from tracing import percentile
+from stub_servers import LibreTranslateStub
+
+LATENCY = 0.02
+SLOW_LATENCY = 0.3
+
+
+def drive(pool, requests_count, concurrency):
+    def one(i):
+        start = time.perf_counter()
+        result = pool.translate(f"tekst {i}", "pl", "en")
+        return time.perf_counter() - start, result is not None
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        outcomes = list(executor.map(one, range(requests_count)))
+    return [elapsed for elapsed, _ in outcomes], sum(1 for _, ok in outcomes if not ok)
+
+
+def report(name, pool, timings, failed):
+    print(f"{name:>24}: p50 {percentile(timings, 50) * 1000:7.1f} ms  "
+          f"p95 {percentile(timings, 95) * 1000:7.1f} ms  p99 {percentile(timings, 99) * 1000:7.1f} ms  "
+          f"failed {failed}  hedged {pool.hedged}  hedge wins {pool.hedge_wins}")
+
+
+def main():
+    requests_count = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    with ExitStack() as stack:
+        stubs = [
+            stack.enter_context(LibreTranslateStub(latency=LATENCY, seed=1, slow_rate=0.2, slow_latency=SLOW_LATENCY)),
+            stack.enter_context(LibreTranslateStub(latency=LATENCY, seed=2, slow_rate=0.02, slow_latency=SLOW_LATENCY)),
+            stack.enter_context(LibreTranslateStub(latency=LATENCY, seed=3, slow_rate=0.02, slow_latency=SLOW_LATENCY)),
+        ]
+        # A replica started with LT_LOAD_ONLY=en,de must never be asked for pl->en.
+        with LibreTranslateStub(latency=LATENCY, languages=("en", "de")) as partial:
+            pool = EndpointPool([LibreTranslateClient(partial.url), LibreTranslateClient(stubs[1].url)])
+            pool.languages(timeout=2.0)
+            pool.translate("tekst", "pl", "en")
+            print(f"partial replica requests: {partial.request_count}, full replica requests: {stubs[1].request_count}")
+            pool.close()
+
+        setups = [
+            ("single (overloaded)", [stubs[0].url], "ewma", False),
+            ("ewma", [s.url for s in stubs], "ewma", False),
+            ("least_outstanding", [s.url for s in stubs], "least_outstanding", False),
+            ("ewma + hedge", [s.url for s in stubs], "ewma", True),
+            ("least_outstanding + hedge", [s.url for s in stubs], "least_outstanding", True),
+        ]
+        for name, urls, routing, hedge in setups:
+            pool = EndpointPool([LibreTranslateClient(url) for url in urls], routing=routing, hedge=hedge)
+            timings, failed = drive(pool, requests_count, concurrency)
+            report(name, pool, timings, failed)
+            pool.close()
+
+
+if __name__ == "__main__":
+    main()
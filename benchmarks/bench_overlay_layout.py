@@ -0,0 +1,89 @@
+"""
+Cost of OverlayWindow.show_text for repeated status strings under Qt's
+offscreen platform, compared with the old throwaway-QLabel measurement.
+
+    python benchmarks/bench_overlay_layout.py [iterations]
+"""
+import os
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "source"))
+
+from PyQt6 import QtWidgets, QtCore, QtGui
+
+from modules import DEFAULT_CONFIG_STRUCT, OVERLAY_POSITIONS
+from overlay import OverlayWindow
+
+STATUS_TEXTS = [
+    "Calibrating noise (Google)...",
+    "Speak now (Google)...",
+    "Processing speech (Google)...",
+    "Translating (LibreTranslate)...",
+    "Hello, this is a typical translated sentence shown in the overlay.",
+]
+
+
+def make_overlay():
+    cfg = DEFAULT_CONFIG_STRUCT
+    return OverlayWindow(
+        initial_width=cfg["overlay_min_width"],
+        initial_height=cfg["overlay_short_text_min_height"],
+        initial_position_key=cfg["overlay_position"],
+        font_size=cfg["font_size"],
+        text_color=cfg["text_color"],
+        background_color=cfg["background_color"],
+        padding=cfg["padding"],
+        overlay_min_width=cfg["overlay_min_width"],
+        overlay_max_width=cfg["overlay_max_width"],
+        overlay_min_height=cfg["overlay_min_height"],
+        overlay_max_height=cfg["overlay_max_height"],
+        overlay_short_text_min_height=cfg["overlay_short_text_min_height"],
+        overlay_short_text_max_height=cfg["overlay_short_text_max_height"],
+        overlay_display_time=cfg["overlay_display_time"],
+        overlay_positions_map=OVERLAY_POSITIONS,
+    )
+
+
+def old_measure(overlay, text):
+    temp_label = QtWidgets.QLabel(text)
+    temp_label.setWordWrap(True)
+    temp_label.setFont(QtGui.QFont("Arial", overlay.FONT_SIZE))
+    metrics = QtGui.QFontMetrics(temp_label.font())
+    text_rect = metrics.boundingRect(QtCore.QRect(0, 0, overlay.OVERLAY_MAX_WIDTH - (2 * overlay.PADDING), 0),
+                                     QtCore.Qt.TextFlag.TextWordWrap, text)
+    new_width = max(overlay.OVERLAY_MIN_WIDTH, min(overlay.OVERLAY_MAX_WIDTH, text_rect.width() + 2 * overlay.PADDING))
+    temp_label.setFixedWidth(new_width - (2 * overlay.PADDING))
+    temp_label.adjustSize()
+    return new_width, max(overlay.OVERLAY_MIN_HEIGHT, temp_label.height() + overlay.PADDING + 1)
+
+
+def timed(func, iterations):
+    start = time.perf_counter()
+    for i in range(iterations):
+        func(STATUS_TEXTS[i % len(STATUS_TEXTS)])
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    app = QtWidgets.QApplication(sys.argv)
+    overlay = make_overlay()
+
+    old_us = timed(lambda text: old_measure(overlay, text), iterations)
+    new_us = timed(lambda text: overlay.layout_cache.measure(
+        text, overlay.FONT_SIZE, overlay.PADDING,
+        overlay.OVERLAY_MIN_WIDTH, overlay.OVERLAY_MAX_WIDTH, overlay.OVERLAY_MIN_HEIGHT), iterations)
+    show_us = timed(overlay.show_text, iterations)
+
+    print(f"measure, temp QLabel: {old_us:8.1f} us/call")
+    print(f"measure, layout cache: {new_us:8.1f} us/call "
+          f"(hits {overlay.layout_cache.hits}, misses {overlay.layout_cache.misses})")
+    print(f"show_text (total):    {show_us:8.1f} us/call")
+    overlay.hide_overlay_and_clear_text()
+    app.quit()
+
+
+if __name__ == "__main__":
+    main()
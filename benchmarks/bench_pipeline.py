@@ -0,0 +1,289 @@
+"""
+End-to-end latency of transcribe_and_translate, headless: a WAV file stands in
+for the microphone, local stubs for Google Speech and LibreTranslate, and Qt
+runs on the offscreen platform. Reports p50/p95/p99 per stage and end to end.
+
+    python benchmarks/bench_pipeline.py --runs 50 --recognize-latency 0.15 --translate-latency 0.05
+    python benchmarks/bench_pipeline.py --continuous --runs 30 --realtime   # hands-free captioning
+    python benchmarks/bench_pipeline.py --transcript-chars 600 --translate-latency-per-char 0.001   # long speech
+    python benchmarks/bench_pipeline.py --json results.json
+    python benchmarks/bench_pipeline.py --baseline results.json --tolerance 0.2   # exit 1 on p95 regression
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+# Settings, calibration and cache files go to a throwaway config dir, never the user's.
+_HOME = tempfile.mkdtemp(prefix="overlay-translator-bench-")
+os.environ["HOME"] = _HOME
+os.environ["APPDATA"] = _HOME
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "source"))
+
+from PyQt6 import QtWidgets, QtCore
+
+import translator_main
+from noise_calibration import NoiseCalibrator
+from pipeline import Pipeline
+from tracing import STAGES, percentile
+
+from bench_overlay_layout import make_overlay
+from fake_audio import WavMicrophone, write_speech_like_wav
+from stub_servers import GoogleSpeechStub, LibreTranslateStub
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--wav", help="mono WAV with one utterance (default: generated speech-like signal)")
+    parser.add_argument("--realtime", action="store_true", help="deliver audio at real-time speed")
+    parser.add_argument("--recognize-latency", type=float, default=0.1)
+    parser.add_argument("--translate-latency", type=float, default=0.03)
+    parser.add_argument("--translate-latency-per-char", type=float, default=0.0,
+                        help="extra translation time per character (long text translates slower)")
+    parser.add_argument("--transcript-chars", type=int, default=0,
+                        help="recognize every utterance as a punctuated text of about this length")
+    parser.add_argument("--codec", default="auto",
+                        help="recognizer audio codec: auto, flac, l16 or speech_recognition (flac subprocess)")
+    parser.add_argument("--no-segmentation", action="store_true", help="translate long text in one request")
+    parser.add_argument("--recognize-failure-rate", type=float, default=0.0)
+    parser.add_argument("--translate-failure-rate", type=float, default=0.0)
+    parser.add_argument("--calibrate-every-run", action="store_true",
+                        help="drop the stored noise calibration before every run")
+    parser.add_argument("--targets", default="pl", help="comma separated target languages (several = fan-out)")
+    parser.add_argument("--cache", action="store_true", help="enable the translation cache")
+    parser.add_argument("--pipeline", action="store_true",
+                        help="feed utterances back to back through the staged Pipeline (overlapping stages)")
+    parser.add_argument("--continuous", action="store_true",
+                        help="continuous captioning over one WAV holding --runs speech segments")
+    parser.add_argument("--timeout", type=float, default=30.0, help="per-utterance timeout (s)")
+    parser.add_argument("--json", help="write the summary to this file")
+    parser.add_argument("--baseline", help="summary JSON of an earlier run to compare p95 against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative p95 regression")
+    return parser.parse_args()
+
+
+_SENTENCES = (
+    "We looked at the quarterly results this morning.",
+    "Sales in Europe dropped by a few percent, while Asia grew faster than expected.",
+    "That more than covers the loss.",
+    "Next week we will decide whether to hire two more engineers for the mobile team.",
+)
+
+
+def make_transcript(chars):
+    """'hello world', or punctuated sentences adding up to about `chars` characters."""
+    if chars <= 0:
+        return "hello world"
+    sentences = []
+    while sum(len(s) + 1 for s in sentences) < chars:
+        sentences.append(_SENTENCES[len(sentences) % len(_SENTENCES)])
+    return " ".join(sentences)
+
+
+def configure_app(args, google_url, libre_url):
+    targets = [code.strip() for code in args.targets.split(",") if code.strip()]
+    translator_main.load_config()
+    cfg = translator_main.current_config
+    cfg.update({
+        "recognizer_engine": "speech_recognition",
+        "translator_engine": "libretranslate_local",
+        "google_speech_endpoint": google_url,
+        "libretranslate_url": libre_url,
+        "translation_cache_enabled": args.cache,
+        "source_language": "en-US",
+        "target_language": targets[0] if len(targets) == 1 else targets,
+        "segment_translation": not args.no_segmentation,
+        "recognizer_audio_codec": args.codec,
+    })
+    translator_main.config_store.publish()
+    translator_main.init_translation_cache()
+    translator_main.rebuild_translation_client(libre_url)
+
+
+def run_utterance(app, overlay, source_factory, timeout):
+    trace = translator_main.UtteranceTrace()
+    worker = threading.Thread(target=translator_main.transcribe_and_translate,
+                              args=(overlay, trace, source_factory), daemon=True)
+    worker.start()
+    loop = QtCore.QEventLoop()
+    deadline = time.monotonic() + timeout
+
+    def check():
+        if trace.complete or time.monotonic() > deadline:
+            loop.quit()
+
+    poll = QtCore.QTimer()
+    poll.timeout.connect(check)
+    poll.start(1)
+    loop.exec()
+    poll.stop()
+    worker.join(timeout)
+    if not trace.complete:
+        trace.finish("timeout")
+    return trace
+
+
+def run_pipelined(app, overlay, source_factory, runs, timeout):
+    """Submits a new utterance whenever the pipeline accepts one; returns the traces."""
+    pipe = Pipeline(translator_main.PIPELINE_STAGES).start()
+    traces = []
+    loop = QtCore.QEventLoop()
+    deadline = time.monotonic() + timeout * runs
+
+    def pump():
+        if len(traces) < runs:
+            job = translator_main.make_utterance_job(overlay, audio_source_factory=source_factory,
+                                                     target_pipeline=pipe)
+            if pipe.submit(job):
+                translator_main.track_trace(job.trace)
+                traces.append(job.trace)
+        elif all(t.complete for t in traces) or time.monotonic() > deadline:
+            loop.quit()
+
+    poll = QtCore.QTimer()
+    poll.timeout.connect(pump)
+    poll.start(1)
+    loop.exec()
+    poll.stop()
+    pipe.stop()
+    for trace in traces:
+        if not trace.complete:
+            trace.finish("timeout")
+    return traces
+
+
+def run_continuous(app, overlay, source_factory, runs, timeout):
+    """Captions one long recording; returns the traces of its segments."""
+    captioner = translator_main.start_continuous_captioning(overlay, audio_source_factory=source_factory)
+    loop = QtCore.QEventLoop()
+    deadline = time.monotonic() + timeout * runs
+
+    def segment_traces():
+        return [t for t in translator_main.trace_recorder.recent() if t.mode == "continuous"]
+
+    def check():
+        drained = captioner._thread is None or not captioner._thread.is_alive()
+        if (drained and all(t.complete for t in segment_traces())) or time.monotonic() > deadline:
+            loop.quit()
+
+    poll = QtCore.QTimer()
+    poll.timeout.connect(check)
+    poll.start(1)
+    loop.exec()
+    poll.stop()
+    translator_main.stop_continuous_captioning()
+    traces = list(reversed(segment_traces()))
+    for trace in traces:
+        if not trace.complete:
+            trace.finish("timeout")
+    print("captioning:", ", ".join(f"{k}={v}" for k, v in captioner.stats().items()))
+    return traces
+
+
+def summarize(traces):
+    summary = {"runs": len(traces), "outcomes": dict(Counter(t.outcome for t in traces)), "stages": {}}
+    for stage in STAGES:
+        values = [t.span(stage) * 1000 for t in traces if t.span(stage) is not None]
+        if values:
+            summary["stages"][stage] = {
+                "n": len(values),
+                "p50_ms": percentile(values, 50),
+                "p95_ms": percentile(values, 95),
+                "p99_ms": percentile(values, 99),
+                "max_ms": max(values),
+            }
+    return summary
+
+
+def print_summary(summary):
+    print(f"{'stage':<20} {'n':>5} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for stage, row in summary["stages"].items():
+        print(f"{stage:<20} {row['n']:>5} {row['p50_ms']:>9.1f} {row['p95_ms']:>9.1f} "
+              f"{row['p99_ms']:>9.1f} {row['max_ms']:>9.1f}")
+    print("outcomes:", ", ".join(f"{k}={v}" for k, v in sorted(summary["outcomes"].items())))
+
+
+def compare_with_baseline(summary, baseline_path, tolerance):
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    regressions = []
+    for stage, row in summary["stages"].items():
+        old = baseline.get("stages", {}).get(stage)
+        if not old:
+            continue
+        # 1 ms of absolute slack so sub-millisecond stages do not flap on CI.
+        limit = old["p95_ms"] * (1 + tolerance) + 1.0
+        status = "REGRESSION" if row["p95_ms"] > limit else "ok"
+        print(f"{stage:<20} p95 {old['p95_ms']:8.1f} -> {row['p95_ms']:8.1f} ms  {status}")
+        if status != "ok":
+            regressions.append(stage)
+    return regressions
+
+
+def main():
+    args = parse_args()
+    if args.wav:
+        wav_path = Path(args.wav)
+    else:
+        wav_path = write_speech_like_wav(Path(_HOME) / "utterance.wav", repeats=args.runs if args.continuous else 1)
+
+    def source_factory(device_index=None):
+        return WavMicrophone(wav_path, realtime=args.realtime)
+
+    with GoogleSpeechStub(latency=args.recognize_latency, failure_rate=args.recognize_failure_rate,
+                          transcript=make_transcript(args.transcript_chars)) as google, \
+            LibreTranslateStub(latency=args.translate_latency, failure_rate=args.translate_failure_rate,
+                               latency_per_char=args.translate_latency_per_char) as libre:
+        configure_app(args, google.url, libre.url)
+        app = QtWidgets.QApplication(sys.argv)
+        overlay = make_overlay()
+        translator_main.attach_overlay_tracing(overlay)
+        calibration_path = Path(_HOME) / "noise_calibration.json"
+
+        traces = []
+        started = time.monotonic()
+        if args.continuous:
+            translator_main.noise_calibrator = NoiseCalibrator(calibration_path, source_factory=source_factory)
+            traces = run_continuous(app, overlay, source_factory, args.runs, args.timeout)
+        elif args.pipeline:
+            translator_main.noise_calibrator = NoiseCalibrator(calibration_path, source_factory=source_factory)
+            traces = run_pipelined(app, overlay, source_factory, args.runs, args.timeout)
+        else:
+            for _ in range(args.runs):
+                if args.calibrate_every_run or translator_main.noise_calibrator is None:
+                    if calibration_path.exists():
+                        calibration_path.unlink()
+                    translator_main.noise_calibrator = NoiseCalibrator(calibration_path, source_factory=source_factory)
+                traces.append(run_utterance(app, overlay, source_factory, args.timeout))
+        elapsed = time.monotonic() - started
+
+        summary = summarize(traces)
+        summary["throughput_per_s"] = len(traces) / elapsed if elapsed else None
+        summary["stubs"] = {
+            "google_requests": google.request_count, "google_failures": google.failure_count,
+            "google_audio_bytes": google.audio_bytes,
+            "libretranslate_requests": libre.request_count, "libretranslate_failures": libre.failure_count,
+        }
+        summary["settings"] = {k: v for k, v in vars(args).items() if k not in ("json", "baseline")}
+        print_summary(summary)
+        print(f"throughput: {summary['throughput_per_s']:.2f} utterances/s")
+        print("stubs:", ", ".join(f"{k}={v}" for k, v in summary["stubs"].items()))
+        overlay.hide_overlay_and_clear_text()
+        app.quit()
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2)
+    if args.baseline and compare_with_baseline(summary, args.baseline, args.tolerance):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
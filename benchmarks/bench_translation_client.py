@@ -0,0 +1,56 @@
+"""
+Compare a bare requests.post per utterance with the pooled LibreTranslateClient.
+
+    python benchmarks/bench_translation_client.py [iterations]
+"""
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "source"))
+
+import requests
+
+from translation_client import LibreTranslateClient
+from stub_servers import LibreTranslateStub
+
+
+def bench_bare(url, iterations):
+    timings = []
+    for i in range(iterations):
+        start = time.perf_counter()
+        requests.post(url, json={"q": f"tekst {i}", "source": "pl", "target": "en"},
+                      headers={"Content-Type": "application/json"}, timeout=10)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def bench_client(url, iterations):
+    client = LibreTranslateClient(url)
+    timings = []
+    for i in range(iterations):
+        start = time.perf_counter()
+        client.translate(f"tekst {i}", "pl", "en")
+        timings.append(time.perf_counter() - start)
+    stats = client.stats.as_dict()
+    client.close()
+    return timings, stats
+
+
+def report(name, timings):
+    print(f"{name:>12}: mean {statistics.mean(timings) * 1000:.3f} ms, "
+          f"median {statistics.median(timings) * 1000:.3f} ms, max {max(timings) * 1000:.3f} ms")
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    with LibreTranslateStub() as stub:
+        report("bare post", bench_bare(stub.url, iterations))
+        timings, stats = bench_client(stub.url, iterations)
+        report("pooled", timings)
+        print(f"client stats: {stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""WAV-backed stand-in for sr.Microphone and a generator for speech-like test audio."""
+import math
+import random
+import struct
+import time
+import wave
+
+import speech_recognition as sr
+
+
+def write_speech_like_wav(path, sample_rate=16000, lead_silence=1.5, speech=2.0, tail_silence=2.0,
+                          noise_level=40, speech_level=4000, seed=0, repeats=1):
+    """
+    Mono 16-bit WAV: low background noise, then a voiced, syllable-modulated
+    harmonic signal (low zero-crossing rate, like speech), then noise again.
+    repeats > 1 appends further speech + tail blocks (continuous captioning input).
+    """
+    rng = random.Random(seed)
+    samples = []
+    lead = int(lead_silence * sample_rate)
+    voiced = int(speech * sample_rate)
+    tail = int(tail_silence * sample_rate)
+    for i in range(lead + (voiced + tail) * repeats):
+        value = rng.gauss(0, noise_level)
+        offset = (i - lead) % (voiced + tail) if i >= lead else -1
+        if 0 <= offset < voiced:
+            t = offset / sample_rate
+            envelope = 0.6 + 0.4 * math.sin(2 * math.pi * 4 * t)
+            tone = sum(math.sin(2 * math.pi * 140 * k * t) / k for k in range(1, 5))
+            value += speech_level * envelope * tone / 2
+        samples.append(max(-32768, min(32767, int(value))))
+    with wave.open(str(path), 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(struct.pack(f"<{len(samples)}h", *samples))
+    return path
+
+
+class _PacedStream:
+    """Delays reads so audio arrives no faster than a live device would deliver it."""
+
+    def __init__(self, stream, bytes_per_second):
+        self.stream = stream
+        self.bytes_per_second = float(bytes_per_second)
+        self.started = None
+        self.delivered = 0
+
+    def read(self, size=-1):
+        if self.started is None:
+            self.started = time.monotonic()
+        data = self.stream.read(size)
+        self.delivered += len(data)
+        wait = self.started + self.delivered / self.bytes_per_second - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+        return data
+
+
+class WavMicrophone(sr.AudioFile):
+    """
+    sr.Microphone replacement that plays a WAV file. With realtime=False the
+    file is read as fast as the pipeline consumes it (CPU cost only).
+    """
+
+    def __init__(self, path, realtime=False):
+        super().__init__(str(path))
+        self.realtime = realtime
+
+    def __enter__(self):
+        source = super().__enter__()
+        if self.realtime:
+            self.stream = _PacedStream(self.stream, self.SAMPLE_RATE * self.SAMPLE_WIDTH)
+        return source
@@ -0,0 +1,161 @@
+"""Local stub HTTP servers used by the benchmarks (no Docker / internet needed)."""
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; without this, Nagle plus
+    # delayed ACKs add ~40 ms to every response on a kept-alive connection.
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_body(self, status, data, content_type):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_json(self, status, body):
+        self._send_body(status, json.dumps(body).encode("utf-8"), "application/json")
+
+    def _read_body(self):
+        return self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+    def _simulate(self):
+        """Counts the request, sleeps the configured latency; True if this request should fail."""
+        server = self.server
+        with server.lock:
+            server.request_count += 1
+            fail = server.failure_rate > 0 and server.rng.random() < server.failure_rate
+            if fail:
+                server.failure_count += 1
+            latency = server.latency
+            if server.slow_rate > 0 and server.rng.random() < server.slow_rate:
+                latency = server.slow_latency
+        if latency:
+            time.sleep(latency)
+        return fail
+
+
+class _LibreTranslateHandler(_StubHandler):
+    def do_GET(self):
+        # Health checks: answered at once and not counted as translation requests.
+        if self.path.split("?")[0] != "/languages":
+            self._send_json(404, {"error": "Not found"})
+            return
+        codes = list(self.server.languages)
+        self._send_json(200, [{"code": code, "name": code, "targets": codes} for code in codes])
+
+    def do_POST(self):
+        payload = json.loads(self._read_body() or b"{}")
+        languages = self.server.languages
+        if payload.get("source") not in languages or payload.get("target") not in languages:
+            # Like a container started with LT_LOAD_ONLY that lacks the pair.
+            with self.server.lock:
+                self.server.request_count += 1
+            self._send_json(400, {"error": "Language pair not loaded"})
+            return
+        if self._simulate():
+            self._send_json(500, {"error": "Injected failure"})
+            return
+        q = payload.get("q", "")
+        target = payload.get("target", "en")
+        if self.server.latency_per_char:
+            # Real models take time roughly proportional to the text length.
+            time.sleep(self.server.latency_per_char * sum(len(item) for item in (q if isinstance(q, list) else [q])))
+        if isinstance(q, list):
+            translated = [f"[{target}] {item}" for item in q]
+        else:
+            translated = f"[{target}] {q}"
+        self._send_json(200, {"translatedText": translated})
+
+
+class _GoogleSpeechHandler(_StubHandler):
+    """Speaks the (legacy) speech-api/v2 protocol used by Recognizer.recognize_google."""
+
+    def do_POST(self):
+        audio = self._read_body()
+        with self.server.lock:
+            self.server.audio_bytes += len(audio)
+        if self._simulate():
+            self._send_body(500, b"Injected failure", "text/plain")
+            return
+        result = {"result": [{"alternative": [{"transcript": self.server.transcript, "confidence": 0.9}],
+                              "final": True}], "result_index": 0}
+        body = '{"result":[]}\n' + json.dumps(result) + "\n"
+        self._send_body(200, body.encode("utf-8"), "application/json; charset=utf-8")
+
+
+class _StubServer:
+    handler_class = None
+    path = "/"
+
+    def __init__(self, latency=0.0, port=0, failure_rate=0.0, seed=0, slow_rate=0.0, slow_latency=0.0):
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", port), self.handler_class)
+        self.httpd.daemon_threads = True
+        self.httpd.latency = latency
+        # Tail latency: slow_rate of the requests take slow_latency instead (an overloaded container).
+        self.httpd.slow_rate = slow_rate
+        self.httpd.slow_latency = slow_latency
+        self.httpd.failure_rate = failure_rate
+        self.httpd.rng = random.Random(seed)
+        self.httpd.lock = threading.Lock()
+        self.httpd.request_count = 0
+        self.httpd.failure_count = 0
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}{self.path}"
+
+    @property
+    def request_count(self):
+        return self.httpd.request_count
+
+    @property
+    def failure_count(self):
+        return self.httpd.failure_count
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class LibreTranslateStub(_StubServer):
+    """Threaded LibreTranslate stand-in on 127.0.0.1 with configurable latency and failure rate."""
+    handler_class = _LibreTranslateHandler
+    path = "/translate"
+    ALL_LANGUAGES = ("en", "pl", "de", "es", "it", "ru", "nl", "cs", "pt")
+
+    def __init__(self, latency=0.0, port=0, failure_rate=0.0, seed=0, slow_rate=0.0, slow_latency=0.0,
+                 languages=ALL_LANGUAGES, latency_per_char=0.0):
+        super().__init__(latency, port, failure_rate, seed, slow_rate, slow_latency)
+        self.httpd.languages = tuple(languages)
+        self.httpd.latency_per_char = latency_per_char
+
+
+class GoogleSpeechStub(_StubServer):
+    """Google Speech (speech-api/v2) stand-in; always answers with `transcript`."""
+    handler_class = _GoogleSpeechHandler
+    path = "/speech-api/v2/recognize"
+
+    def __init__(self, latency=0.0, port=0, failure_rate=0.0, seed=0, transcript="hello world"):
+        super().__init__(latency, port, failure_rate, seed)
+        self.httpd.transcript = transcript
+        self.httpd.audio_bytes = 0
+
+    @property
+    def audio_bytes(self):
+        return self.httpd.audio_bytes
@@ -0,0 +1,63 @@
+class AudioAccumulator:
+    """
+    Growable PCM buffer for one utterance. Audio is appended to a bytearray
+    that grows in place (CPython over-allocates geometrically and realloc()s,
+    so nothing is zero-filled or preallocated up front) and handed downstream
+    as a memoryview, so the samples are copied once on the way in and never
+    re-joined.
+    """
+
+    def __init__(self, sample_rate, sample_width, max_seconds=None):
+        self.sample_rate = sample_rate
+        self.sample_width = sample_width
+        bytes_per_second = sample_rate * sample_width
+        self.max_bytes = int(max_seconds * bytes_per_second) if max_seconds else None
+        self._buffer = bytearray()
+        self.appends = 0
+        self.reallocations = 0
+
+    def __len__(self):
+        return len(self._buffer)
+
+    @property
+    def length(self):
+        return len(self._buffer)
+
+    @property
+    def duration(self):
+        return len(self._buffer) / float(self.sample_rate * self.sample_width)
+
+    @property
+    def is_full(self):
+        return self.max_bytes is not None and len(self._buffer) >= self.max_bytes
+
+    def append(self, data):
+        """Appends raw PCM bytes (any bytes-like object). Data past max_seconds is dropped; returns bytes kept."""
+        size = len(data)
+        if self.max_bytes is not None:
+            size = min(size, self.max_bytes - len(self._buffer))
+        if size <= 0:
+            return 0
+        data = data if size == len(data) else memoryview(data)[:size]
+        try:
+            self._buffer += data
+        except BufferError:
+            # A view handed out earlier pins the buffer; copy into a fresh one so that view stays valid.
+            self._buffer = self._buffer + data
+            self.reallocations += 1
+        self.appends += 1
+        return size
+
+    def view(self, start=0, end=None):
+        return memoryview(self._buffer)[start:end]
+
+    def clear(self):
+        try:
+            del self._buffer[:]
+        except BufferError:
+            self._buffer = bytearray()
+
+    def to_audio_data(self):
+        """sr.AudioData over a view of the buffer (no copy)."""
+        import speech_recognition as sr
+        return sr.AudioData(self.view(), self.sample_rate, self.sample_width)
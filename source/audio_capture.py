@@ -0,0 +1,162 @@
+import threading
+
+import speech_recognition as sr
+
+from modules import DEFAULT_RING_BUFFER_SECONDS, DEFAULT_PREROLL_MS
+
+
+class AudioRingBuffer:
+    """
+    Fixed-size byte ring over a preallocated bytearray. Positions are absolute
+    byte offsets since start, so readers can keep a cursor across wrap-arounds.
+    """
+
+    def __init__(self, capacity, frame_bytes=2):
+        capacity -= capacity % frame_bytes
+        self.capacity = capacity
+        self.frame_bytes = frame_bytes
+        self._buffer = bytearray(capacity)
+        self.total_written = 0
+        self._cond = threading.Condition()
+        self.closed = False
+
+    def write(self, data):
+        size = len(data)
+        if size == 0:
+            return
+        with self._cond:
+            if size >= self.capacity:
+                data = data[-self.capacity:]
+                self.total_written += size - self.capacity
+                size = self.capacity
+            offset = self.total_written % self.capacity
+            first = min(size, self.capacity - offset)
+            self._buffer[offset:offset + first] = data[:first]
+            if first < size:
+                self._buffer[0:size - first] = data[first:]
+            self.total_written += size
+            self._cond.notify_all()
+
+    def oldest_position(self):
+        with self._cond:
+            return max(0, self.total_written - self.capacity)
+
+    def position_before(self, nbytes):
+        """Absolute position nbytes behind the write head (clamped to what is still buffered)."""
+        nbytes -= nbytes % self.frame_bytes
+        with self._cond:
+            return max(0, self.total_written - self.capacity, self.total_written - nbytes)
+
+    def read(self, position, size, timeout=None):
+        """
+        Blocks until [position, position + size) is available and returns
+        (data, next_position). If the reader fell behind the ring, it skips ahead.
+        """
+        with self._cond:
+            if not self._cond.wait_for(lambda: self.closed or self.total_written >= position + size, timeout):
+                raise TimeoutError("No audio from the warm microphone stream.")
+            if self.closed and self.total_written < position + size:
+                raise OSError("Warm microphone stream closed.")
+            oldest = max(0, self.total_written - self.capacity)
+            if position < oldest:
+                position = oldest
+            offset = position % self.capacity
+            first = min(size, self.capacity - offset)
+            data = bytes(self._buffer[offset:offset + first])
+            if first < size:
+                data += bytes(self._buffer[0:size - first])
+            return data, position + size
+
+    def close(self):
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+
+class _RingBufferStream:
+    def __init__(self, ring, position):
+        self.ring = ring
+        self.position = position
+
+    def read(self, size):
+        data, self.position = self.ring.read(self.position, size, timeout=2.0)
+        return data
+
+
+class RingBufferSource(sr.AudioSource):
+    """AudioSource reading from a warm stream, starting a configurable pre-roll before 'now'."""
+
+    def __init__(self, warm_microphone, preroll_ms):
+        self.SAMPLE_RATE = warm_microphone.SAMPLE_RATE
+        self.SAMPLE_WIDTH = warm_microphone.SAMPLE_WIDTH
+        self.CHUNK = warm_microphone.CHUNK
+        preroll_bytes = int(self.SAMPLE_RATE * preroll_ms / 1000) * self.SAMPLE_WIDTH
+        self.stream = _RingBufferStream(warm_microphone.ring, warm_microphone.ring.position_before(preroll_bytes))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        pass
+
+
+class WarmMicrophone:
+    """
+    Keeps one microphone stream open for the whole session and feeds it into a
+    ring buffer. Opening a source is free and starts with pre-roll audio, so the
+    first syllables spoken while pressing the hotkey are not lost.
+    """
+
+    def __init__(self, device_index=None, buffer_seconds=DEFAULT_RING_BUFFER_SECONDS):
+        self.device_index = device_index
+        self.buffer_seconds = float(buffer_seconds)
+        self._microphone = None
+        self.ring = None
+        self._thread = None
+        self._stop = threading.Event()
+        self.SAMPLE_RATE = None
+        self.SAMPLE_WIDTH = None
+        self.CHUNK = None
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._microphone = sr.Microphone(device_index=self.device_index)
+        self._microphone.__enter__()
+        self.SAMPLE_RATE = self._microphone.SAMPLE_RATE
+        self.SAMPLE_WIDTH = self._microphone.SAMPLE_WIDTH
+        self.CHUNK = self._microphone.CHUNK
+        capacity = int(self.SAMPLE_RATE * self.buffer_seconds) * self.SAMPLE_WIDTH
+        self.ring = AudioRingBuffer(capacity, frame_bytes=self.SAMPLE_WIDTH)
+        self._thread = threading.Thread(target=self._run, name="warm-microphone", daemon=True)
+        self._thread.start()
+        print(f"[Audio] Warm microphone started ({self.buffer_seconds:.0f} s ring, {capacity // 1024} KiB)")
+
+    def _run(self):
+        stream = self._microphone.stream
+        while not self._stop.is_set():
+            try:
+                self.ring.write(stream.read(self.CHUNK))
+            except Exception as e:
+                print(f"[Audio] Warm microphone read error: {e}")
+                break
+        self.ring.close()
+
+    def open_source(self, preroll_ms=DEFAULT_PREROLL_MS):
+        return RingBufferSource(self, preroll_ms)
+
+    @property
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+        if self._microphone is not None:
+            try:
+                self._microphone.__exit__(None, None, None)
+            except Exception:
+                pass
+            self._microphone = None
@@ -0,0 +1,108 @@
+import io
+import time
+
+import numpy as np
+
+from modules import DEFAULT_RECOGNIZER_SAMPLE_RATE
+
+try:
+    import soxr
+    HAS_SOXR = True
+except ImportError:
+    HAS_SOXR = False
+
+try:
+    import soundfile
+    HAS_SOUNDFILE = True
+except ImportError:
+    HAS_SOUNDFILE = False
+
+CODEC_AUTO = "auto"
+CODEC_FLAC = "flac"
+CODEC_L16 = "l16"
+
+
+class EncodedAudio:
+    """Upload payload for the recognizer plus what it cost to produce."""
+
+    def __init__(self, data, content_type, codec, sample_rate, input_bytes, encode_seconds):
+        self.data = data
+        self.content_type = content_type
+        self.codec = codec
+        self.sample_rate = sample_rate
+        self.input_bytes = input_bytes
+        self.encode_seconds = encode_seconds
+
+    def __len__(self):
+        return len(self.data)
+
+
+def _to_int16(raw, sample_width):
+    if sample_width == 2:
+        return np.frombuffer(raw, dtype="<i2")
+    if sample_width == 1:
+        # 8-bit WAV/PCM is unsigned.
+        return ((np.frombuffer(raw, dtype=np.uint8).astype(np.int16) - 128) << 8).astype(np.int16)
+    if sample_width == 3:
+        bytes3 = np.frombuffer(raw, dtype=np.uint8).reshape(-1, 3)
+        return ((bytes3[:, 2].astype(np.int8).astype(np.int16) << 8) | bytes3[:, 1]).astype(np.int16)
+    if sample_width == 4:
+        return (np.frombuffer(raw, dtype="<i4") >> 16).astype(np.int16)
+    raise ValueError(f"unsupported sample width {sample_width}")
+
+
+def resample(samples, from_rate, to_rate):
+    """
+    int16 mono samples at from_rate -> int16 at to_rate. Uses soxr if it is
+    installed; otherwise NumPy: averaging over blocks for integer factors
+    (48 -> 16 kHz) and a box filter plus linear interpolation for the rest.
+    Crude next to a real polyphase filter, but plenty for speech recognition.
+    """
+    if from_rate == to_rate or not len(samples):
+        return samples
+    if HAS_SOXR:
+        return soxr.resample(samples, from_rate, to_rate, quality="QQ")
+    if from_rate < to_rate:
+        positions = np.arange(int(len(samples) * to_rate / from_rate)) * (from_rate / to_rate)
+        return np.interp(positions, np.arange(len(samples)), samples).astype(np.int16)
+    factor = from_rate / to_rate
+    if factor.is_integer():
+        factor = int(factor)
+        usable = len(samples) - len(samples) % factor
+        return (samples[:usable].reshape(-1, factor).sum(axis=1, dtype=np.int32) // factor).astype(np.int16)
+    width = int(np.ceil(factor))
+    smoothed = np.convolve(samples.astype(np.float32), np.full(width, 1.0 / width, dtype=np.float32), mode="same")
+    positions = np.arange(int(len(samples) / factor)) * factor
+    return np.interp(positions, np.arange(len(samples)), smoothed).astype(np.int16)
+
+
+def resolve_codec(codec):
+    """'auto' -> FLAC when soundfile (libsndfile) is installed, else 16-bit linear PCM."""
+    if codec == CODEC_AUTO:
+        return CODEC_FLAC if HAS_SOUNDFILE else CODEC_L16
+    if codec == CODEC_FLAC and not HAS_SOUNDFILE:
+        print("[Audio] soundfile is not installed, sending uncompressed PCM. To install: pip install soundfile")
+        return CODEC_L16
+    return codec
+
+
+def encode_for_upload(audio_data, codec=CODEC_AUTO, sample_rate=DEFAULT_RECOGNIZER_SAMPLE_RATE):
+    """
+    sr.AudioData -> EncodedAudio: 16-bit mono at sample_rate (never upsampled),
+    as FLAC or raw little-endian PCM, all in process (no flac binary spawned).
+    """
+    start = time.perf_counter()
+    raw = audio_data.frame_data
+    samples = _to_int16(raw, audio_data.sample_width)
+    rate = audio_data.sample_rate
+    if rate > sample_rate:
+        samples = resample(samples, rate, sample_rate)
+        rate = sample_rate
+    codec = resolve_codec(codec)
+    if codec == CODEC_FLAC:
+        buffer = io.BytesIO()
+        soundfile.write(buffer, samples, rate, format="FLAC", subtype="PCM_16")
+        data, content_type = buffer.getvalue(), f"audio/x-flac; rate={rate}"
+    else:
+        data, content_type = samples.astype("<i2", copy=False).tobytes(), f"audio/l16; rate={rate}"
+    return EncodedAudio(data, content_type, codec, rate, len(raw), time.perf_counter() - start)
@@ -0,0 +1,144 @@
+import threading
+import time
+from collections import deque
+
+from modules import (
+    DEFAULT_CAPTION_MAX_SEGMENT_SECONDS,
+    DEFAULT_CAPTION_QUEUE_SIZE,
+    DEFAULT_VAD_PRE_SPEECH_MS,
+)
+from pipeline import Pipeline
+
+# How long capture_utterance may wait for speech before the loop re-arms it.
+_LISTEN_SLICE_SECONDS = 5.0
+
+
+class ContinuousCaptioner:
+    """
+    Hands-free mode: keeps one audio source open, cuts speech into segments
+    with the VAD and submits each segment to its own recognize -> translate
+    Pipeline, so segment N is recognized while N+1 is still being spoken.
+
+    Memory stays bounded over long sessions: each segment is capped at
+    max_segment_seconds, the pipeline queues are bounded, and a segment that
+    finds the pipeline full is dropped (counted) instead of piling up, so the
+    microphone is never blocked.
+
+    open_source() -> context manager yielding an sr.AudioSource
+    create_detector(source) -> VoiceActivityDetector
+    trace_factory() -> UtteranceTrace, called at each speech onset
+    make_job(trace) -> UtteranceJob for the first stage (audio is filled in here)
+    on_segment(detector) is called after every capture pass (e.g. noise floor tracking).
+    """
+
+    def __init__(self, stages, open_source, create_detector, trace_factory, make_job,
+                 max_segment_seconds=DEFAULT_CAPTION_MAX_SEGMENT_SECONDS,
+                 pre_speech_ms=DEFAULT_VAD_PRE_SPEECH_MS,
+                 queue_size=DEFAULT_CAPTION_QUEUE_SIZE,
+                 on_error=None, on_segment=None):
+        self.stages = stages
+        self.open_source = open_source
+        self.create_detector = create_detector
+        self.trace_factory = trace_factory
+        self.make_job = make_job
+        self.max_segment_seconds = max_segment_seconds
+        self.pre_speech_ms = pre_speech_ms
+        self.queue_size = queue_size
+        self.on_error = on_error
+        self.on_segment = on_segment
+        self.pipeline = None
+        self.segments = 0
+        self.dropped = 0
+        self.audio_seconds = 0.0
+        self.started_at = None
+        self._recent = deque(maxlen=64)
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def is_running(self):
+        """False as soon as stop() was asked, even while in-flight segments still drain."""
+        return self._thread is not None and self._thread.is_alive() and not self._stop.is_set()
+
+    def start(self):
+        if self.is_running:
+            return
+        self._stop.clear()
+        self.started_at = time.monotonic()
+        self._thread = threading.Thread(target=self._run, name="continuous-capture", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=3.0):
+        """Stops listening; segments already captured still go through the pipeline."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def stats(self):
+        """Counters plus segments per minute over the last (up to) 64 segments."""
+        now = time.monotonic()
+        recent = list(self._recent)
+        per_minute = None
+        if len(recent) >= 2 and now > recent[0]:
+            per_minute = 60.0 * len(recent) / (now - recent[0])
+        return {
+            "running": self.is_running,
+            "segments": self.segments,
+            "dropped": self.dropped,
+            "audio_seconds": self.audio_seconds,
+            "uptime_s": now - self.started_at if self.started_at else 0.0,
+            "segments_per_minute": per_minute,
+            "in_flight": self.pipeline.in_flight if self.pipeline is not None else 0,
+        }
+
+    def _run(self):
+        from vad import capture_utterance
+        self.pipeline = Pipeline(self.stages, queue_size=self.queue_size, max_pending_presses=self.queue_size).start()
+        print("[Captioning] Continuous captioning started.")
+        try:
+            with self.open_source() as source:
+                detector = self.create_detector(source)
+                while not self._stop.is_set():
+                    detector.reset()
+                    segment_trace = []
+
+                    def on_speech_start():
+                        trace = self.trace_factory()
+                        trace.mark("speech_start")
+                        segment_trace.append(trace)
+
+                    accumulator = capture_utterance(
+                        source, detector,
+                        max_seconds=self.max_segment_seconds,
+                        initial_timeout=_LISTEN_SLICE_SECONDS,
+                        pre_speech_ms=self.pre_speech_ms,
+                        should_stop=self._stop.is_set,
+                        on_speech_start=on_speech_start,
+                    )
+                    if not detector.position:
+                        break  # the source ran dry (file-backed source)
+                    if self.on_segment is not None:
+                        self.on_segment(detector)
+                    if accumulator is None or not len(accumulator) or not segment_trace:
+                        continue
+                    trace = segment_trace[0]
+                    trace.mark("speech_end")
+                    trace.audio_bytes = detector.position
+                    trace.utterance_bytes = len(accumulator)
+                    self.segments += 1
+                    self.audio_seconds += accumulator.duration
+                    self._recent.append(time.monotonic())
+                    job = self.make_job(trace)
+                    job.audio = accumulator.to_audio_data()
+                    if not self.pipeline.submit(job):
+                        self.dropped += 1
+                        job.audio = None
+                        trace.finish("dropped")
+        except Exception as e:
+            print(f"[Captioning] Capture error: {e}")
+            if self.on_error is not None:
+                self.on_error(e)
+        finally:
+            self.pipeline.stop()
+            print(f"[Captioning] Continuous captioning stopped after {self.segments} segments ({self.dropped} dropped).")
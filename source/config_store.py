@@ -0,0 +1,230 @@
+import json
+import os
+import threading
+import time
+from copy import deepcopy
+from types import MappingProxyType
+
+from modules import (
+    DEFAULT_CONFIG_SAVE_DEBOUNCE, DEFAULT_CONFIG_STRUCT, OPTIONAL_CONFIG_KEYS, OVERLAY_POSITIONS,
+    DEFAULT_LIBRETRANSLATE_ROUTING, LIBRETRANSLATE_ROUTING_POLICIES,
+    DEFAULT_RECOGNIZER_AUDIO_CODEC, RECOGNIZER_AUDIO_CODECS,
+)
+
+# Settings that take either one string or a non-empty list of strings.
+_STR_OR_LIST_KEYS = ("target_language", "libretranslate_url")
+
+
+class ConfigValidationError(ValueError):
+    def __init__(self, errors):
+        self.errors = list(errors)
+        super().__init__("; ".join(self.errors))
+
+
+def _is_compatible(default, value):
+    if value is None or default is None:
+        return True
+    if isinstance(default, bool):
+        return isinstance(value, bool)
+    if isinstance(default, (int, float)):
+        return isinstance(value, (int, float)) and not isinstance(value, bool)
+    return isinstance(value, type(default))
+
+
+def _is_str_or_list(value):
+    if isinstance(value, str):
+        return True
+    return isinstance(value, list) and bool(value) and all(isinstance(item, str) and item for item in value)
+
+
+def validate_config_changes(changes, base):
+    """Raises ConfigValidationError listing every problem of applying changes on top of base."""
+    errors = []
+    for key, value in changes.items():
+        if key not in DEFAULT_CONFIG_STRUCT and key not in OPTIONAL_CONFIG_KEYS:
+            errors.append(f"Unknown setting '{key}'")
+        elif key in _STR_OR_LIST_KEYS:
+            if not _is_str_or_list(value):
+                errors.append(f"Invalid value for '{key}': {value!r}")
+        elif not _is_compatible(DEFAULT_CONFIG_STRUCT.get(key, OPTIONAL_CONFIG_KEYS.get(key)), value):
+            errors.append(f"Invalid value for '{key}': {value!r}")
+    merged = dict(base)
+    merged.update(changes)
+    if merged.get("hotkey_translate") and merged.get("hotkey_translate") == merged.get("hotkey_copy"):
+        errors.append(f"Translation and copy hotkeys must differ ('{merged.get('hotkey_translate')}')")
+    if merged.get("overlay_position") not in OVERLAY_POSITIONS:
+        errors.append(f"Unknown overlay position '{merged.get('overlay_position')}'")
+    urls = merged.get("libretranslate_url", "")
+    for url in ([urls] if isinstance(urls, str) else urls if isinstance(urls, list) else []):
+        if not (url.startswith("http://") or url.startswith("https://")):
+            errors.append(f"Invalid LibreTranslate URL '{url}'")
+    routing = merged.get("libretranslate_routing", DEFAULT_LIBRETRANSLATE_ROUTING)
+    if routing not in LIBRETRANSLATE_ROUTING_POLICIES:
+        errors.append(f"Unknown LibreTranslate routing '{routing}'")
+    codec = merged.get("recognizer_audio_codec", DEFAULT_RECOGNIZER_AUDIO_CODEC)
+    if codec not in RECOGNIZER_AUDIO_CODECS:
+        errors.append(f"Unknown recognizer audio codec '{codec}'")
+    if errors:
+        raise ConfigValidationError(errors)
+
+
+class ConfigSnapshot:
+    """Immutable view of the config at one version."""
+    __slots__ = ("version", "values")
+
+    def __init__(self, version, values):
+        self.version = version
+        self.values = MappingProxyType(values)
+
+    def get(self, key, default=None):
+        return self.values.get(key, default)
+
+    def __getitem__(self, key):
+        return self.values[key]
+
+
+class ConfigStore:
+    """
+    Write-behind store for settings.json. request_save() only marks the config
+    dirty; a single writer thread flushes it once no change arrived for
+    `debounce` seconds. Writes go to a temp file that is atomically renamed.
+
+    Every request_save() that actually changed a value also publishes a new
+    versioned ConfigSnapshot to subscribers, together with the changed keys.
+    """
+
+    def __init__(self, path, data, debounce=DEFAULT_CONFIG_SAVE_DEBOUNCE):
+        self.path = path
+        self.data = data
+        self.debounce = float(debounce)
+        self.write_count = 0
+        self.save_requests = 0
+        self._dirty = False
+        self._last_change = 0.0
+        self._cond = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._closed = False
+        self._listeners = []
+        self._publish_lock = threading.Lock()
+        self._snapshot = ConfigSnapshot(0, deepcopy(dict(data)))
+        self._thread = threading.Thread(target=self._run, name="config-writer", daemon=True)
+        self._thread.start()
+
+    @property
+    def version(self):
+        return self._snapshot.version
+
+    def snapshot(self):
+        return self._snapshot
+
+    def subscribe(self, callback):
+        """callback(snapshot, changed_keys) is called in the thread that committed the change."""
+        self._listeners.append(callback)
+
+    def publish(self):
+        """Diffs the live config against the last snapshot; bumps the version and notifies if anything changed."""
+        with self._publish_lock:
+            previous = self._snapshot
+            changed = frozenset(
+                k for k in set(previous.values) | set(self.data)
+                if previous.values.get(k) != self.data.get(k)
+            )
+            if not changed:
+                return frozenset()
+            # Called per slider tick from the GUI thread: only the changed values are copied.
+            current = dict(previous.values)
+            for key in changed:
+                if key in self.data:
+                    current[key] = deepcopy(self.data[key])
+                else:
+                    del current[key]
+            snapshot = ConfigSnapshot(previous.version + 1, current)
+            self._snapshot = snapshot
+        for callback in list(self._listeners):
+            try:
+                callback(snapshot, changed)
+            except Exception as e:
+                print(f"[Config] Error in change listener: {e}")
+        return changed
+
+    def apply_changes(self, changes, replace=False):
+        """
+        Validates and applies a changeset in one pass, publishes a single change
+        event and writes once. With replace=True the config becomes exactly
+        `changes` (e.g. reset to defaults / import profile).
+        Returns the set of keys whose value actually changed.
+        """
+        if replace:
+            changes = dict(changes)
+            for key in DEFAULT_CONFIG_STRUCT:
+                changes.setdefault(key, DEFAULT_CONFIG_STRUCT[key])
+        validate_config_changes(changes, self.data)
+        with self._publish_lock:
+            if replace:
+                for key in [k for k in self.data if k not in changes]:
+                    del self.data[key]
+            self.data.update(deepcopy(changes))
+        changed = self.publish()
+        if changed:
+            with self._cond:
+                self.save_requests += 1
+                self._dirty = True
+            self.flush()
+        return changed
+
+    def request_save(self):
+        self.publish()
+        with self._cond:
+            self.save_requests += 1
+            self._dirty = True
+            self._last_change = time.monotonic()
+            self._cond.notify_all()
+
+    def flush(self):
+        """Writes pending changes now (e.g. on quit)."""
+        with self._cond:
+            dirty = self._dirty
+            self._dirty = False
+        if dirty:
+            self._write()
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self.flush()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._dirty and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                remaining = self._last_change + self.debounce - time.monotonic()
+                if remaining > 0:
+                    self._cond.wait(remaining)
+                    continue
+                self._dirty = False
+            self._write()
+
+    def _write(self):
+        if not self.path:
+            print("[Config] WARNING: Cannot save configuration, file path is not available.")
+            return
+        with self._write_lock:
+            tmp_path = self.path.with_name(self.path.name + ".tmp")
+            try:
+                snapshot = dict(self._snapshot.values)
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(snapshot, f, indent=2, ensure_ascii=False)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, self.path)
+                self.write_count += 1
+            except Exception as e:
+                print(f"[Config] Error saving config: {e}")
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
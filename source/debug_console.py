@@ -0,0 +1,112 @@
+import time
+
+from PyQt6 import QtWidgets, QtCore, QtGui
+
+from tracing import STAGES
+
+RECENT_COLUMNS = ["#", "Time", "Mode", "Outcome"] + list(STAGES) + ["Error"]
+PERCENTILE_COLUMNS = ["Stage", "n", "p50 ms", "p95 ms", "p99 ms"]
+
+
+class DebugConsoleWindow(QtWidgets.QWidget):
+    """
+    Live view of the trace ring: the most recent utterances with their stage
+    breakdown (ms) and rolling p50/p95/p99 per stage. Refreshes while visible.
+    """
+
+    def __init__(self, trace_recorder, refresh_ms=1000, parent=None):
+        super().__init__(parent)
+        self.trace_recorder = trace_recorder
+        self.setWindowTitle("OverlayTranslator - Debug Console")
+        self.resize(980, 560)
+
+        layout = QtWidgets.QVBoxLayout(self)
+        self.summary_label = QtWidgets.QLabel("")
+        layout.addWidget(self.summary_label)
+
+        self.percentile_table = self._make_table(PERCENTILE_COLUMNS)
+        self.percentile_table.setMaximumHeight(260)
+        layout.addWidget(self.percentile_table)
+
+        self.recent_table = self._make_table(RECENT_COLUMNS)
+        layout.addWidget(self.recent_table, 1)
+
+        buttons = QtWidgets.QHBoxLayout()
+        buttons.addStretch(1)
+        clear_button = QtWidgets.QPushButton("Clear")
+        clear_button.clicked.connect(self.clear_traces)
+        buttons.addWidget(clear_button)
+        layout.addLayout(buttons)
+
+        self.refresh_timer = QtCore.QTimer(self)
+        self.refresh_timer.setInterval(refresh_ms)
+        self.refresh_timer.timeout.connect(self.refresh)
+
+    @staticmethod
+    def _make_table(columns):
+        table = QtWidgets.QTableWidget(0, len(columns))
+        table.setHorizontalHeaderLabels(columns)
+        table.verticalHeader().setVisible(False)
+        table.setEditTriggers(QtWidgets.QAbstractItemView.EditTrigger.NoEditTriggers)
+        table.horizontalHeader().setSectionResizeMode(QtWidgets.QHeaderView.ResizeMode.ResizeToContents)
+        table.horizontalHeader().setStretchLastSection(True)
+        return table
+
+    @staticmethod
+    def _set_row(table, row, values):
+        for column, value in enumerate(values):
+            item = QtWidgets.QTableWidgetItem(value)
+            if column > 0:
+                item.setTextAlignment(QtCore.Qt.AlignmentFlag.AlignRight | QtCore.Qt.AlignmentFlag.AlignVCenter)
+            table.setItem(row, column, item)
+
+    @staticmethod
+    def _ms(value):
+        return "" if value is None else f"{value:.1f}"
+
+    def showEvent(self, event):
+        self.refresh()
+        self.refresh_timer.start()
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        self.refresh_timer.stop()
+        super().hideEvent(event)
+
+    def clear_traces(self):
+        self.trace_recorder.clear()
+        self.refresh()
+
+    def refresh(self):
+        traces = self.trace_recorder.recent()
+        outcomes = {}
+        for trace in traces:
+            outcome = trace.outcome or "in progress"
+            outcomes[outcome] = outcomes.get(outcome, 0) + 1
+        self.summary_label.setText(
+            f"Utterances in window: {len(traces)} (total recorded: {self.trace_recorder.recorded})   "
+            + "   ".join(f"{k}: {v}" for k, v in sorted(outcomes.items()))
+        )
+
+        percentiles = self.trace_recorder.stage_percentiles()
+        self.percentile_table.setRowCount(len(percentiles))
+        for row, (stage, values) in enumerate(percentiles.items()):
+            self._set_row(self.percentile_table, row, [
+                stage, str(values["n"]), self._ms(values["p50"]), self._ms(values["p95"]), self._ms(values["p99"]),
+            ])
+
+        self.recent_table.setRowCount(len(traces))
+        for row, trace in enumerate(traces):
+            spans = trace.spans()
+            values = [
+                str(trace.id),
+                time.strftime("%H:%M:%S", time.localtime(trace.started_at)),
+                trace.mode,
+                trace.outcome or "in progress",
+            ]
+            values += [self._ms(spans[stage] * 1000) if stage in spans else "" for stage in STAGES]
+            values.append("" if trace.error is None else f"{type(trace.error).__name__}: {trace.error}")
+            self._set_row(self.recent_table, row, values)
+            if trace.outcome not in (None, "ok"):
+                for column in range(len(values)):
+                    self.recent_table.item(row, column).setForeground(QtGui.QColor("#b00020"))
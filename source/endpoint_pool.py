@@ -0,0 +1,266 @@
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from modules import (
+    DEFAULT_LIBRETRANSLATE_ROUTING,
+    DEFAULT_HEDGE_MIN_DELAY,
+    DEFAULT_HEDGE_INITIAL_DELAY,
+    HEDGE_MIN_SAMPLES,
+    ENDPOINT_EWMA_ALPHA,
+    ENDPOINT_LATENCY_WINDOW,
+)
+from health import CircuitBreaker, TranslatorUnavailable, BREAKER_CLOSED
+from tracing import percentile
+
+
+class Endpoint:
+    """One LibreTranslate replica: its client, breaker, load and latency statistics."""
+
+    def __init__(self, client):
+        self.client = client
+        self.url = client.server_url
+        self.breaker = CircuitBreaker()
+        client.breaker = self.breaker
+        # {source: {targets}} from /languages; None until discovered (assume everything).
+        self.pairs = None
+        self.outstanding = 0
+        self.ewma = None
+        self._latencies = deque(maxlen=ENDPOINT_LATENCY_WINDOW)
+        self._lock = threading.Lock()
+
+    def supports(self, source_lang, target_lang):
+        pairs = self.pairs
+        return pairs is None or target_lang in pairs.get(source_lang, ())
+
+    def set_languages(self, languages):
+        self.pairs = {
+            entry["code"]: set(entry.get("targets", ()))
+            for entry in languages if isinstance(entry, dict) and "code" in entry
+        }
+
+    def begin(self):
+        with self._lock:
+            self.outstanding += 1
+
+    def end(self, elapsed, ok):
+        with self._lock:
+            self.outstanding -= 1
+            if ok:
+                # Failures are not folded in: a refused connection is fast but not good.
+                self.ewma = elapsed if self.ewma is None else \
+                    ENDPOINT_EWMA_ALPHA * elapsed + (1 - ENDPOINT_EWMA_ALPHA) * self.ewma
+                self._latencies.append(elapsed)
+
+    def latency_percentile(self, pct):
+        with self._lock:
+            samples = list(self._latencies)
+        return percentile(samples, pct) if len(samples) >= HEDGE_MIN_SAMPLES else None
+
+
+class EndpointPool:
+    """
+    Drop-in replacement for a single LibreTranslateClient over several
+    replicas (e.g. containers started with different LT_LOAD_ONLY sets).
+
+    Routing: only replicas whose /languages lists the pair (unknown = any),
+    preferring ones whose breaker is closed, then by policy:
+      "ewma"              EWMA latency * (outstanding + 1), lowest wins
+      "least_outstanding" fewest requests in flight, EWMA breaks ties
+    A replica never measured scores 0, so new replicas get traffic right away.
+
+    Hedging (optional): if the chosen replica has not answered within the
+    pool's p95 latency, the same request goes to the next best replica and
+    the first good answer wins. A request that fails outright is retried once on the
+    next replica instead.
+    """
+
+    def __init__(self, clients, routing=DEFAULT_LIBRETRANSLATE_ROUTING, hedge=False,
+                 hedge_min_delay=DEFAULT_HEDGE_MIN_DELAY, hedge_initial_delay=DEFAULT_HEDGE_INITIAL_DELAY):
+        self.endpoints = [Endpoint(client) for client in clients]
+        self.routing = routing
+        self.hedge = hedge and len(self.endpoints) > 1
+        self.hedge_min_delay = hedge_min_delay
+        self.hedge_initial_delay = hedge_initial_delay
+        self.hedged = 0
+        self.hedge_wins = 0
+        self.failovers = 0
+        self.rejected = 0
+        # Service-wide latencies: the hedge delay is the p95 over every replica,
+        # so a replica that is slow as a rule still gets hedged.
+        self._latencies = deque(maxlen=ENDPOINT_LATENCY_WINDOW)
+        self._executor = None
+        if self.hedge:
+            self._executor = ThreadPoolExecutor(max_workers=2 * len(self.endpoints) + 2,
+                                                thread_name_prefix="libretranslate-hedge")
+
+    @property
+    def server_urls(self):
+        return [endpoint.url for endpoint in self.endpoints]
+
+    @property
+    def server_url(self):
+        return self.endpoints[0].url
+
+    def _score(self, endpoint):
+        ewma = endpoint.ewma or 0.0
+        if self.routing == "least_outstanding":
+            return (endpoint.outstanding, ewma, random.random())
+        return (ewma * (endpoint.outstanding + 1), random.random())
+
+    def candidates(self, source_lang, target_lang):
+        """Replicas for this pair, best first. Raises TranslatorUnavailable if all of them are tripped."""
+        capable = [e for e in self.endpoints if e.supports(source_lang, target_lang)] or list(self.endpoints)
+        closed = sorted((e for e in capable if e.breaker.state == BREAKER_CLOSED), key=self._score)
+        if closed:
+            return closed
+        # Every replica is tripped: let one of them run its half-open trial request.
+        for endpoint in sorted(capable, key=self._score):
+            if endpoint.breaker.allow_request():
+                return [endpoint]
+        self.rejected += 1
+        raise TranslatorUnavailable("LibreTranslate server is not responding - will retry automatically.")
+
+    def _request(self, endpoint, call):
+        endpoint.begin()
+        start = time.perf_counter()
+        result = None
+        try:
+            result = call(endpoint.client)
+            return result
+        finally:
+            elapsed = time.perf_counter() - start
+            endpoint.end(elapsed, result is not None)
+            if result is not None:
+                self._latencies.append(elapsed)
+
+    def hedge_delay(self):
+        samples = list(self._latencies)
+        if len(samples) < HEDGE_MIN_SAMPLES:
+            return self.hedge_initial_delay
+        return max(self.hedge_min_delay, percentile(samples, 95))
+
+    def _submit(self, endpoint, call):
+        try:
+            return self._executor.submit(self._request, endpoint, call)
+        except RuntimeError:
+            # close() ran (client rebuilt after a settings change) while this call was under way.
+            return None
+
+    def _call_direct(self, primary, backup, call):
+        result = self._request(primary, call)
+        if result is None and backup is not None:
+            self.failovers += 1
+            result = self._request(backup, call)
+        return result
+
+    def _call(self, source_lang, target_lang, call):
+        candidates = self.candidates(source_lang, target_lang)
+        primary = candidates[0]
+        backup = candidates[1] if len(candidates) > 1 else None
+        first = self._submit(primary, call) if self.hedge and backup is not None else None
+        if first is None:
+            return self._call_direct(primary, backup, call)
+
+        done, _ = wait([first], timeout=self.hedge_delay())
+        if done:
+            result = first.result()
+            if result is None:
+                self.failovers += 1
+                result = self._request(backup, call)
+            return result
+
+        second = self._submit(backup, call)
+        if second is None:
+            return first.result()
+        self.hedged += 1
+        pending = {first, second}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                result = future.result()
+                if result is not None:
+                    if future is second:
+                        self.hedge_wins += 1
+                    # The slower request finishes in the background; its answer is dropped.
+                    return result
+        return None
+
+    def translate(self, text, source_lang="pl", target_lang="en"):
+        return self._call(source_lang, target_lang,
+                          lambda client: client.translate(text, source_lang=source_lang, target_lang=target_lang))
+
+    def translate_batch(self, texts, source_lang="pl", target_lang="en"):
+        if not texts:
+            return []
+        return self._call(source_lang, target_lang,
+                          lambda client: client.translate_batch(texts, source_lang=source_lang, target_lang=target_lang))
+
+    def warm_up(self, text, source_lang, target_lang):
+        """Translates text on every replica serving the pair; returns the first result or None."""
+        result = None
+        for endpoint in self.endpoints:
+            if endpoint.supports(source_lang, target_lang) and endpoint.breaker.state == BREAKER_CLOSED:
+                translated = self._request(endpoint, lambda client: client.translate(
+                    text, source_lang=source_lang, target_lang=target_lang))
+                result = result if result is not None else translated
+        return result
+
+    def languages(self, timeout=None):
+        """
+        Health check of every replica: refreshes its language pairs and breaker.
+        Returns the union of their /languages lists; raises if none answered.
+        """
+        merged = {}
+        last_error = None
+        for endpoint in self.endpoints:
+            try:
+                languages = endpoint.client.languages(timeout)
+            except Exception as e:
+                last_error = e
+                if endpoint.breaker.state == BREAKER_CLOSED:
+                    print(f"[Translator] Replica {endpoint.url} is not responding: {e}")
+                endpoint.breaker.trip()
+                continue
+            endpoint.set_languages(languages)
+            endpoint.breaker.reset()
+            for entry in languages:
+                if isinstance(entry, dict) and "code" in entry:
+                    merged.setdefault(entry["code"], entry)
+        if not merged and last_error is not None:
+            raise last_error
+        return list(merged.values())
+
+    def request_stats(self):
+        """RequestStats.as_dict() summed over the replicas."""
+        total = {"requests": 0, "errors": 0, "error_types": {}}
+        for endpoint in self.endpoints:
+            stats = endpoint.client.stats.as_dict()
+            total["requests"] += stats["requests"]
+            total["errors"] += stats["errors"]
+            for error_type, count in stats["error_types"].items():
+                total["error_types"][error_type] = total["error_types"].get(error_type, 0) + count
+        return total
+
+    def endpoint_status(self):
+        """[{url, breaker, outstanding, ewma_ms, p95_ms, languages}] for metrics and diagnostics."""
+        status = []
+        for endpoint in self.endpoints:
+            p95 = endpoint.latency_percentile(95)
+            status.append({
+                "url": endpoint.url,
+                "breaker": endpoint.breaker.state,
+                "outstanding": endpoint.outstanding,
+                "ewma_ms": endpoint.ewma * 1000 if endpoint.ewma is not None else None,
+                "p95_ms": p95 * 1000 if p95 is not None else None,
+                "languages": len(endpoint.pairs) if endpoint.pairs is not None else None,
+            })
+        return status
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+        for endpoint in self.endpoints:
+            endpoint.client.close()
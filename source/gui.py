@@ -8,6 +8,7 @@ from modules import (
     OVERLAY_POSITIONS, 
     TARGET_LANGUAGES,
     SOURCE_LANGUAGES,
+    RECOGNIZER_ENGINES,
     TRANSLATOR_ENGINES
 )
 
@@ -193,7 +194,7 @@ class SettingsWindow(QtWidgets.QWidget):
 
         version_label = QtWidgets.QLabel(f"Version: {self.app_version}")
         lang_layout = QtWidgets.QHBoxLayout()
-        source_lang_label = QtWidgets.QLabel("Source language (Google Speech Web API):")
+        source_lang_label = QtWidgets.QLabel("Source language (speech recognition):")
         self.source_lang_combo = QtWidgets.QComboBox()
         for code, name in SOURCE_LANGUAGES.items():
             self.source_lang_combo.addItem(name, code)
@@ -210,7 +211,7 @@ class SettingsWindow(QtWidgets.QWidget):
             self.target_lang_combo.addItem(name, code)
         current_target_index = 0
         for i, (code, _) in enumerate(TARGET_LANGUAGES.items()):
-            if code == self.current_config_ref.get("target_language", "en"):
+            if code == self._target_languages()[0]:
                 current_target_index = i
         self.target_lang_combo.setCurrentIndex(current_target_index)
         self.target_lang_combo.currentIndexChanged.connect(self.change_target_language)
@@ -220,8 +221,19 @@ class SettingsWindow(QtWidgets.QWidget):
         lang_layout.addSpacing(20)
         lang_layout.addWidget(target_lang_label)
         lang_layout.addWidget(self.target_lang_combo)
+
+        extra_targets_layout = QtWidgets.QHBoxLayout()
+        extra_targets_label = QtWidgets.QLabel("Also translate to (codes, comma separated):")
+        self.extra_targets_edit = QtWidgets.QLineEdit(", ".join(self._target_languages()[1:]))
+        self.extra_targets_edit.setPlaceholderText("e.g. de, fr")
+        self.extra_targets_edit.setMaximumWidth(200)
+        self.extra_targets_edit.editingFinished.connect(self.change_extra_target_languages)
+        extra_targets_layout.addWidget(extra_targets_label)
+        extra_targets_layout.addWidget(self.extra_targets_edit)
+        extra_targets_layout.addStretch(1)
         main_layout.addWidget(version_label)
         main_layout.addLayout(lang_layout)
+        main_layout.addLayout(extra_targets_layout)
         main_layout.addSpacing(6)
 
         hotkey_layout = QtWidgets.QHBoxLayout()
@@ -261,36 +273,34 @@ class SettingsWindow(QtWidgets.QWidget):
         
         engine_layout = QtWidgets.QHBoxLayout()
         engine_label = QtWidgets.QLabel("Speech recognition engine:")
-        self.engine_display = QtWidgets.QLabel("Google (Online)")
-        self.engine_display.setStyleSheet("""
-            QLabel {
-                background-color: #f0f0f0;
-                color: #808080;
-                border: 1px solid #d0d0d0;
-                border-radius: 6px;
-                padding: 4px 8px;
-            }
-        """)
-        
+        self.engine_combo = QtWidgets.QComboBox()
+        for code, name in RECOGNIZER_ENGINES.items():
+            self.engine_combo.addItem(name, code)
+        current_engine_index = 0
+        for i, (code, _) in enumerate(RECOGNIZER_ENGINES.items()):
+            if code == self.current_config_ref.get("recognizer_engine", "speech_recognition"):
+                current_engine_index = i
+        self.engine_combo.setCurrentIndex(current_engine_index)
+        self.engine_combo.currentIndexChanged.connect(self.change_recognizer_engine)
+
         engine_layout.addWidget(engine_label)
-        engine_layout.addWidget(self.engine_display)
+        engine_layout.addWidget(self.engine_combo)
         main_layout.addLayout(engine_layout)
 
         translator_layout = QtWidgets.QHBoxLayout()
         translator_label = QtWidgets.QLabel("Translation engine:")
-        self.translator_display = QtWidgets.QLabel("LibreTranslate (Local)")
-        self.translator_display.setStyleSheet("""
-            QLabel {
-                background-color: #f0f0f0;
-                color: #808080;
-                border: 1px solid #d0d0d0;
-                border-radius: 6px;
-                padding: 4px 8px;
-            }
-        """)
-        
+        self.translator_combo = QtWidgets.QComboBox()
+        for code, name in self.translator_engines_map.items():
+            self.translator_combo.addItem(name, code)
+        current_translator_index = 0
+        for i, (code, _) in enumerate(self.translator_engines_map.items()):
+            if code == self.current_config_ref.get("translator_engine", "libretranslate_local"):
+                current_translator_index = i
+        self.translator_combo.setCurrentIndex(current_translator_index)
+        self.translator_combo.currentIndexChanged.connect(self.change_translator_engine)
+
         translator_layout.addWidget(translator_label)
-        translator_layout.addWidget(self.translator_display)
+        translator_layout.addWidget(self.translator_combo)
         main_layout.addLayout(translator_layout)
 
         display_time_layout = QtWidgets.QHBoxLayout()
@@ -337,16 +347,23 @@ class SettingsWindow(QtWidgets.QWidget):
         main_layout.addLayout(initial_silence_layout)
         self.initial_silence_slider.valueChanged.connect(self.change_initial_silence_slider)
 
+        self.calibration_status_label = QtWidgets.QLabel("Noise calibration: not calibrated yet")
+        main_layout.addWidget(self.calibration_status_label)
+        self.calibration_status_timer = QtCore.QTimer(self)
+        self.calibration_status_timer.timeout.connect(self.refresh_calibration_status)
+        self.calibration_status_timer.start(2000)
+
         libre_url_layout = QtWidgets.QHBoxLayout()
-        libre_url_label = QtWidgets.QLabel("LibreTranslate local server URL:")
+        libre_url_label = QtWidgets.QLabel("LibreTranslate server URL(s):")
         self.libre_url_edit = QtWidgets.QLineEdit()
-        self.libre_url_edit.setText(self.current_config_ref.get("libretranslate_url", "http://localhost:5000/translate"))
+        self.libre_url_edit.setText(self._libre_url_text())
         self.libre_url_edit.setMinimumWidth(350)
-        self.libre_url_edit.setPlaceholderText("e.g. http://localhost:5000/translate")
+        self.libre_url_edit.setPlaceholderText("e.g. http://localhost:5000/translate, http://localhost:5001/translate")
         libre_url_layout.addWidget(libre_url_label)
         libre_url_layout.addWidget(self.libre_url_edit)
         main_layout.addLayout(libre_url_layout)
-        self.libre_url_edit.textChanged.connect(self.auto_save_libre_url)
+        # Not textChanged: every keystroke forming a valid URL would rebuild the client.
+        self.libre_url_edit.editingFinished.connect(self.auto_save_libre_url)
         
         main_layout.addStretch()
         
@@ -471,101 +488,107 @@ class SettingsWindow(QtWidgets.QWidget):
         self.current_config_ref["phrase_time_limit"] = value
         self.save_config_func()
 
+    def _target_languages(self):
+        """target_language as a list: the combo's language first, then the extra targets."""
+        value = self.current_config_ref.get("target_language", "en")
+        return [value] if isinstance(value, str) else list(value) or ["en"]
+
+    def _set_target_languages(self, primary, extras):
+        codes = list(dict.fromkeys([primary] + extras))
+        self.current_config_ref["target_language"] = codes[0] if len(codes) == 1 else codes
+        self.save_config_func()
+
     def change_target_language(self):
         code = self.target_lang_combo.currentData()
-        self.current_config_ref["target_language"] = code
-        self.save_config_func()
+        self._set_target_languages(code, self._target_languages()[1:])
+
+    def change_extra_target_languages(self):
+        extras = [code.strip().lower() for code in self.extra_targets_edit.text().split(",") if code.strip()]
+        unknown = [code for code in extras if code not in TARGET_LANGUAGES]
+        if unknown:
+            QtWidgets.QMessageBox.warning(self, "Target languages",
+                                          f"Unknown language code(s): {', '.join(unknown)}\n"
+                                          f"Available: {', '.join(TARGET_LANGUAGES)}")
+            self.extra_targets_edit.setText(", ".join(self._target_languages()[1:]))
+            return
+        if extras != self._target_languages()[1:]:
+            self._set_target_languages(self._target_languages()[0], extras)
+            self.extra_targets_edit.setText(", ".join(self._target_languages()[1:]))
 
     def change_source_language(self):
         code = self.source_lang_combo.currentData()
         self.current_config_ref["source_language"] = code
         self.save_config_func()
 
-    def auto_save_libre_url(self):
-        url = self.libre_url_edit.text().strip()
-        if url.startswith("http://") or url.startswith("https://"):
-            self.current_config_ref["libretranslate_url"] = url
+    def change_recognizer_engine(self):
+        code = self.engine_combo.currentData()
+        if code != self.current_config_ref.get("recognizer_engine"):
+            self.current_config_ref["recognizer_engine"] = code
             self.save_config_func()
+            if hasattr(self.tray_app, 'recognizer_engine_changed'):
+                self.tray_app.recognizer_engine_changed()
 
-    def reset_to_defaults(self):
-        defaults = deepcopy(DEFAULT_CONFIG_STRUCT)
+    def change_translator_engine(self):
+        code = self.translator_combo.currentData()
+        if code != self.current_config_ref.get("translator_engine"):
+            self.current_config_ref["translator_engine"] = code
+            self.save_config_func()
 
-        prev_config = deepcopy(self.current_config_ref)
-        changed_keys = []
-        for k, v in defaults.items():
-            if prev_config.get(k) != v:
-                changed_keys.append(k)
+    def _libre_url_text(self):
+        value = self.current_config_ref.get("libretranslate_url", DEFAULT_CONFIG_STRUCT["libretranslate_url"])
+        return value if isinstance(value, str) else ", ".join(value)
 
-        suppress_prev = getattr(self.tray_app, '_suppress_tray_messages', False)
+    def auto_save_libre_url(self):
+        # Several comma separated URLs = replicas the requests are balanced over.
+        urls = [url.strip() for url in self.libre_url_edit.text().split(",") if url.strip()]
+        if urls and all(url.startswith("http://") or url.startswith("https://") for url in urls):
+            value = urls[0] if len(urls) == 1 else urls
+            if value == self.current_config_ref.get("libretranslate_url"):
+                return
+            self.current_config_ref["libretranslate_url"] = value
+            self.save_config_func()
+            if hasattr(self.tray_app, 'libretranslate_url_changed'):
+                self.tray_app.libretranslate_url_changed(value)
+
+    def refresh_from_config(self):
+        """Syncs every widget with the config without re-triggering their change handlers."""
+        widgets = [self.hotkey_edit, self.copy_hotkey_edit, self.pos_combo, self.display_time_spinbox,
+                   self.phrase_time_spinbox, self.initial_silence_slider, self.libre_url_edit,
+                   self.engine_combo, self.translator_combo, self.source_lang_combo, self.target_lang_combo,
+                   self.extra_targets_edit]
+        blockers = [QtCore.QSignalBlocker(w) for w in widgets]
         try:
-            setattr(self.tray_app, '_suppress_tray_messages', True)
-
-            try:
-                self.current_config_ref.clear()
-                self.current_config_ref.update(defaults)
-            except Exception:
-                self.current_config_ref = defaults
-
-            try:
-                self.hotkey_edit.setText(self.current_config_ref.get("hotkey_translate", DEFAULT_CONFIG_STRUCT["hotkey_translate"]))
-                self.copy_hotkey_edit.setText(self.current_config_ref.get("hotkey_copy", DEFAULT_CONFIG_STRUCT["hotkey_copy"]))
-
-                desired_pos = self.current_config_ref.get("overlay_position", DEFAULT_CONFIG_STRUCT["overlay_position"]) 
-                for i in range(self.pos_combo.count()):
-                    if self.pos_combo.itemData(i) == desired_pos:
-                        self.pos_combo.setCurrentIndex(i)
-                        break
-
-                self.display_time_spinbox.setValue(int(self.current_config_ref.get("overlay_display_time", DEFAULT_CONFIG_STRUCT["overlay_display_time"])))
-                self.phrase_time_spinbox.setValue(int(self.current_config_ref.get("phrase_time_limit", DEFAULT_CONFIG_STRUCT["phrase_time_limit"])))
-                init_val = int(round(self.current_config_ref.get("initial_silence_timeout", DEFAULT_CONFIG_STRUCT.get("initial_silence_timeout", 4.0)) * 10))
-                self.initial_silence_slider.setValue(init_val)
-                try:
-                    self.initial_silence_value_label.setText(f"{self.initial_silence_slider.value()/10:.1f} s")
-                except Exception:
-                    pass
-
-                try:
-                    self.libre_url_edit.setText(self.current_config_ref.get("libretranslate_url", DEFAULT_CONFIG_STRUCT.get("libretranslate_url", "http://localhost:5000/translate")))
-                except Exception:
-                    pass
-
-                src = self.current_config_ref.get("source_language")
-                for i in range(self.source_lang_combo.count()):
-                    if self.source_lang_combo.itemData(i) == src:
-                        self.source_lang_combo.setCurrentIndex(i)
-                        break
-                tgt = self.current_config_ref.get("target_language")
-                for i in range(self.target_lang_combo.count()):
-                    if self.target_lang_combo.itemData(i) == tgt:
-                        self.target_lang_combo.setCurrentIndex(i)
-                        break
-            except Exception:
-                pass
-
-            try:
-                self.register_hotkey_translation_func(self.current_config_ref.get("hotkey_translate"))
-            except Exception:
-                pass
-            try:
-                self.register_hotkey_copy_func(self.current_config_ref.get("hotkey_copy"))
-            except Exception:
-                pass
+            self.hotkey_edit.setText(self.current_config_ref.get("hotkey_translate", DEFAULT_CONFIG_STRUCT["hotkey_translate"]))
+            self.copy_hotkey_edit.setText(self.current_config_ref.get("hotkey_copy", DEFAULT_CONFIG_STRUCT["hotkey_copy"]))
+            self._select_combo_data(self.pos_combo, self.current_config_ref.get("overlay_position"))
+            self.display_time_spinbox.setValue(int(self.current_config_ref.get("overlay_display_time", DEFAULT_CONFIG_STRUCT["overlay_display_time"])))
+            self.phrase_time_spinbox.setValue(int(self.current_config_ref.get("phrase_time_limit", DEFAULT_CONFIG_STRUCT["phrase_time_limit"])))
+            init_val = int(round(self.current_config_ref.get("initial_silence_timeout", DEFAULT_CONFIG_STRUCT["initial_silence_timeout"]) * 10))
+            self.initial_silence_slider.setValue(init_val)
+            self.initial_silence_value_label.setText(f"{self.initial_silence_slider.value()/10:.1f} s")
+            self.libre_url_edit.setText(self._libre_url_text())
+            self._select_combo_data(self.engine_combo, self.current_config_ref.get("recognizer_engine"))
+            self._select_combo_data(self.translator_combo, self.current_config_ref.get("translator_engine"))
+            self._select_combo_data(self.source_lang_combo, self.current_config_ref.get("source_language"))
+            self._select_combo_data(self.target_lang_combo, self._target_languages()[0])
+            self.extra_targets_edit.setText(", ".join(self._target_languages()[1:]))
+        finally:
+            del blockers
 
-            try:
-                if hasattr(self.tray_app, 'overlay_window') and self.tray_app.overlay_window:
-                    self.tray_app.overlay_window.update_settings_from_config(self.current_config_ref)
-                    if hasattr(self.tray_app, 'change_position'):
-                        self.tray_app.change_position(self.current_config_ref.get("overlay_position"))
-            except Exception:
-                pass
+    @staticmethod
+    def _select_combo_data(combo, data):
+        for i in range(combo.count()):
+            if combo.itemData(i) == data:
+                combo.setCurrentIndex(i)
+                break
 
-            try:
-                self.save_config_func()
-            except Exception:
-                pass
-        finally:
-            setattr(self.tray_app, '_suppress_tray_messages', suppress_prev)
+    def reset_to_defaults(self):
+        try:
+            changed_keys = self.tray_app.apply_config_changes(deepcopy(DEFAULT_CONFIG_STRUCT), replace=True)
+        except ValueError as e:
+            QtWidgets.QMessageBox.warning(self, "Reset to defaults", f"Cannot apply defaults.\nError: {e}")
+            return
+        self.refresh_from_config()
 
         if changed_keys:
             friendly_names = {
@@ -578,7 +601,7 @@ class SettingsWindow(QtWidgets.QWidget):
                 'phrase_time_limit': 'Max recording time',
                 'libretranslate_url': 'LibreTranslate URL',
             }
-            items = [friendly_names.get(k, k) for k in changed_keys]
+            items = [friendly_names.get(k, k) for k in sorted(changed_keys)]
             if len(items) > 6:
                 items = items[:6] + ['…']
             summary = 'Defaults applied: ' + ', '.join(items)
@@ -594,8 +617,6 @@ class SettingsWindow(QtWidgets.QWidget):
             except Exception:
                 pass
 
-
-
     def exit_application(self):
         """Completely closes the application after user confirmation"""
         msg_box = QtWidgets.QMessageBox(self)
@@ -611,6 +632,23 @@ class SettingsWindow(QtWidgets.QWidget):
             self.close()
             self.tray_app.quit_app()
 
+    def refresh_calibration_status(self):
+        if not self.isVisible():
+            return
+        status = []
+        if hasattr(self.tray_app, 'noise_calibration_status'):
+            status = self.tray_app.noise_calibration_status()
+        if not status:
+            self.calibration_status_label.setText("Noise calibration: not calibrated yet")
+            return
+        parts = []
+        for entry in status:
+            text = f"{entry['device']}: threshold {entry['energy_threshold']:.0f}, {entry['age_s']:.0f} s ago"
+            if entry.get('pending'):
+                text += " (recalibration pending)"
+            parts.append(text)
+        self.calibration_status_label.setText("Noise calibration: " + "; ".join(parts))
+
     def change_initial_silence_slider(self, value):
         float_val = value / 10.0
         self.initial_silence_value_label.setText(f"{float_val:.1f} s")
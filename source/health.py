@@ -0,0 +1,209 @@
+import threading
+import time
+
+from modules import (
+    DEFAULT_HEALTH_CHECK_INTERVAL,
+    DEFAULT_HEALTH_CHECK_UNHEALTHY_INTERVAL,
+    DEFAULT_HEALTH_CHECK_TIMEOUT,
+    DEFAULT_CIRCUIT_BREAKER_FAILURES,
+    DEFAULT_CIRCUIT_BREAKER_RESET,
+    HEALTH_WARM_UP_TEXT,
+)
+
+BREAKER_CLOSED = "closed"
+BREAKER_OPEN = "open"
+BREAKER_HALF_OPEN = "half_open"
+
+
+class TranslatorUnavailable(RuntimeError):
+    """Raised instead of sending a request while the circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """
+    Fails translation requests fast while the server is down.
+
+    closed: requests go through; failure_threshold consecutive failures open it.
+    open: requests are refused until reset_timeout passed, then one trial
+    request is let through (half open). Its success closes the breaker, its
+    failure opens it again. The health monitor can also trip() or reset() it.
+    """
+
+    def __init__(self, failure_threshold=DEFAULT_CIRCUIT_BREAKER_FAILURES,
+                 reset_timeout=DEFAULT_CIRCUIT_BREAKER_RESET, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._state = BREAKER_CLOSED
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+        self.rejected = 0
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._state
+
+    def allow_request(self):
+        with self._lock:
+            if self._state == BREAKER_CLOSED:
+                return True
+            if self._state == BREAKER_OPEN and self.clock() - self._opened_at >= self.reset_timeout:
+                self._set_state(BREAKER_HALF_OPEN)
+            if self._state == BREAKER_HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._trial_in_flight = False
+            self._set_state(BREAKER_CLOSED)
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._state == BREAKER_HALF_OPEN or self._failures >= self.failure_threshold:
+                self._open()
+
+    def trip(self):
+        with self._lock:
+            self._trial_in_flight = False
+            self._open()
+
+    def reset(self):
+        self.record_success()
+
+    def _open(self):
+        self._opened_at = self.clock()
+        self._set_state(BREAKER_OPEN)
+
+    def _set_state(self, state):
+        # Called with the lock held.
+        if state == self._state:
+            return
+        old_state, self._state = self._state, state
+        print(f"[Health] Circuit breaker {old_state} -> {state}")
+
+
+class HealthMonitor:
+    """
+    Background thread that polls the translation server's health endpoint
+    (LibreTranslate: /languages) and drives the engine's circuit breaker:
+    a failed poll trips it, a good poll closes it again.
+
+    It also sends a warm-up translation for every configured language pair at
+    startup, after settings changed (request_warm_up) and whenever the server
+    comes back, so the first real utterance does not pay for loading models.
+
+    engine_func() -> current TranslatorEngine
+    warm_up_pairs_func() -> [(source_lang, target_lang)]
+    """
+
+    def __init__(self, engine_func, warm_up_pairs_func,
+                 interval=DEFAULT_HEALTH_CHECK_INTERVAL,
+                 unhealthy_interval=DEFAULT_HEALTH_CHECK_UNHEALTHY_INTERVAL,
+                 timeout=DEFAULT_HEALTH_CHECK_TIMEOUT):
+        self.engine_func = engine_func
+        self.warm_up_pairs_func = warm_up_pairs_func
+        self.interval = interval
+        self.unhealthy_interval = unhealthy_interval
+        self.timeout = timeout
+        self.healthy = None
+        self.languages = None
+        self.last_check = None
+        self.last_latency = None
+        self.last_error = None
+        self.warm_ups = 0
+        self._warm_up_pending = True
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is not None:
+            return self
+        self._thread = threading.Thread(target=self._run, name="translator-health", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def request_warm_up(self):
+        """Warm up the configured pairs on the next tick (e.g. language or server changed)."""
+        self._warm_up_pending = True
+        self._wake.set()
+
+    def check_now(self):
+        self._wake.set()
+
+    def status(self):
+        engine = self.engine_func()
+        breaker = getattr(engine, "breaker", None)
+        return {
+            "engine": engine.name,
+            "healthy": self.healthy,
+            "breaker": breaker.state if breaker is not None else None,
+            "last_check_age_s": time.monotonic() - self.last_check if self.last_check else None,
+            "last_latency_ms": self.last_latency * 1000 if self.last_latency is not None else None,
+            "languages": len(self.languages) if self.languages is not None else None,
+            "last_error": self.last_error,
+            "warm_ups": self.warm_ups,
+        }
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self._tick()
+            except Exception as e:
+                print(f"[Health] Monitor error: {e}")
+            self._wake.wait(self.unhealthy_interval if self.healthy is False else self.interval)
+            self._wake.clear()
+
+    def _tick(self):
+        engine = self.engine_func()
+        breaker = getattr(engine, "breaker", None)
+        if breaker is None:
+            # Backend without a server to watch (e.g. the fake engine).
+            self.healthy = None
+            return
+        was_healthy = self.healthy
+        start = time.perf_counter()
+        try:
+            self.languages = engine.check_health(self.timeout)
+            self.last_latency = time.perf_counter() - start
+            self.last_error = None
+            self.healthy = True
+            breaker.reset()
+        except Exception as e:
+            self.last_latency = None
+            self.last_error = f"{type(e).__name__}: {e}"
+            if self.healthy is not False:
+                print(f"[Health] {engine.short_name} server is not responding: {self.last_error}")
+            self.healthy = False
+            breaker.trip()
+        self.last_check = time.monotonic()
+        if self.healthy and was_healthy is False:
+            print(f"[Health] {engine.short_name} server is back ({self.last_latency * 1000:.0f} ms).")
+            self._warm_up_pending = True
+        if self.healthy and self._warm_up_pending:
+            self._warm_up_pending = False
+            self._warm_up(engine)
+
+    def _warm_up(self, engine):
+        for source_lang, target_lang in self.warm_up_pairs_func():
+            start = time.perf_counter()
+            result = engine.warm_up_pair(HEALTH_WARM_UP_TEXT, source_lang, target_lang)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            if result is None:
+                print(f"[Health] Warm-up {source_lang}->{target_lang} failed after {elapsed_ms:.0f} ms")
+            else:
+                self.warm_ups += 1
+                print(f"[Health] Warm-up {source_lang}->{target_lang}: {elapsed_ms:.0f} ms")
@@ -0,0 +1,259 @@
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+METRIC_PREFIX = "overlay_translator_"
+
+# Stage latency buckets in seconds (Prometheus convention).
+DEFAULT_LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+METRIC_HELP = {
+    "utterances_total": ("counter", "Utterances handled, by mode and outcome (\"rejected\"/\"dropped\": pipeline full)."),
+    "stage_latency_seconds": ("histogram", "Latency of each pipeline stage, by mode (hotkey, continuous)."),
+    "recognizer_errors_total": ("counter", "Speech recognition errors, by engine and error type."),
+    "translator_errors_total": ("counter", "Translation request errors of the current client, by engine and error type."),
+    "translator_requests_total": ("counter", "Translation requests sent by the current client."),
+    "translator_healthy": ("gauge", "1 if the last health check of the translation server succeeded."),
+    "translator_circuit_open": ("gauge", "1 while the translator circuit breaker is open or half open."),
+    "translator_fast_failures_total": ("counter", "Translations refused at once because the server (or every replica) was down."),
+    "translator_endpoint_outstanding": ("gauge", "Requests in flight per LibreTranslate replica."),
+    "translator_endpoint_up": ("gauge", "1 while the replica's circuit breaker is closed."),
+    "translator_endpoint_ewma_seconds": ("gauge", "EWMA latency of successful requests per replica."),
+    "translator_hedged_requests_total": ("counter", "Requests duplicated to a second replica after the p95 hedge delay."),
+    "translator_hedge_wins_total": ("counter", "Hedged requests answered first by the second replica."),
+    "translator_failovers_total": ("counter", "Failed requests retried on another replica."),
+    "recognizer_upload_bytes_total": ("counter", "Encoded audio bytes uploaded to the recognizer, by codec (flac, l16)."),
+    "translation_segments_total": ("counter", "Sentences/clauses sent for translation (long utterances are split)."),
+    "audio_bytes_processed_total": ("counter", "Raw PCM bytes run through voice activity detection."),
+    "audio_bytes_utterance_total": ("counter", "Raw PCM bytes of captured utterances sent to the recognizer."),
+    "translation_cache_lookups_total": ("counter", "Translation cache lookups, by result (memory, disk, miss)."),
+    "translation_cache_hit_ratio": ("gauge", "Share of translation cache lookups served from memory or disk."),
+    "pipeline_in_flight": ("gauge", "Utterances currently inside the pipeline."),
+    "config_save_requests_total": ("counter", "Settings changes that asked for settings.json to be saved."),
+    "config_writes_total": ("counter", "Actual writes of settings.json (debounced save requests)."),
+    "pipeline_queue_depth": ("gauge", "Jobs waiting in front of each pipeline stage."),
+    "caption_running": ("gauge", "1 while continuous captioning is on."),
+    "caption_segments_total": ("counter", "Speech segments cut by continuous captioning."),
+    "caption_dropped_segments_total": ("counter", "Segments dropped because the captioning pipeline was full."),
+    "caption_audio_seconds_total": ("counter", "Seconds of speech segmented by continuous captioning."),
+    "caption_segments_per_minute": ("gauge", "Recent continuous captioning throughput."),
+    "caption_in_flight": ("gauge", "Segments currently inside the captioning pipeline."),
+}
+
+
+def _label_key(labels):
+    return tuple(sorted(labels.items()))
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    escaped = ",".join(
+        '{}="{}"'.format(k, str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for k, v in labels
+    )
+    return "{" + escaped + "}"
+
+
+class _Histogram:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        self.sum += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    """
+    In-process counters and histograms. Values owned by other components (cache
+    and client statistics) are pulled at export time through collectors:
+    collector() -> [(name, labels_dict, value)].
+    """
+
+    def __init__(self, buckets=DEFAULT_LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._counters = {}
+        self._histograms = {}
+        self._collectors = []
+        self._lock = threading.Lock()
+
+    def inc(self, name, amount=1, **labels):
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def observe(self, name, value, **labels):
+        key = (name, _label_key(labels))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = _Histogram(self.buckets)
+            histogram.observe(value)
+
+    def register_collector(self, collector):
+        self._collectors.append(collector)
+
+    def record_trace(self, trace):
+        """Counts one finished UtteranceTrace: outcome, stage latencies, errors, audio bytes."""
+        self.inc("utterances_total", mode=trace.mode, outcome=trace.outcome or "unknown")
+        for stage, seconds in trace.spans().items():
+            self.observe("stage_latency_seconds", seconds, mode=trace.mode, stage=stage)
+        if trace.outcome == "recognize_error":
+            error_type = type(trace.error).__name__ if trace.error is not None else "unknown"
+            self.inc("recognizer_errors_total", engine=trace.recognizer_engine or "unknown", type=error_type)
+        if trace.audio_bytes:
+            self.inc("audio_bytes_processed_total", trace.audio_bytes)
+        if trace.utterance_bytes:
+            self.inc("audio_bytes_utterance_total", trace.utterance_bytes)
+        if trace.upload_bytes:
+            self.inc("recognizer_upload_bytes_total", trace.upload_bytes, codec=trace.audio_codec or "unknown")
+        if trace.segments:
+            self.inc("translation_segments_total", trace.segments, mode=trace.mode)
+
+    def _collected(self):
+        values = []
+        for collector in list(self._collectors):
+            try:
+                values.extend(collector())
+            except Exception as e:
+                print(f"[Metrics] Collector error: {e}")
+        return values
+
+    def snapshot(self):
+        """Plain dict of every metric, e.g. for the JSONL log."""
+        with self._lock:
+            counters = [(name, dict(labels), value) for (name, labels), value in self._counters.items()]
+            histograms = [
+                (name, dict(labels), {"count": h.count, "sum": h.sum,
+                                      "buckets": dict(zip((str(b) for b in h.buckets), h.counts))})
+                for (name, labels), h in self._histograms.items()
+            ]
+        return {
+            "counters": [{"name": n, "labels": l, "value": v} for n, l, v in counters + self._collected()],
+            "histograms": [{"name": n, "labels": l, **h} for n, l, h in histograms],
+        }
+
+    def render_prometheus(self):
+        """Prometheus text exposition format (version 0.0.4)."""
+        with self._lock:
+            samples = [(name, labels, value) for (name, labels), value in self._counters.items()]
+            histograms = [(name, labels, h.buckets, list(h.counts), h.sum, h.count)
+                          for (name, labels), h in self._histograms.items()]
+        samples += [(name, _label_key(labels), value) for name, labels, value in self._collected()]
+
+        by_name = {}
+        for name, labels, value in samples:
+            by_name.setdefault(name, []).append((labels, value))
+        for name, labels, buckets, counts, total, count in histograms:
+            by_name.setdefault(name, []).append((labels, (buckets, counts, total, count)))
+
+        lines = []
+        for name in sorted(by_name):
+            full_name = METRIC_PREFIX + name
+            kind, help_text = METRIC_HELP.get(name, ("untyped", name))
+            lines.append(f"# HELP {full_name} {help_text}")
+            lines.append(f"# TYPE {full_name} {kind}")
+            for labels, value in sorted(by_name[name], key=lambda item: item[0]):
+                if kind != "histogram":
+                    lines.append(f"{full_name}{_format_labels(labels)} {value}")
+                    continue
+                buckets, counts, total, count = value
+                cumulative = 0
+                for bound, bucket_count in zip(buckets, counts):
+                    cumulative += bucket_count
+                    lines.append(f"{full_name}_bucket{_format_labels(labels + (('le', bound),))} {cumulative}")
+                lines.append(f"{full_name}_bucket{_format_labels(labels + (('le', '+Inf'),))} {count}")
+                lines.append(f"{full_name}_sum{_format_labels(labels)} {total}")
+                lines.append(f"{full_name}_count{_format_labels(labels)} {count}")
+        return "\n".join(lines) + "\n"
+
+
+class MetricsJsonlWriter:
+    """
+    Append-only JSONL log: one line per finished utterance. The file is rotated
+    to <name>.1 once it grows past max_bytes.
+    """
+
+    def __init__(self, path, max_bytes):
+        self.path = path
+        self.max_bytes = int(max_bytes)
+        self._lock = threading.Lock()
+
+    def write_trace(self, trace):
+        record = {
+            "ts": round(trace.started_at, 3),
+            "utterance": trace.id,
+            "mode": trace.mode,
+            "outcome": trace.outcome,
+            "error_type": type(trace.error).__name__ if trace.error is not None else None,
+            "recognizer": trace.recognizer_engine,
+            "translator": trace.translator_engine,
+            "stages_ms": {stage: round(seconds * 1000, 2) for stage, seconds in trace.spans().items()},
+            "audio_bytes": trace.audio_bytes,
+            "utterance_bytes": trace.utterance_bytes,
+            "upload_bytes": trace.upload_bytes,
+            "audio_codec": trace.audio_codec,
+            "segments": trace.segments,
+        }
+        self.write(record)
+
+    def write(self, record):
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        with self._lock:
+            try:
+                if self.path.exists() and self.path.stat().st_size + len(line) > self.max_bytes:
+                    os.replace(self.path, self.path.with_name(self.path.name + ".1"))
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    f.write(line)
+            except Exception as e:
+                print(f"[Metrics] Error writing {self.path}: {e}")
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+        body = self.server.registry.render_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class MetricsHttpServer:
+    """Prometheus scrape endpoint, bound to 127.0.0.1 only."""
+
+    def __init__(self, registry, port):
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", int(port)), _MetricsHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.registry = registry
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="metrics-http", daemon=True)
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/metrics"
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
@@ -18,17 +18,91 @@ DEFAULT_OVERLAY_MAX_HEIGHT = 300
 DEFAULT_OVERLAY_SHORT_TEXT_MIN_HEIGHT = 50
 DEFAULT_OVERLAY_SHORT_TEXT_MAX_HEIGHT = 70
 
+DEFAULT_TEXT_LAYOUT_CACHE_SIZE = 256
+DEFAULT_OVERLAY_FRAME_MS = 16
+
 DEFAULT_OVERLAY_POSITION = "top_center"
 DEFAULT_TARGET_LANGUAGE = "en"
 
 DEFAULT_RECOGNIZER_ENGINE = "speech_recognition"
+DEFAULT_VOSK_MODEL_PATH = ""
+# How Google recognition audio is encoded: "auto" (FLAC via soundfile, else
+# 16-bit PCM), "flac", "l16", or "speech_recognition" (its own flac subprocess).
+DEFAULT_RECOGNIZER_AUDIO_CODEC = "auto"
+RECOGNIZER_AUDIO_CODECS = ("auto", "flac", "l16", "speech_recognition")
+DEFAULT_RECOGNIZER_SAMPLE_RATE = 16000
 
 DEFAULT_TRANSLATOR_ENGINE = "libretranslate_local"
 DEFAULT_LIBRETRANSLATE_URL = "http://localhost:5000/translate"
+DEFAULT_LIBRETRANSLATE_CONNECT_TIMEOUT = 2.0
+DEFAULT_LIBRETRANSLATE_READ_TIMEOUT = 10.0
+
+DEFAULT_LIBRETRANSLATE_ROUTING = "ewma"
+LIBRETRANSLATE_ROUTING_POLICIES = ("ewma", "least_outstanding")
+DEFAULT_LIBRETRANSLATE_HEDGE = False
+DEFAULT_HEDGE_MIN_DELAY = 0.05
+DEFAULT_HEDGE_INITIAL_DELAY = 1.0
+HEDGE_MIN_SAMPLES = 20
+ENDPOINT_EWMA_ALPHA = 0.3
+ENDPOINT_LATENCY_WINDOW = 200
+
+DEFAULT_HEALTH_CHECK_INTERVAL = 15.0
+DEFAULT_HEALTH_CHECK_UNHEALTHY_INTERVAL = 3.0
+DEFAULT_HEALTH_CHECK_TIMEOUT = 2.0
+DEFAULT_CIRCUIT_BREAKER_FAILURES = 3
+DEFAULT_CIRCUIT_BREAKER_RESET = 15.0
+HEALTH_WARM_UP_TEXT = "Hello"
+
+DEFAULT_CONFIG_SAVE_DEBOUNCE = 0.5
+
+DEFAULT_TRANSLATOR_MAX_WORKERS = 4
+
+DEFAULT_TRANSLATION_CACHE_ENABLED = True
+DEFAULT_TRANSLATION_CACHE_MEMORY_BYTES = 4 * 1024 * 1024
+DEFAULT_TRANSLATION_CACHE_DISK_BYTES = 64 * 1024 * 1024
+
+DEFAULT_MICROPHONE_DEVICE_INDEX = None
+DEFAULT_WARM_MICROPHONE = False
+DEFAULT_RING_BUFFER_SECONDS = 10.0
+DEFAULT_PREROLL_MS = 500
+DEFAULT_NOISE_CALIBRATION_MAX_AGE = 600.0
+DEFAULT_NOISE_CALIBRATION_DRIFT_RATIO = 1.5
+DEFAULT_NOISE_CALIBRATION_DURATION = 1.0
+# Keeps digital silence (a muted input) from calibrating the threshold down to 0.
+NOISE_CALIBRATION_MIN_THRESHOLD = 50.0
+
+DEFAULT_FAST_START = False
+
+DEFAULT_TRACE_HISTORY_SIZE = 200
+
+DEFAULT_PROFILER_INTERVAL_MS = 5
+
+DEFAULT_PIPELINE_QUEUE_SIZE = 2
+DEFAULT_PIPELINE_MAX_PENDING_PRESSES = 1
+SPEECH_PROMPT_REFRESH = 4.5
+
+DEFAULT_CAPTION_MAX_SEGMENT_SECONDS = 8.0
+DEFAULT_CAPTION_QUEUE_SIZE = 3
+
+DEFAULT_SEGMENT_TRANSLATION = True
+DEFAULT_SEGMENT_MIN_CHARS = 120
+DEFAULT_SEGMENT_MAX_CHARS = 200
+
+DEFAULT_METRICS_JSONL_ENABLED = False
+DEFAULT_METRICS_JSONL_MAX_BYTES = 10 * 1024 * 1024
+DEFAULT_METRICS_HTTP_ENABLED = False
+DEFAULT_METRICS_HTTP_PORT = 9464
 
 DEFAULT_INITIAL_SILENCE_TIMEOUT = 4.0
 DEFAULT_SILENCE_TIMEOUT = 0.20
 
+DEFAULT_VAD_FRAME_MS = 30
+DEFAULT_VAD_START_MS = 90
+DEFAULT_VAD_HANGOVER = 0.8
+DEFAULT_VAD_ZCR_MAX = 0.35
+DEFAULT_VAD_PRE_SPEECH_MS = 300
+DEFAULT_VAD_USE_WEBRTCVAD = False
+
 OVERLAY_POSITIONS = {
     "top_left": "Top Left",
     "top_center": "Top Center",
@@ -62,8 +136,15 @@ SOURCE_LANGUAGES = {
     "pt-PT": "Portuguese",
 }
 
+RECOGNIZER_ENGINES = {
+    "speech_recognition": "Google (Online)",
+    "vosk": "Vosk (Offline)",
+}
+
+# Engines offered in the settings window. The in-process fake engine
+# (translators.FakeTranslatorEngine) is for tests and benchmarks only.
 TRANSLATOR_ENGINES = {
-    "libretranslate_local": "LibreTranslate (Local)"
+    "libretranslate_local": "LibreTranslate (Local)",
 }
 
 DEFAULT_CONFIG_STRUCT = {
@@ -72,8 +153,18 @@ DEFAULT_CONFIG_STRUCT = {
     "overlay_position": DEFAULT_OVERLAY_POSITION,
     "target_language": DEFAULT_TARGET_LANGUAGE,
     "recognizer_engine": DEFAULT_RECOGNIZER_ENGINE,
+    "vosk_model_path": DEFAULT_VOSK_MODEL_PATH,
+    "recognizer_audio_codec": DEFAULT_RECOGNIZER_AUDIO_CODEC,
     "translator_engine": DEFAULT_TRANSLATOR_ENGINE,
     "libretranslate_url": DEFAULT_LIBRETRANSLATE_URL,
+    "libretranslate_connect_timeout": DEFAULT_LIBRETRANSLATE_CONNECT_TIMEOUT,
+    "libretranslate_read_timeout": DEFAULT_LIBRETRANSLATE_READ_TIMEOUT,
+    "libretranslate_routing": DEFAULT_LIBRETRANSLATE_ROUTING,
+    "libretranslate_hedge": DEFAULT_LIBRETRANSLATE_HEDGE,
+    "health_check_interval": DEFAULT_HEALTH_CHECK_INTERVAL,
+    "translation_cache_enabled": DEFAULT_TRANSLATION_CACHE_ENABLED,
+    "translation_cache_memory_bytes": DEFAULT_TRANSLATION_CACHE_MEMORY_BYTES,
+    "translation_cache_disk_bytes": DEFAULT_TRANSLATION_CACHE_DISK_BYTES,
     "source_language": DEFAULT_SOURCE_LANGUAGE,
 
     "font_size": DEFAULT_FONT_SIZE,
@@ -90,4 +181,37 @@ DEFAULT_CONFIG_STRUCT = {
     "phrase_time_limit": DEFAULT_PHRASE_TIME_LIMIT,
     "initial_silence_timeout": DEFAULT_INITIAL_SILENCE_TIMEOUT,
     "silence_timeout": DEFAULT_SILENCE_TIMEOUT,
+    "vad_frame_ms": DEFAULT_VAD_FRAME_MS,
+    "vad_start_ms": DEFAULT_VAD_START_MS,
+    "vad_hangover": DEFAULT_VAD_HANGOVER,
+    "vad_zcr_max": DEFAULT_VAD_ZCR_MAX,
+    "vad_pre_speech_ms": DEFAULT_VAD_PRE_SPEECH_MS,
+    "vad_use_webrtcvad": DEFAULT_VAD_USE_WEBRTCVAD,
+    "microphone_device_index": DEFAULT_MICROPHONE_DEVICE_INDEX,
+    "warm_microphone": DEFAULT_WARM_MICROPHONE,
+    "ring_buffer_seconds": DEFAULT_RING_BUFFER_SECONDS,
+    "preroll_ms": DEFAULT_PREROLL_MS,
+    "noise_calibration_max_age": DEFAULT_NOISE_CALIBRATION_MAX_AGE,
+    "noise_calibration_drift_ratio": DEFAULT_NOISE_CALIBRATION_DRIFT_RATIO,
+    "fast_start": DEFAULT_FAST_START,
+    "metrics_jsonl_enabled": DEFAULT_METRICS_JSONL_ENABLED,
+    "metrics_jsonl_max_bytes": DEFAULT_METRICS_JSONL_MAX_BYTES,
+    "metrics_http_enabled": DEFAULT_METRICS_HTTP_ENABLED,
+    "metrics_http_port": DEFAULT_METRICS_HTTP_PORT,
+    "caption_max_segment_seconds": DEFAULT_CAPTION_MAX_SEGMENT_SECONDS,
+    "caption_queue_size": DEFAULT_CAPTION_QUEUE_SIZE,
+    "segment_translation": DEFAULT_SEGMENT_TRANSLATION,
+    "segment_min_chars": DEFAULT_SEGMENT_MIN_CHARS,
+    "segment_max_chars": DEFAULT_SEGMENT_MAX_CHARS,
+}
+
+# Settings read when present but not written to settings.json by default
+# (expert/testing knobs); validated like DEFAULT_CONFIG_STRUCT keys.
+OPTIONAL_CONFIG_KEYS = {
+    "vosk_model_paths": {},
+    "google_speech_endpoint": "",
+    "fake_translator_latency": 0.0,
+    "config_save_debounce": DEFAULT_CONFIG_SAVE_DEBOUNCE,
+    "pipeline_queue_size": DEFAULT_PIPELINE_QUEUE_SIZE,
+    "pipeline_max_pending_presses": DEFAULT_PIPELINE_MAX_PENDING_PRESSES,
 }
\ No newline at end of file
@@ -0,0 +1,213 @@
+import json
+import os
+import threading
+import time
+
+import speech_recognition as sr
+
+from modules import (
+    DEFAULT_NOISE_CALIBRATION_MAX_AGE,
+    DEFAULT_NOISE_CALIBRATION_DRIFT_RATIO,
+    DEFAULT_NOISE_CALIBRATION_DURATION,
+    NOISE_CALIBRATION_MIN_THRESHOLD,
+)
+
+
+def device_key(device_index):
+    return "default" if device_index is None else str(device_index)
+
+
+class NoiseCalibrator:
+    """
+    Keeps one persisted noise floor (mean frame RMS, as the VAD measures it)
+    and the energy threshold derived from it per input device, so the hotkey
+    path does not have to calibrate every time. A background thread refreshes
+    entries that are too old or whose noise floor has drifted.
+    """
+
+    def __init__(self, path=None, max_age=DEFAULT_NOISE_CALIBRATION_MAX_AGE,
+                 drift_ratio=DEFAULT_NOISE_CALIBRATION_DRIFT_RATIO,
+                 duration=DEFAULT_NOISE_CALIBRATION_DURATION,
+                 is_busy_func=None, source_factory=None):
+        self.path = path
+        self.max_age = float(max_age)
+        self.drift_ratio = float(drift_ratio)
+        self.duration = float(duration)
+        self.is_busy_func = is_busy_func or (lambda: False)
+        self.source_factory = source_factory or (lambda device_index: sr.Microphone(device_index=device_index))
+        self._entries = {}
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._load()
+
+    def _load(self):
+        if not self.path or not self.path.exists():
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                self._entries = {k: v for k, v in data.items() if isinstance(v, dict) and "energy_threshold" in v}
+        except Exception as e:
+            print(f"[Calibration] Error loading {self.path}: {e}")
+
+    def _save(self):
+        if not self.path:
+            return
+        # Temp file + atomic rename, as in ConfigStore: a crash never leaves a truncated file.
+        with self._save_lock:
+            with self._lock:
+                data = dict(self._entries)
+            tmp_path = self.path.with_name(self.path.name + ".tmp")
+            try:
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, indent=2)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, self.path)
+            except Exception as e:
+                print(f"[Calibration] Error saving {self.path}: {e}")
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+
+    def _store(self, key, threshold, noise_floor):
+        with self._lock:
+            self._entries[key] = {
+                "energy_threshold": float(threshold),
+                "noise_floor": float(noise_floor),
+                "calibrated_at": time.time(),
+            }
+            self._pending.discard(key)
+        self._save()
+
+    def apply(self, recognizer, device_index=None):
+        """Sets recognizer.energy_threshold from the stored value. Returns False if the device was never calibrated."""
+        key = device_key(device_index)
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            return False
+        recognizer.energy_threshold = entry["energy_threshold"]
+        if time.time() - entry["calibrated_at"] > self.max_age:
+            self.request_recalibration(device_index)
+        return True
+
+    def calibrate(self, recognizer, source, device_index=None, duration=None, interrupted=None):
+        """
+        Blocking calibration on an already opened source: measures the noise
+        floor over `duration` seconds and sets recognizer.energy_threshold to
+        noise_floor * dynamic_energy_ratio (the level adjust_for_ambient_noise
+        converges to, without its damping from the previous threshold).
+        interrupted() is polled between reads and once more at the end; if it
+        returns True the sample is discarded, nothing is stored and None is returned.
+        """
+        from vad import measure_noise_floor
+        duration = duration or self.duration
+        needed = int(source.SAMPLE_RATE * duration) * source.SAMPLE_WIDTH
+        audio = bytearray()
+        while len(audio) < needed:
+            if interrupted is not None and interrupted():
+                return None
+            chunk = source.stream.read(source.CHUNK)
+            if not chunk:
+                break
+            audio += chunk
+        if interrupted is not None and interrupted():
+            return None
+        noise_floor = measure_noise_floor(bytes(audio), source.SAMPLE_RATE, source.SAMPLE_WIDTH)
+        if noise_floor is None:
+            print(f"[Calibration] No audio from '{device_key(device_index)}', keeping threshold {recognizer.energy_threshold:.0f}")
+            return recognizer.energy_threshold
+        recognizer.energy_threshold = max(NOISE_CALIBRATION_MIN_THRESHOLD, noise_floor * recognizer.dynamic_energy_ratio)
+        self._store(device_key(device_index), recognizer.energy_threshold, noise_floor)
+        return recognizer.energy_threshold
+
+    def observe(self, noise_floor, device_index=None):
+        """
+        Called after an utterance with the VAD's noise floor (VoiceActivityDetector.noise_floor).
+        Schedules a background recalibration if it drifted too far from the stored one.
+        """
+        key = device_key(device_index)
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            return
+        stored = entry.get("noise_floor")
+        if not stored or stored <= 0:
+            # Entry from an older version (threshold only): measure the floor once.
+            if key not in self._pending:
+                self.request_recalibration(device_index)
+            return
+        ratio = noise_floor / stored
+        if ratio > self.drift_ratio or ratio < 1.0 / self.drift_ratio:
+            print(f"[Calibration] Noise floor drift on '{key}' ({stored:.0f} -> {noise_floor:.0f}), recalibrating.")
+            self.request_recalibration(device_index)
+
+    def request_recalibration(self, device_index=None):
+        with self._lock:
+            self._pending.add(device_key(device_index))
+        self._wake.set()
+
+    def status(self):
+        """[{device, energy_threshold, age_s, pending}] for display/tuning."""
+        now = time.time()
+        with self._lock:
+            return [
+                {
+                    "device": key,
+                    "energy_threshold": entry["energy_threshold"],
+                    "noise_floor": entry.get("noise_floor"),
+                    "age_s": now - entry["calibrated_at"],
+                    "pending": key in self._pending,
+                }
+                for key, entry in self._entries.items()
+            ]
+
+    def start(self, check_interval=30.0):
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, args=(check_interval,), daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def _run(self, check_interval):
+        while not self._stop.is_set():
+            self._wake.wait(check_interval)
+            self._wake.clear()
+            if self._stop.is_set():
+                break
+            now = time.time()
+            with self._lock:
+                due = set(self._pending)
+                due.update(k for k, e in self._entries.items() if now - e["calibrated_at"] > self.max_age)
+            for key in due:
+                if self.is_busy_func():
+                    # Retry on the next tick, never compete with an active utterance for the mic.
+                    break
+                device_index = None if key == "default" else int(key)
+                with self._lock:
+                    entry = self._entries.get(key)
+                try:
+                    background_recognizer = sr.Recognizer()
+                    if entry is not None:
+                        # Seeded from the stored value, which stays if the device yields no audio.
+                        background_recognizer.energy_threshold = entry["energy_threshold"]
+                    with self.source_factory(device_index) as source:
+                        # A hotkey press during the measurement means it may contain speech.
+                        threshold = self.calibrate(background_recognizer, source, device_index,
+                                                   interrupted=self.is_busy_func)
+                    if threshold is None:
+                        print(f"[Calibration] Background recalibration of '{key}' interrupted by a capture, retrying later.")
+                        break
+                    print(f"[Calibration] Background recalibration of '{key}': {threshold:.0f}")
+                except Exception as e:
+                    print(f"[Calibration] Background recalibration of '{key}' failed: {e}")
@@ -1,6 +1,7 @@
 from PyQt6 import QtWidgets, QtCore, QtGui
 import sys
 import time 
+from collections import OrderedDict
 
 try:
     import win32api
@@ -11,12 +12,76 @@ except ImportError:
     print("WARNING: pywin32 modules are not installed. 'Click-through' feature will not work.")
     print("To install: pip install pywin32")
 
-from modules import OVERLAY_POSITIONS
+from modules import OVERLAY_POSITIONS, DEFAULT_TEXT_LAYOUT_CACHE_SIZE, DEFAULT_OVERLAY_FRAME_MS
+
+STYLE_CONFIG_KEYS = frozenset(("font_size", "text_color", "background_color", "padding"))
+LAYOUT_CONFIG_KEYS = frozenset((
+    "overlay_min_width", "overlay_max_width", "overlay_min_height", "overlay_max_height",
+    "overlay_short_text_min_height", "overlay_short_text_max_height",
+))
+
+PRIORITY_STATUS = 0
+PRIORITY_FINAL = 1
+PRIORITY_ERROR = 2
+
+
+class TextLayoutCache:
+    """
+    LRU cache of overlay sizes for a text. Measuring goes through one reusable
+    QFontMetrics (rebuilt only when the font size changes) instead of a
+    throwaway QLabel per call.
+    """
+
+    def __init__(self, max_entries=DEFAULT_TEXT_LAYOUT_CACHE_SIZE, font_family="Arial"):
+        self.max_entries = max_entries
+        self.font_family = font_family
+        self._entries = OrderedDict()
+        self._metrics = None
+        self._metrics_font_size = None
+        self.hits = 0
+        self.misses = 0
+
+    def _get_metrics(self, font_size):
+        if self._metrics is None or self._metrics_font_size != font_size:
+            self._metrics = QtGui.QFontMetrics(QtGui.QFont(self.font_family, font_size))
+            self._metrics_font_size = font_size
+        return self._metrics
+
+    def measure(self, text, font_size, padding, min_width, max_width, min_height):
+        key = (text, font_size, padding, min_width, max_width, min_height)
+        size = self._entries.get(key)
+        if size is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return size
+        self.misses += 1
+
+        metrics = self._get_metrics(font_size)
+        text_rect = metrics.boundingRect(QtCore.QRect(0, 0, max_width - (2 * padding), 0),
+                                         QtCore.Qt.TextFlag.TextWordWrap, text)
+        required_width = text_rect.width() + (2 * padding)
+        width = max(min_width, min(max_width, required_width))
+        wrapped_rect = metrics.boundingRect(QtCore.QRect(0, 0, width - (2 * padding), 0),
+                                            QtCore.Qt.TextFlag.TextWordWrap, text)
+        height = max(min_height, wrapped_rect.height() + padding + 1)
+
+        size = (width, height)
+        self._entries[key] = size
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return size
+
+    def clear(self):
+        self._entries.clear()
 
 
 class OverlayWindow(QtWidgets.QWidget):
-    show_text_signal = QtCore.pyqtSignal(str, bool, bool)
+    post_text_signal = QtCore.pyqtSignal(str, bool, bool, int)
+    clear_signal = QtCore.pyqtSignal()
+    apply_config_signal = QtCore.pyqtSignal(object, object)
     copy_to_clipboard_signal = QtCore.pyqtSignal(str)
+    # Emitted after a posted text is actually on screen: (text, priority).
+    text_rendered = QtCore.pyqtSignal(str, int)
 
     def __init__(self, initial_width, initial_height, initial_position_key,
                  font_size, text_color, background_color, padding,
@@ -51,26 +116,36 @@ class OverlayWindow(QtWidgets.QWidget):
         self.resize(self.current_width, self.current_height)
 
         self.position_key = initial_position_key
+        self.layout_cache = TextLayoutCache()
 
         self.label = QtWidgets.QLabel("", self)
-        self.label.setStyleSheet(
-            f"color: {self.TEXT_COLOR}; "
-            f"font-size: {self.FONT_SIZE}px; "
-            f"background-color: {self.BACKGROUND_COLOR};"
-            f"padding: {self.PADDING}px;"
-            "border-radius: 10px;"
-        )
+        self._apply_label_style()
         self.label.setAlignment(QtCore.Qt.AlignmentFlag.AlignLeft | QtCore.Qt.AlignmentFlag.AlignTop)
         self.label.setWordWrap(True)
         self.label.setGeometry(0, 0, self.width(), self.height())
 
         self.hide()
-        self.show_text_signal.connect(self.show_text)
+        self.hide_timer = QtCore.QTimer(self)
+        self.hide_timer.setSingleShot(True)
+        self.hide_timer.timeout.connect(self.hide_overlay_and_clear_text)
+
+        # Posted texts are coalesced: only the latest (highest priority) one per frame is rendered.
+        self._pending_text = None
+        self._shown_priority = PRIORITY_STATUS
+        self.render_timer = QtCore.QTimer(self)
+        self.render_timer.setSingleShot(True)
+        self.render_timer.setInterval(DEFAULT_OVERLAY_FRAME_MS)
+        self.render_timer.timeout.connect(self._render_pending_text)
+        self.rendered_count = 0
+        self.coalesced_count = 0
+
+        self.post_text_signal.connect(self.queue_text)
+        self.clear_signal.connect(self.hide_overlay_and_clear_text)
+        self.apply_config_signal.connect(self.apply_config_snapshot)
+        self.config_version = None
         self.copy_to_clipboard_signal.connect(self._copy_text_to_clipboard)
         self.reposition_overlay(self.position_key)
 
-        self.hide_timer = None 
-
     def resizeEvent(self, event):
         self.label.setGeometry(0, 0, self.width(), self.height())
         super().resizeEvent(event)
@@ -100,11 +175,6 @@ class OverlayWindow(QtWidgets.QWidget):
 
         if is_test_display:
             self.show_text("Test overlay position", is_test_display=True, is_short_message=True)
-            if self.hide_timer is not None:
-                self.hide_timer.stop()
-            self.hide_timer = QtCore.QTimer(self)
-            self.hide_timer.setSingleShot(True)
-            self.hide_timer.timeout.connect(self.hide_overlay_and_clear_text)
             self.hide_timer.start(3 * 1000)
 
     def show_text(self, text, is_test_display=False, is_short_message=False):
@@ -114,23 +184,10 @@ class OverlayWindow(QtWidgets.QWidget):
 
         self.label.setText(text)
 
-        temp_label = QtWidgets.QLabel(text)
-        temp_label.setWordWrap(True)
-        temp_label.setFont(QtGui.QFont("Arial", self.FONT_SIZE))
-
-        metrics = QtGui.QFontMetrics(temp_label.font())
-        text_rect = metrics.boundingRect(QtCore.QRect(0, 0, self.OVERLAY_MAX_WIDTH - (2 * self.PADDING), 0),
-                                         QtCore.Qt.TextFlag.TextWordWrap, text)
-
-        required_width = text_rect.width() + (2 * self.PADDING)
-        new_width = max(self.OVERLAY_MIN_WIDTH, min(self.OVERLAY_MAX_WIDTH, required_width))
-
-        temp_label.setFixedWidth(new_width - (2 * self.PADDING))
-        temp_label.adjustSize()
-        required_height = temp_label.height()
-
-        new_height = required_height + self.PADDING + 1
-        new_height = max(self.OVERLAY_MIN_HEIGHT, new_height)
+        new_width, new_height = self.layout_cache.measure(
+            text, self.FONT_SIZE, self.PADDING,
+            self.OVERLAY_MIN_WIDTH, self.OVERLAY_MAX_WIDTH, self.OVERLAY_MIN_HEIGHT
+        )
 
         if new_width != self.current_width or new_height != self.current_height:
             self.current_width = new_width
@@ -140,21 +197,56 @@ class OverlayWindow(QtWidgets.QWidget):
             self.reposition_overlay(self.position_key)
         self.show()
         self.make_click_through()
-        if self.hide_timer is not None:
-            self.hide_timer.stop()
-            self.hide_timer = None
+        self.hide_timer.stop()
         if not is_test_display:
-            self.hide_timer = QtCore.QTimer(self)
-            self.hide_timer.setSingleShot(True)
-            self.hide_timer.timeout.connect(self.hide_overlay_and_clear_text)
             self.hide_timer.start(self.OVERLAY_DISPLAY_TIME * 1000)
 
+    @QtCore.pyqtSlot(str, bool, bool, int)
+    def queue_text(self, text, is_test_display=False, is_short_message=False, priority=PRIORITY_STATUS):
+        pending = self._pending_text
+        if pending is not None:
+            self.coalesced_count += 1
+            if priority == PRIORITY_STATUS and pending[3] > PRIORITY_STATUS:
+                return
+        self._pending_text = (text, is_test_display, is_short_message, priority)
+        if not self.render_timer.isActive():
+            self.render_timer.start()
+
+    def _render_pending_text(self):
+        pending = self._pending_text
+        self._pending_text = None
+        if pending is None:
+            return
+        text, is_test_display, is_short_message, priority = pending
+        # A transient status never replaces a final result or error still on screen;
+        # a newer result or error always replaces whatever is shown.
+        if priority == PRIORITY_STATUS and self._shown_priority > PRIORITY_STATUS and self.isVisible():
+            self.coalesced_count += 1
+            return
+        self._shown_priority = priority
+        self.rendered_count += 1
+        self.show_text(text, is_test_display, is_short_message)
+        self.text_rendered.emit(text, priority)
+
+    def post_status(self, text):
+        """Thread-safe: transient status ('Speak now...'), may be coalesced away."""
+        self.post_text_signal.emit(text, False, False, PRIORITY_STATUS)
+
+    def post_final(self, text):
+        """Thread-safe: final result of an utterance."""
+        self.post_text_signal.emit(text, False, False, PRIORITY_FINAL)
+
+    def post_error(self, text):
+        """Thread-safe: error/notice message; a later final result still replaces it."""
+        self.post_text_signal.emit(text, False, True, PRIORITY_ERROR)
+
     def hide_overlay_and_clear_text(self):
         self.hide()
         self.label.setText("")
-        if self.hide_timer is not None:
-            self.hide_timer.stop()
-            self.hide_timer = None
+        self.hide_timer.stop()
+        self._pending_text = None
+        self.render_timer.stop()
+        self._shown_priority = PRIORITY_STATUS
 
     def make_click_through(self):
         if HAS_WIN32:
@@ -175,19 +267,7 @@ class OverlayWindow(QtWidgets.QWidget):
         if clipboard:
             clipboard.setText(text_to_copy)
 
-    def update_settings_from_config(self, new_config):
-        self.FONT_SIZE = new_config["font_size"]
-        self.TEXT_COLOR = new_config["text_color"]
-        self.BACKGROUND_COLOR = new_config["background_color"]
-        self.PADDING = new_config["padding"]
-        self.OVERLAY_MIN_WIDTH = new_config["overlay_min_width"]
-        self.OVERLAY_MAX_WIDTH = new_config["overlay_max_width"]
-        self.OVERLAY_MIN_HEIGHT = new_config["overlay_min_height"]
-        self.OVERLAY_MAX_HEIGHT = new_config["overlay_max_height"]
-        self.OVERLAY_SHORT_TEXT_MIN_HEIGHT = new_config["overlay_short_text_min_height"]
-        self.OVERLAY_SHORT_TEXT_MAX_HEIGHT = new_config["overlay_short_text_max_height"]
-        self.OVERLAY_DISPLAY_TIME = new_config["overlay_display_time"]
-
+    def _apply_label_style(self):
         self.label.setStyleSheet(
             f"color: {self.TEXT_COLOR}; "
             f"font-size: {self.FONT_SIZE}px; "
@@ -198,11 +278,29 @@ class OverlayWindow(QtWidgets.QWidget):
             f"padding-bottom: {self.PADDING // 2 + 1}px;"
             "border-radius: 10px;"
         )
-        self.resize(self.current_width, self.current_height)
-        self.reposition_overlay(new_config["overlay_position"])
-        if self.isVisible() and self.hide_timer is not None:
-            self.hide_timer.stop()
-            self.hide_timer = QtCore.QTimer(self)
-            self.hide_timer.setSingleShot(True)
-            self.hide_timer.timeout.connect(self.hide_overlay_and_clear_text)
-            self.hide_timer.start(self.OVERLAY_DISPLAY_TIME * 1000)
\ No newline at end of file
+
+    @QtCore.pyqtSlot(object, object)
+    def apply_config_snapshot(self, snapshot, changed_keys):
+        """GUI-thread slot for config change notifications: only touches what the changed keys affect."""
+        if self.config_version is not None and snapshot.version <= self.config_version:
+            return
+        self.config_version = snapshot.version
+        if changed_keys & STYLE_CONFIG_KEYS:
+            self.FONT_SIZE = snapshot["font_size"]
+            self.TEXT_COLOR = snapshot["text_color"]
+            self.BACKGROUND_COLOR = snapshot["background_color"]
+            self.PADDING = snapshot["padding"]
+            self._apply_label_style()
+        if changed_keys & LAYOUT_CONFIG_KEYS:
+            self.OVERLAY_MIN_WIDTH = snapshot["overlay_min_width"]
+            self.OVERLAY_MAX_WIDTH = snapshot["overlay_max_width"]
+            self.OVERLAY_MIN_HEIGHT = snapshot["overlay_min_height"]
+            self.OVERLAY_MAX_HEIGHT = snapshot["overlay_max_height"]
+            self.OVERLAY_SHORT_TEXT_MIN_HEIGHT = snapshot["overlay_short_text_min_height"]
+            self.OVERLAY_SHORT_TEXT_MAX_HEIGHT = snapshot["overlay_short_text_max_height"]
+        if changed_keys & (STYLE_CONFIG_KEYS | LAYOUT_CONFIG_KEYS | {"overlay_position"}):
+            self.reposition_overlay(snapshot["overlay_position"])
+        if "overlay_display_time" in changed_keys:
+            self.OVERLAY_DISPLAY_TIME = snapshot["overlay_display_time"]
+            if self.isVisible() and self.hide_timer.isActive():
+                self.hide_timer.start(self.OVERLAY_DISPLAY_TIME * 1000)
\ No newline at end of file
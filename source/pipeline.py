@@ -0,0 +1,151 @@
+import queue
+import threading
+
+from modules import DEFAULT_PIPELINE_QUEUE_SIZE, DEFAULT_PIPELINE_MAX_PENDING_PRESSES
+
+STATE_IDLE = "idle"
+STATE_CALIBRATING = "calibrating"
+STATE_LISTENING = "listening"
+STATE_PROCESSING = "processing"
+
+# Allowed transitions of the capture (microphone) side of the pipeline.
+_CAPTURE_TRANSITIONS = {
+    STATE_IDLE: {STATE_CALIBRATING, STATE_LISTENING},
+    STATE_CALIBRATING: {STATE_LISTENING, STATE_IDLE},
+    STATE_LISTENING: {STATE_IDLE},
+}
+
+_STOP = object()
+
+
+class UtteranceJob:
+    """One utterance travelling through the pipeline stages."""
+
+    def __init__(self, trace, **fields):
+        self.trace = trace
+        self.audio = None
+        self.text = None
+        self.__dict__.update(fields)
+
+
+class Pipeline:
+    """
+    Long-lived stage workers connected by bounded queues, one thread per stage,
+    so capturing utterance N+1 overlaps recognizing N and translating N-1.
+
+    stages: [(name, func)]; func(job) returns the job for the next stage or
+    None when the job ends there (done, no speech, error).
+
+    Backpressure: submit() never blocks. It queues at most max_pending_presses
+    jobs in front of the capture stage and rejects (returns False) beyond that.
+    Between stages, a worker blocks on a full queue, which holds back the
+    stage before it, so at most queue_size jobs wait in front of any stage.
+    """
+
+    def __init__(self, stages, queue_size=DEFAULT_PIPELINE_QUEUE_SIZE,
+                 max_pending_presses=DEFAULT_PIPELINE_MAX_PENDING_PRESSES, on_state_changed=None):
+        self.stages = list(stages)
+        self.on_state_changed = on_state_changed
+        self.stop_event = threading.Event()
+        self._queues = [queue.Queue(maxsize=max_pending_presses)]
+        self._queues += [queue.Queue(maxsize=queue_size) for _ in self.stages[1:]]
+        self._lock = threading.Lock()
+        self._capture_state = STATE_IDLE
+        self.in_flight = 0
+        self.submitted = 0
+        self.rejected = 0
+        self.completed = 0
+        self._threads = [
+            threading.Thread(target=self._worker, args=(index,), name=f"pipeline-{name}", daemon=True)
+            for index, (name, _) in enumerate(self.stages)
+        ]
+
+    def start(self):
+        for thread in self._threads:
+            thread.start()
+        return self
+
+    @property
+    def state(self):
+        with self._lock:
+            if self._capture_state != STATE_IDLE:
+                return self._capture_state
+            return STATE_PROCESSING if self.in_flight else STATE_IDLE
+
+    @property
+    def is_capturing(self):
+        return self.state in (STATE_CALIBRATING, STATE_LISTENING)
+
+    def set_capture_state(self, new_state):
+        """Called by the capture stage as the microphone moves idle -> calibrating -> listening -> idle."""
+        with self._lock:
+            if new_state == self._capture_state:
+                return
+            if new_state not in _CAPTURE_TRANSITIONS.get(self._capture_state, ()):
+                raise ValueError(f"Invalid pipeline transition {self._capture_state} -> {new_state}")
+            self._capture_state = new_state
+        self._notify()
+
+    def _notify(self):
+        if self.on_state_changed is not None:
+            try:
+                self.on_state_changed(self.state)
+            except Exception as e:
+                print(f"[Pipeline] Error in state listener: {e}")
+
+    def submit(self, job):
+        """Queues a job for the first stage. Returns False if it was rejected (backpressure)."""
+        if self.stop_event.is_set():
+            return False
+        with self._lock:
+            try:
+                self._queues[0].put_nowait(job)
+            except queue.Full:
+                self.rejected += 1
+                return False
+            self.in_flight += 1
+            self.submitted += 1
+        self._notify()
+        return True
+
+    def queue_depths(self):
+        return {name: self._queues[i].qsize() for i, (name, _) in enumerate(self.stages)}
+
+    def _job_done(self):
+        with self._lock:
+            self.in_flight -= 1
+            self.completed += 1
+        self._notify()
+
+    def _worker(self, index):
+        name, func = self.stages[index]
+        inbox = self._queues[index]
+        outbox = self._queues[index + 1] if index + 1 < len(self.stages) else None
+        while True:
+            job = inbox.get()
+            if job is _STOP:
+                if outbox is not None:
+                    outbox.put(_STOP)
+                return
+            try:
+                result = func(job)
+            except Exception as e:
+                print(f"[Pipeline] Unhandled error in stage '{name}': {e}")
+                trace = getattr(job, "trace", None)
+                if trace is not None:
+                    trace.finish(f"{name}_error", e)
+                result = None
+            if result is None or outbox is None:
+                self._job_done()
+            else:
+                outbox.put(result)
+
+    def stop(self, timeout=2.0):
+        """Asks the capture stage to stop listening and lets every worker exit after its current job."""
+        self.stop_event.set()
+        try:
+            self._queues[0].put(_STOP, timeout=timeout)
+        except queue.Full:
+            pass
+        for thread in self._threads:
+            thread.join(timeout)
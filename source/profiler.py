@@ -0,0 +1,100 @@
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+from modules import DEFAULT_PROFILER_INTERVAL_MS
+
+
+def _frame_label(code):
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """
+    Pure-Python sampling profiler over every thread of the process (Qt GUI
+    thread, keyboard hook thread, transcription worker, ...) using
+    sys._current_frames(). Stacks are aggregated per thread name and written in
+    the collapsed-stack format ("thread;outer;...;inner count") that
+    speedscope, flamegraph.pl and most flame graph viewers open directly.
+    """
+
+    def __init__(self, interval_ms=DEFAULT_PROFILER_INTERVAL_MS, max_depth=128):
+        self.interval = interval_ms / 1000.0
+        self.max_depth = max_depth
+        self.samples = 0
+        self.started_at = None
+        self.stopped_at = None
+        self._stacks = Counter()
+        self._thread_names = {}
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.is_running:
+            return
+        self._stop.clear()
+        self._stacks.clear()
+        self.samples = 0
+        self.started_at = time.time()
+        self.stopped_at = None
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        self.stopped_at = time.time()
+
+    def _thread_name(self, ident):
+        name = self._thread_names.get(ident)
+        if name is None:
+            self._thread_names = {t.ident: t.name for t in threading.enumerate()}
+            name = self._thread_names.get(ident, f"thread-{ident}")
+        return name
+
+    def _sample(self, own_ident):
+        for ident, frame in sys._current_frames().items():
+            if ident == own_ident:
+                continue
+            stack = []
+            while frame is not None and len(stack) < self.max_depth:
+                stack.append(_frame_label(frame.f_code))
+                frame = frame.f_back
+            stack.append(self._thread_name(ident))
+            stack.reverse()
+            self._stacks[";".join(stack)] += 1
+        self.samples += 1
+
+    def _run(self):
+        own_ident = threading.get_ident()
+        next_sample = time.perf_counter()
+        while not self._stop.is_set():
+            self._sample(own_ident)
+            next_sample += self.interval
+            delay = next_sample - time.perf_counter()
+            if delay > 0:
+                self._stop.wait(delay)
+            else:
+                # Sampling fell behind (e.g. GIL held by a long C call); do not try to catch up.
+                next_sample = time.perf_counter()
+
+    def write_collapsed(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in self._stacks.most_common():
+                f.write(f"{stack} {count}\n")
+        return path
+
+    def save(self, directory):
+        """Writes profile-<start time>.collapsed.txt into directory and returns its path."""
+        directory.mkdir(parents=True, exist_ok=True)
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(self.started_at or time.time()))
+        return self.write_collapsed(directory / f"profile-{stamp}.collapsed.txt")
@@ -0,0 +1,186 @@
+import json
+import threading
+from pathlib import Path
+
+import speech_recognition as sr
+
+from modules import DEFAULT_RECOGNIZER_ENGINE, DEFAULT_RECOGNIZER_AUDIO_CODEC, DEFAULT_RECOGNIZER_SAMPLE_RATE
+
+try:
+    # speech_recognition >= 3.11: URL and response format of recognize_google, without its FLAC step.
+    from speech_recognition.recognizers.google import ENDPOINT as GOOGLE_ENDPOINT, create_request_builder, OutputParser
+    HAS_GOOGLE_REQUEST_BUILDER = True
+except ImportError:
+    HAS_GOOGLE_REQUEST_BUILDER = False
+
+# Codec that hands the AudioData to recognize_google unchanged (it spawns the flac binary).
+LEGACY_AUDIO_CODEC = "speech_recognition"
+
+
+class RecognizerEngine:
+    """Base class for speech-to-text backends. recognize() raises sr.UnknownValueError / sr.RequestError."""
+    name = None
+    short_name = None
+    requires_network = False
+
+    def __init__(self, recognizer, config):
+        self.recognizer = recognizer
+        self.config = config
+
+    def configure(self, config):
+        self.config = config
+
+    def warm_up(self):
+        pass
+
+    def recognize(self, audio_data, language, trace=None):
+        """trace (optional UtteranceTrace) receives engine-specific marks and upload statistics."""
+        raise NotImplementedError
+
+
+class GoogleRecognizerEngine(RecognizerEngine):
+    """
+    Google speech-api/v2. The audio is downsampled to 16 kHz and encoded in
+    process (FLAC via soundfile, else 16-bit PCM) and posted over a pooled
+    keep-alive session, instead of recognize_google's flac subprocess and a
+    new connection per utterance.
+    """
+    name = "speech_recognition"
+    short_name = "Google"
+    requires_network = True
+
+    def __init__(self, recognizer, config):
+        super().__init__(recognizer, config)
+        self._session = None
+        self._session_lock = threading.Lock()
+        self.uploads = 0
+        self.upload_bytes = 0
+        self.input_bytes = 0
+        self.encode_seconds = 0.0
+
+    def _get_session(self):
+        with self._session_lock:
+            if self._session is None:
+                import requests
+                self._session = requests.Session()
+            return self._session
+
+    def upload_stats(self):
+        """Totals since start: uploads, bytes sent vs. captured, encode time."""
+        return {
+            "uploads": self.uploads,
+            "upload_bytes": self.upload_bytes,
+            "input_bytes": self.input_bytes,
+            "encode_seconds": self.encode_seconds,
+        }
+
+    def recognize(self, audio_data, language, trace=None):
+        # google_speech_endpoint is only set to point the engine at a local stub (benchmarks).
+        endpoint = self.config.get("google_speech_endpoint")
+        codec = self.config.get("recognizer_audio_codec", DEFAULT_RECOGNIZER_AUDIO_CODEC)
+        if codec == LEGACY_AUDIO_CODEC or not HAS_GOOGLE_REQUEST_BUILDER:
+            if endpoint:
+                return self.recognizer.recognize_google(audio_data, language=language, endpoint=endpoint)
+            return self.recognizer.recognize_google(audio_data, language=language)
+
+        import requests
+        from audio_encoding import encode_for_upload
+        encoded = encode_for_upload(audio_data, codec, DEFAULT_RECOGNIZER_SAMPLE_RATE)
+        self.uploads += 1
+        self.upload_bytes += len(encoded)
+        self.input_bytes += encoded.input_bytes
+        self.encode_seconds += encoded.encode_seconds
+        if trace is not None:
+            trace.mark("encoded")
+            trace.upload_bytes = len(encoded)
+            trace.audio_codec = encoded.codec
+
+        url = create_request_builder(endpoint=endpoint or GOOGLE_ENDPOINT, language=language).build_url()
+        try:
+            response = self._get_session().post(url, data=encoded.data, headers={"Content-Type": encoded.content_type},
+                                                timeout=self.recognizer.operation_timeout)
+            response.raise_for_status()
+        except requests.HTTPError as e:
+            raise sr.RequestError(f"recognition request failed: {e.response.reason}")
+        except requests.RequestException as e:
+            raise sr.RequestError(f"recognition connection failed: {e}")
+        return OutputParser(show_all=False, with_confidence=False).parse(response.content.decode("utf-8"))
+
+
+class VoskRecognizerEngine(RecognizerEngine):
+    """
+    Offline CPU recognizer. The model is loaded lazily on first use (or warm_up)
+    and kept resident, so every hotkey press reuses the same warm instance.
+    """
+    name = "vosk"
+    short_name = "Vosk"
+    requires_network = False
+    SAMPLE_RATE = 16000
+
+    def __init__(self, recognizer, config):
+        super().__init__(recognizer, config)
+        self._model = None
+        self._model_path = None
+        self._lock = threading.Lock()
+
+    def _resolve_model_path(self, language):
+        model_paths = self.config.get("vosk_model_paths") or {}
+        path = model_paths.get(language) or model_paths.get(language.split("-")[0])
+        return path or self.config.get("vosk_model_path", "")
+
+    def _get_model(self, language):
+        path = self._resolve_model_path(language)
+        if not path or not Path(path).is_dir():
+            raise sr.RequestError(f"Vosk model not found: '{path}'. Set 'vosk_model_path' in settings.json.")
+        with self._lock:
+            if self._model is None or self._model_path != path:
+                try:
+                    import vosk
+                except ImportError:
+                    raise sr.RequestError("vosk is not installed. To install: pip install vosk")
+                vosk.SetLogLevel(-1)
+                print(f"[Recognizer] Loading Vosk model from {path}")
+                self._model = vosk.Model(str(path))
+                self._model_path = path
+            return self._model
+
+    def warm_up(self):
+        try:
+            self._get_model(self.config.get("source_language", ""))
+        except sr.RequestError as e:
+            print(f"[Recognizer] Vosk warm-up skipped: {e}")
+
+    def recognize(self, audio_data, language, trace=None):
+        import vosk
+        model = self._get_model(language)
+        kaldi = vosk.KaldiRecognizer(model, self.SAMPLE_RATE)
+        kaldi.AcceptWaveform(audio_data.get_raw_data(convert_rate=self.SAMPLE_RATE, convert_width=2))
+        text = json.loads(kaldi.FinalResult()).get("text", "")
+        if not text:
+            raise sr.UnknownValueError()
+        return text
+
+
+RECOGNIZER_ENGINE_CLASSES = {
+    GoogleRecognizerEngine.name: GoogleRecognizerEngine,
+    VoskRecognizerEngine.name: VoskRecognizerEngine,
+}
+
+_engine_instances = {}
+_engine_instances_lock = threading.Lock()
+
+
+def get_recognizer_engine(recognizer, config):
+    """Returns the warm engine instance selected by config['recognizer_engine']."""
+    name = config.get("recognizer_engine", DEFAULT_RECOGNIZER_ENGINE)
+    if name not in RECOGNIZER_ENGINE_CLASSES:
+        print(f"[Recognizer] Unknown recognizer engine '{name}', using '{DEFAULT_RECOGNIZER_ENGINE}'.")
+        name = DEFAULT_RECOGNIZER_ENGINE
+    with _engine_instances_lock:
+        engine = _engine_instances.get(name)
+        if engine is None:
+            engine = RECOGNIZER_ENGINE_CLASSES[name](recognizer, config)
+            _engine_instances[name] = engine
+        else:
+            engine.configure(config)
+    return engine
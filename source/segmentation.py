@@ -0,0 +1,58 @@
+import re
+
+from modules import DEFAULT_SEGMENT_MIN_CHARS, DEFAULT_SEGMENT_MAX_CHARS
+
+_SENTENCE_END = re.compile(r"(?<=[.!?…])\s+")
+_CLAUSE_END = re.compile(r"(?<=[,;:])\s+")
+# Pieces shorter than this ("Yes.", "OK, so") ride along with the next one instead of costing a request.
+_MIN_PIECE_CHARS = 25
+
+
+def _wrap_words(text, max_chars):
+    """Greedy word wrap; a single word longer than max_chars stays whole."""
+    pieces, current = [], ""
+    for word in text.split():
+        if current and len(current) + 1 + len(word) > max_chars:
+            pieces.append(current)
+            current = word
+        else:
+            current = f"{current} {word}" if current else word
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def _merge(pieces, max_chars, min_chars):
+    """Joins neighbouring pieces while the first is shorter than min_chars and the result fits."""
+    merged = []
+    for piece in pieces:
+        if merged and len(merged[-1]) < min_chars and len(merged[-1]) + 1 + len(piece) <= max_chars:
+            merged[-1] = f"{merged[-1]} {piece}"
+        else:
+            merged.append(piece)
+    return merged
+
+
+def _split_long(sentence, max_chars):
+    if len(sentence) <= max_chars:
+        return [sentence]
+    pieces = []
+    for clause in _merge(_CLAUSE_END.split(sentence), max_chars, max_chars):
+        pieces.extend(_wrap_words(clause, max_chars) if len(clause) > max_chars else [clause])
+    return pieces
+
+
+def split_segments(text, min_chars=DEFAULT_SEGMENT_MIN_CHARS, max_chars=DEFAULT_SEGMENT_MAX_CHARS):
+    """
+    Splits a transcription into translation segments: sentences, then clauses
+    of sentences longer than max_chars, then plain word wrap (recognizers
+    often return no punctuation at all). Text shorter than min_chars is
+    returned whole. " ".join(segments) gives back the normalized text.
+    """
+    text = " ".join(text.split())
+    if len(text) < min_chars:
+        return [text] if text else []
+    pieces = []
+    for sentence in _SENTENCE_END.split(text):
+        pieces.extend(_split_long(sentence, max_chars))
+    return _merge(pieces, max_chars, _MIN_PIECE_CHARS)
@@ -0,0 +1,30 @@
+import threading
+import time
+
+
+class StartupTimer:
+    """Collects named startup milestones (ms since the timer was created)."""
+
+    def __init__(self):
+        self.t0 = time.perf_counter()
+        self.marks = []
+        self._lock = threading.Lock()
+
+    def mark(self, name):
+        elapsed = (time.perf_counter() - self.t0) * 1000
+        with self._lock:
+            self.marks.append((name, elapsed, threading.current_thread().name))
+        return elapsed
+
+    def report(self):
+        with self._lock:
+            marks = sorted(self.marks, key=lambda m: m[1])
+        lines = ["[Startup] Timing report (ms since translator_main import):"]
+        previous = 0.0
+        for name, elapsed, thread_name in marks:
+            lines.append(f"[Startup] {elapsed:9.1f}  (+{elapsed - previous:7.1f})  {name}  [{thread_name}]")
+            previous = elapsed
+        return "\n".join(lines)
+
+
+STARTUP_TIMER = StartupTimer()
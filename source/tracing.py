@@ -0,0 +1,172 @@
+import itertools
+import threading
+import time
+from collections import deque
+
+from modules import DEFAULT_TRACE_HISTORY_SIZE
+
+# Marks recorded for one hotkey press, in pipeline order. In continuous
+# captioning a segment's trace starts at its speech onset, so "hotkey" is then
+# the moment speech was detected.
+MARKS = (
+    "hotkey",
+    "mic_open",
+    "calibrated",
+    "speech_start",
+    "speech_end",
+    "recognize_request",
+    "encoded",
+    "recognize_response",
+    "translate_request",
+    "first_text",
+    "translate_response",
+    "final_posted",
+    "overlay_shown",
+)
+
+# Reported stages: name -> (start mark, end mark).
+STAGES = {
+    "mic_open": ("hotkey", "mic_open"),
+    "calibrate": ("hotkey", "calibrated"),
+    "capture": ("calibrated", "speech_end"),
+    "speech": ("speech_start", "speech_end"),
+    "recognize": ("recognize_request", "recognize_response"),
+    "encode": ("recognize_request", "encoded"),
+    "upload": ("encoded", "recognize_response"),
+    "translate": ("translate_request", "translate_response"),
+    "render": ("final_posted", "overlay_shown"),
+    "end_to_end": ("hotkey", "overlay_shown"),
+    "speech_to_screen": ("speech_end", "overlay_shown"),
+    "speech_to_first_text": ("speech_end", "first_text"),
+}
+
+
+def percentile(values, pct):
+    """Linearly interpolated percentile (pct in 0..100) of a sequence; None if empty."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100.0
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+class UtteranceTrace:
+    """Monotonic timestamps of one utterance going through the pipeline."""
+    _ids = itertools.count(1)
+
+    def __init__(self, clock=time.monotonic, mode="hotkey"):
+        self.id = next(self._ids)
+        self.mode = mode
+        self.clock = clock
+        self.started_at = time.time()
+        self.marks = {"hotkey": clock()}
+        self.outcome = None
+        self.error = None
+        self.recognizer_engine = None
+        self.translator_engine = None
+        self.audio_bytes = 0
+        self.utterance_bytes = 0
+        # Recognizer payload after in-process encoding (Google engine only).
+        self.upload_bytes = 0
+        self.audio_codec = None
+        # Translation segments (sentences) the recognized text was split into.
+        self.segments = 0
+        self.superseded = False
+        self.finished = threading.Event()
+        self._done_callbacks = []
+        self._done = False
+        self._done_lock = threading.Lock()
+
+    def mark(self, name):
+        self.marks.setdefault(name, self.clock())
+        if name == "overlay_shown":
+            self._check_done()
+
+    def finish(self, outcome, error=None):
+        """outcome: "ok", "no_speech", "recognize_error", "translate_error", ..."""
+        if self.outcome is None:
+            self.outcome = outcome
+            self.error = error
+        self.finished.set()
+        self._check_done()
+
+    def mark_superseded(self):
+        """The final result was replaced on screen before it could render."""
+        self.superseded = True
+        self._check_done()
+
+    def add_done_callback(self, callback):
+        """callback(trace) runs once, in whichever thread completes the trace (see `complete`)."""
+        self._done_callbacks.append(callback)
+
+    def _check_done(self):
+        with self._done_lock:
+            if self._done or not self.complete:
+                return
+            self._done = True
+        for callback in self._done_callbacks:
+            try:
+                callback(self)
+            except Exception as e:
+                print(f"[Trace] Error in done callback: {e}")
+
+    @property
+    def complete(self):
+        """Finished and, for a successful utterance, the result is on screen (or was superseded)."""
+        return self.finished.is_set() and (self.outcome != "ok" or "overlay_shown" in self.marks or self.superseded)
+
+    def span(self, stage):
+        start, end = STAGES[stage]
+        if start in self.marks and end in self.marks:
+            return self.marks[end] - self.marks[start]
+        return None
+
+    def spans(self):
+        """{stage: seconds} for every stage both of whose marks were recorded."""
+        spans = {}
+        for stage in STAGES:
+            value = self.span(stage)
+            if value is not None:
+                spans[stage] = value
+        return spans
+
+
+class TraceRecorder:
+    """Bounded ring of the most recent utterance traces (in progress ones included)."""
+
+    def __init__(self, max_traces=DEFAULT_TRACE_HISTORY_SIZE):
+        self._traces = deque(maxlen=max_traces)
+        self._lock = threading.Lock()
+        self.recorded = 0
+
+    def record(self, trace):
+        with self._lock:
+            self._traces.append(trace)
+            self.recorded += 1
+        return trace
+
+    def recent(self, count=None):
+        """Newest first."""
+        with self._lock:
+            traces = list(self._traces)
+        traces.reverse()
+        return traces if count is None else traces[:count]
+
+    def clear(self):
+        with self._lock:
+            self._traces.clear()
+
+    def stage_percentiles(self, pcts=(50, 95, 99)):
+        """{stage: {"n": count, "p50": ms, ...}} over the traces currently in the ring."""
+        traces = self.recent()
+        result = {}
+        for stage in STAGES:
+            values = [t.span(stage) * 1000 for t in traces if t.span(stage) is not None]
+            if values:
+                row = {"n": len(values)}
+                for pct in pcts:
+                    row[f"p{pct}"] = percentile(values, pct)
+                result[stage] = row
+        return result
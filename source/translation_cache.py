@@ -0,0 +1,252 @@
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+
+from modules import (
+    DEFAULT_TRANSLATION_CACHE_MEMORY_BYTES,
+    DEFAULT_TRANSLATION_CACHE_DISK_BYTES,
+)
+
+
+def normalize_text(text):
+    """Whitespace/Unicode normalization used for cache keys (case is preserved)."""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def make_cache_key(text, source_lang, target_lang, server_url):
+    return "\x1f".join((normalize_text(text), source_lang, target_lang, server_url))
+
+
+def _entry_size(key, value):
+    return len(key.encode("utf-8")) + len(value.encode("utf-8"))
+
+
+# Disk hits only queue their last_used update; it is written with the next
+# insert, or once this many are pending.
+_TOUCH_BATCH_SIZE = 64
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class TranslationCache:
+    """
+    Two-tier translation cache: in-memory LRU in front of an SQLite file.
+    Both tiers are bounded by size in bytes. Concurrent lookups of the same
+    key are merged so only one request goes to the server (single-flight).
+    """
+
+    def __init__(self, db_path=None,
+                 memory_max_bytes=DEFAULT_TRANSLATION_CACHE_MEMORY_BYTES,
+                 disk_max_bytes=DEFAULT_TRANSLATION_CACHE_DISK_BYTES):
+        self.memory_max_bytes = int(memory_max_bytes)
+        self.disk_max_bytes = int(disk_max_bytes)
+        self._memory = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        self._inflight = {}
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+        self._db = None
+        self._db_lock = threading.Lock()
+        self._disk_bytes = 0
+        self._pending_touches = {}
+        if db_path is not None:
+            try:
+                self._db = sqlite3.connect(str(db_path), check_same_thread=False)
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS translations ("
+                    " key TEXT PRIMARY KEY,"
+                    " value TEXT NOT NULL,"
+                    " size INTEGER NOT NULL,"
+                    " last_used REAL NOT NULL)"
+                )
+                self._db.execute("CREATE INDEX IF NOT EXISTS idx_last_used ON translations(last_used)")
+                self._db.commit()
+                # Running total from here on; inserts and evictions keep it current.
+                self._disk_bytes = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM translations").fetchone()[0]
+            except sqlite3.Error as e:
+                print(f"[Cache] Cannot open disk cache {db_path}: {e}")
+                self._db = None
+
+    def _memory_get(self, key):
+        with self._lock:
+            value = self._memory.get(key)
+            if value is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+            return value
+
+    def _memory_put(self, key, value):
+        size = _entry_size(key, value)
+        if size > self.memory_max_bytes:
+            return
+        with self._lock:
+            old = self._memory.pop(key, None)
+            if old is not None:
+                self._memory_bytes -= _entry_size(key, old)
+            self._memory[key] = value
+            self._memory_bytes += size
+            while self._memory_bytes > self.memory_max_bytes and self._memory:
+                old_key, old_value = self._memory.popitem(last=False)
+                self._memory_bytes -= _entry_size(old_key, old_value)
+                self.evictions += 1
+
+    def _flush_touches(self):
+        # Called with _db_lock held; the caller commits.
+        if self._pending_touches:
+            self._db.executemany("UPDATE translations SET last_used = ? WHERE key = ?",
+                                 [(used, key) for key, used in self._pending_touches.items()])
+            self._pending_touches.clear()
+
+    def _disk_get(self, key):
+        if self._db is None:
+            return None
+        try:
+            with self._db_lock:
+                row = self._db.execute("SELECT value FROM translations WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    self._pending_touches[key] = time.time()
+                    if len(self._pending_touches) >= _TOUCH_BATCH_SIZE:
+                        self._flush_touches()
+                        self._db.commit()
+            return row[0] if row else None
+        except sqlite3.Error as e:
+            print(f"[Cache] Disk read error: {e}")
+            return None
+
+    def _disk_put(self, key, value):
+        if self._db is None:
+            return
+        size = _entry_size(key, value)
+        try:
+            with self._db_lock:
+                self._flush_touches()
+                old = self._db.execute("SELECT size FROM translations WHERE key = ?", (key,)).fetchone()
+                self._db.execute(
+                    "INSERT OR REPLACE INTO translations (key, value, size, last_used) VALUES (?, ?, ?, ?)",
+                    (key, value, size, time.time())
+                )
+                self._disk_bytes += size - (old[0] if old else 0)
+                if self._disk_bytes > self.disk_max_bytes:
+                    excess = self._disk_bytes - self.disk_max_bytes
+                    victims = []
+                    for victim_key, victim_size in self._db.execute(
+                            "SELECT key, size FROM translations ORDER BY last_used ASC"):
+                        if excess <= 0:
+                            break
+                        victims.append((victim_key,))
+                        excess -= victim_size
+                        self._disk_bytes -= victim_size
+                    self._db.executemany("DELETE FROM translations WHERE key = ?", victims)
+                    with self._lock:
+                        self.evictions += len(victims)
+                self._db.commit()
+        except sqlite3.Error as e:
+            print(f"[Cache] Disk write error: {e}")
+            with self._db_lock:
+                try:
+                    self._db.rollback()
+                    self._disk_bytes = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM translations").fetchone()[0]
+                except sqlite3.Error:
+                    pass
+
+    def get(self, key):
+        value = self._memory_get(key)
+        if value is not None:
+            return value
+        value = self._disk_get(key)
+        if value is not None:
+            with self._lock:
+                self.disk_hits += 1
+            self._memory_put(key, value)
+            return value
+        return None
+
+    def put(self, key, value):
+        self._memory_put(key, value)
+        self._disk_put(key, value)
+
+    def get_or_translate(self, key, translate_func):
+        """
+        Returns the cached translation for key, or calls translate_func() once
+        for all concurrent callers of the same key. None results (errors) are not
+        cached; an exception raised by translate_func reaches every waiting caller.
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        with self._lock:
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = _Flight()
+                self._inflight[key] = flight
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            # The previous leader may have stored the value between our miss and taking the lead.
+            flight.result = self.get(key)
+            if flight.result is not None:
+                return flight.result
+            with self._lock:
+                self.misses += 1
+            flight.result = translate_func()
+            if flight.result is not None:
+                self.put(key, flight.result)
+            return flight.result
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            flight.done.set()
+
+    def stats(self):
+        with self._lock:
+            memory_hits, disk_hits, misses = self.memory_hits, self.disk_hits, self.misses
+            coalesced, evictions = self.coalesced, self.evictions
+            memory_entries = len(self._memory)
+            memory_bytes = self._memory_bytes
+        lookups = memory_hits + disk_hits + misses
+        return {
+            "memory_hits": memory_hits,
+            "disk_hits": disk_hits,
+            "misses": misses,
+            "coalesced": coalesced,
+            "evictions": evictions,
+            "hit_rate": (memory_hits + disk_hits) / lookups if lookups else 0.0,
+            "memory_entries": memory_entries,
+            "memory_bytes": memory_bytes,
+        }
+
+    def close(self):
+        if self._db is not None:
+            with self._db_lock:
+                try:
+                    self._flush_touches()
+                    self._db.commit()
+                except sqlite3.Error as e:
+                    print(f"[Cache] Disk write error: {e}")
+                self._db.close()
+            self._db = None
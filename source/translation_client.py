@@ -0,0 +1,157 @@
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from modules import (
+    DEFAULT_LIBRETRANSLATE_URL,
+    DEFAULT_LIBRETRANSLATE_CONNECT_TIMEOUT,
+    DEFAULT_LIBRETRANSLATE_READ_TIMEOUT,
+)
+
+
+class RequestStats:
+    """Thread-safe timing counters for one client."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+        self.total_time = 0.0
+        self.min_time = None
+        self.max_time = 0.0
+        self.last_time = None
+        self.error_types = {}
+
+    def record(self, elapsed, ok=True, error_type=None):
+        with self._lock:
+            self.requests += 1
+            if not ok:
+                self.errors += 1
+                error_type = error_type or "unknown"
+                self.error_types[error_type] = self.error_types.get(error_type, 0) + 1
+            self.total_time += elapsed
+            self.last_time = elapsed
+            self.max_time = max(self.max_time, elapsed)
+            self.min_time = elapsed if self.min_time is None else min(self.min_time, elapsed)
+
+    def as_dict(self):
+        with self._lock:
+            avg = self.total_time / self.requests if self.requests else None
+            return {
+                "requests": self.requests,
+                "errors": self.errors,
+                "avg_ms": avg * 1000 if avg is not None else None,
+                "min_ms": self.min_time * 1000 if self.min_time is not None else None,
+                "max_ms": self.max_time * 1000,
+                "last_ms": self.last_time * 1000 if self.last_time is not None else None,
+                "error_types": dict(self.error_types),
+            }
+
+
+class LibreTranslateClient:
+    """
+    Long-lived LibreTranslate client. Owns a pooled keep-alive requests.Session,
+    so consecutive utterances reuse the same TCP connection.
+    """
+
+    def __init__(self, server_url=DEFAULT_LIBRETRANSLATE_URL,
+                 connect_timeout=DEFAULT_LIBRETRANSLATE_CONNECT_TIMEOUT,
+                 read_timeout=DEFAULT_LIBRETRANSLATE_READ_TIMEOUT,
+                 pool_size=4, breaker=None):
+        self.server_url = server_url
+        self.breaker = breaker
+        self.connect_timeout = float(connect_timeout)
+        self.read_timeout = float(read_timeout)
+        self.stats = RequestStats()
+
+        self.session = requests.Session()
+        self.session.headers.update({
+            "Content-Type": "application/json",
+            "Connection": "keep-alive",
+        })
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    @property
+    def timeout(self):
+        return (self.connect_timeout, self.read_timeout)
+
+    @property
+    def languages_url(self):
+        """http://host:5000/translate -> http://host:5000/languages"""
+        base = self.server_url.rstrip("/")
+        if base.endswith("/translate"):
+            base = base[:-len("/translate")]
+        return base + "/languages"
+
+    def languages(self, timeout=None):
+        """GET /languages over the pooled session; raises on any failure (used as the health check)."""
+        response = self.session.get(self.languages_url, timeout=timeout or self.timeout)
+        response.raise_for_status()
+        languages = response.json()
+        if not isinstance(languages, list):
+            raise ValueError(f"unexpected /languages response {languages!r}")
+        return languages
+
+    def _record_outcome(self, server_ok):
+        if self.breaker is not None:
+            if server_ok:
+                self.breaker.record_success()
+            else:
+                self.breaker.record_failure()
+
+    def translate(self, text, source_lang="pl", target_lang="en"):
+        """Returns the translated text, or None on error (same contract as before)."""
+        return self._post(text, source_lang, target_lang)
+
+    def translate_batch(self, texts, source_lang="pl", target_lang="en"):
+        """Sends all texts as one `q` array. Returns a list of translations, or None on error."""
+        if not texts:
+            return []
+        result = self._post(list(texts), source_lang, target_lang)
+        if result is None:
+            return None
+        if not isinstance(result, list) or len(result) != len(texts):
+            print(f"LibreTranslate API Error: unexpected batch response {result!r}")
+            return None
+        return result
+
+    def _post(self, q, source_lang, target_lang):
+        payload = {
+            "q": q,
+            "source": source_lang,
+            "target": target_lang
+        }
+        start = time.perf_counter()
+        try:
+            response = self.session.post(self.server_url, json=payload, timeout=self.timeout)
+            if response.status_code == 200:
+                result = response.json()
+                self.stats.record(time.perf_counter() - start)
+                self._record_outcome(True)
+                return result.get("translatedText", "")
+            self.stats.record(time.perf_counter() - start, ok=False, error_type=f"http_{response.status_code}")
+            # 4xx (e.g. unsupported language pair) means the server itself is up.
+            self._record_outcome(response.status_code < 500)
+            print(f"LibreTranslate API Error: {response.status_code} - {response.text}")
+            return None
+        except requests.RequestException as e:
+            self.stats.record(time.perf_counter() - start, ok=False, error_type=type(e).__name__)
+            self._record_outcome(False)
+            print(f"LibreTranslate Request Error: {e}")
+            return None
+        except Exception as e:
+            self.stats.record(time.perf_counter() - start, ok=False, error_type=type(e).__name__)
+            # The server answered (e.g. malformed JSON); do not leave a half-open trial hanging.
+            self._record_outcome(True)
+            print(f"LibreTranslate Unexpected Error: {e}")
+            return None
+
+    def close(self):
+        try:
+            self.session.close()
+        except Exception:
+            pass
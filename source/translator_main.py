@@ -1,14 +1,13 @@
+from startup_timing import STARTUP_TIMER
 import sys
 import os
 import json
 import threading
-import speech_recognition as sr
-import keyboard
+import collections
 from PyQt6 import QtWidgets, QtCore, QtGui
 from pathlib import Path
 from copy import deepcopy
 import time
-import requests
 
 
 from modules import (
@@ -18,9 +17,24 @@ from modules import (
     DEFAULT_HOTKEY, DEFAULT_COPY_HOTKEY, DEFAULT_OVERLAY_POSITION,
     DEFAULT_RECOGNIZER_ENGINE, DEFAULT_TRANSLATOR_ENGINE,
     DEFAULT_PHRASE_TIME_LIMIT,
-    DEFAULT_SOURCE_LANGUAGE, DEFAULT_LIBRETRANSLATE_URL,
+    DEFAULT_SOURCE_LANGUAGE, DEFAULT_TARGET_LANGUAGE,
     DEFAULT_INITIAL_SILENCE_TIMEOUT,
     DEFAULT_SILENCE_TIMEOUT,
+    DEFAULT_CONFIG_SAVE_DEBOUNCE,
+    DEFAULT_TRANSLATION_CACHE_MEMORY_BYTES,
+    DEFAULT_TRANSLATION_CACHE_DISK_BYTES,
+    DEFAULT_NOISE_CALIBRATION_MAX_AGE,
+    DEFAULT_NOISE_CALIBRATION_DRIFT_RATIO,
+    DEFAULT_RING_BUFFER_SECONDS, DEFAULT_PREROLL_MS,
+    DEFAULT_VAD_FRAME_MS, DEFAULT_VAD_START_MS, DEFAULT_VAD_HANGOVER,
+    DEFAULT_VAD_ZCR_MAX, DEFAULT_VAD_PRE_SPEECH_MS, DEFAULT_VAD_USE_WEBRTCVAD,
+    DEFAULT_FAST_START,
+    DEFAULT_METRICS_JSONL_MAX_BYTES, DEFAULT_METRICS_HTTP_PORT,
+    DEFAULT_PIPELINE_QUEUE_SIZE, DEFAULT_PIPELINE_MAX_PENDING_PRESSES,
+    SPEECH_PROMPT_REFRESH,
+    DEFAULT_CAPTION_MAX_SEGMENT_SECONDS, DEFAULT_CAPTION_QUEUE_SIZE,
+    DEFAULT_SEGMENT_TRANSLATION, DEFAULT_SEGMENT_MIN_CHARS, DEFAULT_SEGMENT_MAX_CHARS,
+    DEFAULT_HEALTH_CHECK_INTERVAL,
 )
 
 try:
@@ -32,10 +46,20 @@ except ImportError:
     print("WARNING: pywin32 modules are not installed. The 'click-through' feature will not work.")
     print("To install: pip install pywin32")
 
-
-from gui import SettingsWindow, HotkeyDialog
-from overlay import OverlayWindow
+# speech_recognition, numpy (vad), keyboard, requests, metrics (http.server) and
+# the settings window are imported on first use / by the background warm-up, not here.
+from overlay import OverlayWindow, PRIORITY_FINAL
 from trayapp import SystemTrayApp
+from config_store import ConfigStore, ConfigSnapshot
+from translation_cache import TranslationCache
+from translators import get_translator_engine, to_translator_language, target_language_list, LibreTranslateEngine
+from tracing import UtteranceTrace, TraceRecorder
+from pipeline import Pipeline, UtteranceJob, STATE_IDLE, STATE_CALIBRATING, STATE_LISTENING
+from captioning import ContinuousCaptioner
+from health import HealthMonitor, TranslatorUnavailable, BREAKER_CLOSED
+from segmentation import split_segments
+
+STARTUP_TIMER.mark("core modules imported")
 
 current_config = deepcopy(DEFAULT_CONFIG_STRUCT)
 active_hotkey = current_config["hotkey_translate"]
@@ -70,10 +94,11 @@ def get_config_dir():
 
 CONFIG_DIR = get_config_dir()
 CONFIG_FILE_PATH = CONFIG_DIR / "settings.json" if CONFIG_DIR else None
+config_store = None
 
 
 def load_config():
-    global current_config, active_hotkey, active_copy_hotkey
+    global current_config, active_hotkey, active_copy_hotkey, config_store
     if CONFIG_FILE_PATH and CONFIG_FILE_PATH.exists():
         try:
             with open(CONFIG_FILE_PATH, 'r', encoding='utf-8') as f:
@@ -102,215 +127,702 @@ def load_config():
     active_hotkey = current_config.get("hotkey_translate", DEFAULT_HOTKEY)
     active_copy_hotkey = current_config.get("hotkey_copy", DEFAULT_COPY_HOTKEY)
 
+    if config_store is None:
+        config_store = ConfigStore(CONFIG_FILE_PATH, current_config,
+                                   debounce=current_config.get("config_save_debounce", DEFAULT_CONFIG_SAVE_DEBOUNCE))
+    else:
+        config_store.data = current_config
+        config_store.publish()
+
 
 def save_config():
-    global current_config
-    if CONFIG_FILE_PATH:
+    """Schedules a debounced, atomic write of the current config."""
+    if config_store is not None:
+        config_store.request_save()
+    else:
+        print("[Config] WARNING: Cannot save configuration, config store is not initialized.")
+
+def get_config_snapshot():
+    """Immutable, versioned view of the config for worker threads."""
+    if config_store is not None:
+        return config_store.snapshot()
+    return ConfigSnapshot(0, dict(current_config))
+
+def apply_config_changes(changes, replace=False):
+    """Validate + apply a changeset atomically (one change event, one write). Returns the changed keys."""
+    return config_store.apply_changes(changes, replace=replace)
+
+def flush_config():
+    if config_store is not None:
+        config_store.flush()
+
+recognizer = None
+_recognizer_lock = threading.Lock()
+
+def get_recognizer():
+    global recognizer
+    with _recognizer_lock:
+        if recognizer is None:
+            import speech_recognition as sr
+            recognizer = sr.Recognizer()
+        return recognizer
+
+pipeline = None
+captioner = None
+trace_recorder = TraceRecorder()
+metrics = None
+_metrics_lock = threading.Lock()
+metrics_writer = None
+metrics_server = None
+
+translation_cache = None
+health_monitor = None
+noise_calibrator = None
+warm_microphone = None
+
+def get_translator():
+    return get_translator_engine(current_config, translation_cache)
+
+def rebuild_translation_client(server_url=None):
+    """(Re)create the pooled LibreTranslate client, e.g. after the URL changed in settings."""
+    engine = get_translator()
+    if isinstance(engine, LibreTranslateEngine):
+        engine.rebuild_client(server_url)
+    if health_monitor is not None:
+        health_monitor.request_warm_up()
+
+# Settings whose change makes the next utterance hit a cold language pair / server.
+WARM_UP_CONFIG_KEYS = {"source_language", "target_language", "translator_engine", "libretranslate_url"}
+
+def get_warm_up_pairs():
+    cfg = get_config_snapshot()
+    source_lang = to_translator_language(cfg.get("source_language", DEFAULT_SOURCE_LANGUAGE))
+    return [(source_lang, target) for target in target_language_list(cfg.get("target_language", DEFAULT_TARGET_LANGUAGE))
+            if target != source_lang]
+
+def init_health_monitor():
+    """Polls the translation server, warms up the configured pairs and drives the circuit breaker."""
+    global health_monitor
+    if health_monitor is None:
+        health_monitor = HealthMonitor(
+            get_translator, get_warm_up_pairs,
+            interval=current_config.get("health_check_interval", DEFAULT_HEALTH_CHECK_INTERVAL),
+        ).start()
+        config_store.subscribe(
+            lambda snapshot, changed_keys: health_monitor.request_warm_up() if WARM_UP_CONFIG_KEYS & set(changed_keys) else None
+        )
+    return health_monitor
+
+def init_translation_cache():
+    global translation_cache
+    if translation_cache is not None:
+        translation_cache.close()
+        translation_cache = None
+    if not current_config.get("translation_cache_enabled", True):
+        return None
+    db_path = CONFIG_DIR / "translation_cache.sqlite3" if CONFIG_DIR else None
+    translation_cache = TranslationCache(
+        db_path,
+        memory_max_bytes=current_config.get("translation_cache_memory_bytes", DEFAULT_TRANSLATION_CACHE_MEMORY_BYTES),
+        disk_max_bytes=current_config.get("translation_cache_disk_bytes", DEFAULT_TRANSLATION_CACHE_DISK_BYTES),
+    )
+    return translation_cache
+
+def init_warm_microphone():
+    global warm_microphone
+    if warm_microphone is not None:
+        warm_microphone.stop()
+        warm_microphone = None
+    if not current_config.get("warm_microphone", False):
+        return None
+    from audio_capture import WarmMicrophone
+    try:
+        warm_microphone = WarmMicrophone(
+            device_index=current_config.get("microphone_device_index"),
+            buffer_seconds=current_config.get("ring_buffer_seconds", DEFAULT_RING_BUFFER_SECONDS),
+        )
+        warm_microphone.start()
+    except Exception as e:
+        print(f"[Audio] Cannot start warm microphone, falling back to per-press capture: {e}")
+        warm_microphone = None
+    return warm_microphone
+
+def open_audio_source(device_index=None):
+    """Pre-roll source from the warm stream if it runs for this device, otherwise a fresh sr.Microphone."""
+    if warm_microphone is not None and warm_microphone.is_running and warm_microphone.device_index == device_index:
+        return warm_microphone.open_source(current_config.get("preroll_ms", DEFAULT_PREROLL_MS))
+    import speech_recognition as sr
+    return sr.Microphone(device_index=device_index)
+
+def init_noise_calibrator():
+    global noise_calibrator
+    from noise_calibration import NoiseCalibrator
+    if noise_calibrator is not None:
+        noise_calibrator.stop()
+    noise_calibrator = NoiseCalibrator(
+        CONFIG_DIR / "noise_calibration.json" if CONFIG_DIR else None,
+        max_age=current_config.get("noise_calibration_max_age", DEFAULT_NOISE_CALIBRATION_MAX_AGE),
+        drift_ratio=current_config.get("noise_calibration_drift_ratio", DEFAULT_NOISE_CALIBRATION_DRIFT_RATIO),
+        is_busy_func=is_capturing,
+        source_factory=open_audio_source,
+    )
+    noise_calibrator.start()
+    return noise_calibrator
+
+def get_noise_calibration_status():
+    return noise_calibrator.status() if noise_calibrator is not None else []
+
+def get_current_recognizer_engine():
+    from recognizers import get_recognizer_engine
+    return get_recognizer_engine(get_recognizer(), current_config)
+
+def warm_up_recognizer_engine(background=True):
+    def _warm_up():
         try:
-            with open(CONFIG_FILE_PATH, 'w', encoding='utf-8') as f:
-                json.dump(current_config, f, indent=2, ensure_ascii=False)
+            get_current_recognizer_engine().warm_up()
         except Exception as e:
-            print(f"[Config] Error saving config: {e}")
-    else:
-        print("[Config] WARNING: Cannot save configuration, file path is not available.")
+            print(f"[Recognizer] Warm-up error: {e}")
+    if not background:
+        _warm_up()
+        return
+    threading.Thread(target=_warm_up, daemon=True).start()
+
+def warm_up_in_background(on_done=None):
+    """
+    Loads everything the first hotkey press needs (speech_recognition, numpy/VAD,
+    recognizer engine, HTTP client, calibration, warm mic) after the tray is up.
+    A press before this finishes simply loads the missing parts itself.
+    """
+    def _run():
+        try:
+            get_recognizer()
+            STARTUP_TIMER.mark("speech_recognition loaded")
+            import vad
+            vad.warm_up()
+            STARTUP_TIMER.mark("VAD / numpy loaded")
+            warm_up_recognizer_engine(background=False)
+            STARTUP_TIMER.mark("recognizer engine warmed up")
+            rebuild_translation_client()
+            init_health_monitor()
+            STARTUP_TIMER.mark("translation client ready")
+            get_metrics()
+            init_noise_calibrator()
+            init_warm_microphone()
+            STARTUP_TIMER.mark("audio ready")
+        except Exception as e:
+            print(f"[Startup] Background warm-up error: {e}")
+        finally:
+            STARTUP_TIMER.mark("background warm-up done")
+            if on_done:
+                on_done()
+    thread = threading.Thread(target=_run, name="startup-warm-up", daemon=True)
+    thread.start()
+    return thread
 
-recognizer = sr.Recognizer()
+def collect_runtime_metrics():
+    """Cache and translation client statistics, read at export time."""
+    samples = []
+    if config_store is not None:
+        # Many save requests per actual write = the write-behind debounce at work.
+        samples.append(("config_save_requests_total", {}, config_store.save_requests))
+        samples.append(("config_writes_total", {}, config_store.write_count))
+    if translation_cache is not None:
+        stats = translation_cache.stats()
+        for result, key in (("memory", "memory_hits"), ("disk", "disk_hits"), ("miss", "misses")):
+            samples.append(("translation_cache_lookups_total", {"result": result}, stats[key]))
+        samples.append(("translation_cache_hit_ratio", {}, stats["hit_rate"]))
+    if pipeline is not None:
+        samples.append(("pipeline_in_flight", {}, pipeline.in_flight))
+        for stage, depth in pipeline.queue_depths().items():
+            samples.append(("pipeline_queue_depth", {"stage": stage}, depth))
+    if captioner is not None:
+        stats = captioner.stats()
+        samples.append(("caption_running", {}, 1 if stats["running"] else 0))
+        samples.append(("caption_segments_total", {}, stats["segments"]))
+        samples.append(("caption_dropped_segments_total", {}, stats["dropped"]))
+        samples.append(("caption_audio_seconds_total", {}, round(stats["audio_seconds"], 3)))
+        samples.append(("caption_in_flight", {}, stats["in_flight"]))
+        if stats["segments_per_minute"] is not None:
+            samples.append(("caption_segments_per_minute", {}, round(stats["segments_per_minute"], 3)))
+    translator = get_translator()
+    if health_monitor is not None and health_monitor.healthy is not None:
+        samples.append(("translator_healthy", {"engine": translator.name}, 1 if health_monitor.healthy else 0))
+    if translator.breaker is not None:
+        samples.append(("translator_circuit_open", {"engine": translator.name},
+                        0 if translator.breaker.state == BREAKER_CLOSED else 1))
+    client = getattr(translator, "client", None)
+    if client is not None and hasattr(client, "endpoint_status"):
+        for endpoint in client.endpoint_status():
+            labels = {"endpoint": endpoint["url"]}
+            samples.append(("translator_endpoint_outstanding", labels, endpoint["outstanding"]))
+            samples.append(("translator_endpoint_up", labels, 1 if endpoint["breaker"] == BREAKER_CLOSED else 0))
+            if endpoint["ewma_ms"] is not None:
+                samples.append(("translator_endpoint_ewma_seconds", labels, endpoint["ewma_ms"] / 1000))
+        samples.append(("translator_hedged_requests_total", {"engine": translator.name}, client.hedged))
+        samples.append(("translator_hedge_wins_total", {"engine": translator.name}, client.hedge_wins))
+        samples.append(("translator_failovers_total", {"engine": translator.name}, client.failovers))
+        samples.append(("translator_fast_failures_total", {"engine": translator.name},
+                        getattr(translator, "fast_failures", 0) + client.rejected))
+    stats = translator.request_stats()
+    if stats:
+        samples.append(("translator_requests_total", {"engine": translator.name}, stats["requests"]))
+        for error_type, count in stats["error_types"].items():
+            samples.append(("translator_errors_total", {"engine": translator.name, "type": error_type}, count))
+    return samples
 
-transcription_thread = None
-is_listening = False
-listen_stop_event = threading.Event()
-speech_prompt_timer = None
+def get_metrics():
+    global metrics
+    with _metrics_lock:
+        if metrics is None:
+            from metrics import MetricsRegistry
+            metrics = MetricsRegistry()
+            metrics.register_collector(collect_runtime_metrics)
+        return metrics
 
-def show_speak_now_prompt(overlay_window, engine_name):
-    """Wyświetl 'Speak now...' tylko jeśli trwa aktywne nasłuchiwanie."""
-    if is_listening and not listen_stop_event.is_set():
-        overlay_window.show_text_signal.emit(f"Speak now ({engine_name})...", False, False)
+def on_trace_done(trace):
+    get_metrics().record_trace(trace)
+    if metrics_writer is not None:
+        metrics_writer.write_trace(trace)
 
-def refresh_speech_prompt(overlay_window, engine_name):
-    global speech_prompt_timer
-    if is_listening and not listen_stop_event.is_set() and speech_prompt_timer is not None:
-        show_speak_now_prompt(overlay_window, engine_name)
-        speech_prompt_timer = threading.Timer(4.5, refresh_speech_prompt, [overlay_window, engine_name])
-        speech_prompt_timer.daemon = True
-        speech_prompt_timer.start()
+def init_metrics():
+    """Starts the optional exporters: JSONL log in CONFIG_DIR and a localhost scrape endpoint."""
+    global metrics_writer, metrics_server
+    if metrics_server is not None:
+        metrics_server.stop()
+        metrics_server = None
+    metrics_writer = None
+    if current_config.get("metrics_jsonl_enabled", False) and CONFIG_DIR:
+        from metrics import MetricsJsonlWriter
+        metrics_writer = MetricsJsonlWriter(
+            CONFIG_DIR / "metrics.jsonl",
+            max_bytes=current_config.get("metrics_jsonl_max_bytes", DEFAULT_METRICS_JSONL_MAX_BYTES),
+        )
+    if current_config.get("metrics_http_enabled", False):
+        from metrics import MetricsHttpServer
+        try:
+            metrics_server = MetricsHttpServer(get_metrics(), current_config.get("metrics_http_port", DEFAULT_METRICS_HTTP_PORT)).start()
+            print(f"[Metrics] Serving metrics on {metrics_server.url}")
+        except OSError as e:
+            print(f"[Metrics] Cannot start metrics endpoint: {e}")
 
-def translate_text_libretranslate_local(text, source_lang="pl", target_lang="en", server_url="http://localhost:5000/translate"):
+def create_voice_activity_detector(source, cfg, continuous=False):
+    from vad import VoiceActivityDetector
+    # End of speech = the pause allowed inside a phrase (vad_hangover) plus the
+    # extra wait for a follow-up phrase (silence_timeout), as the old listen() loop did.
+    # Continuous captioning cuts at the phrase pause alone, so captions keep flowing.
+    hangover = cfg.get("vad_hangover", DEFAULT_VAD_HANGOVER)
+    if not continuous:
+        hangover += cfg.get("silence_timeout", DEFAULT_SILENCE_TIMEOUT)
+    return VoiceActivityDetector(
+        source.SAMPLE_RATE, source.SAMPLE_WIDTH,
+        energy_threshold=get_recognizer().energy_threshold,
+        frame_ms=cfg.get("vad_frame_ms", DEFAULT_VAD_FRAME_MS),
+        start_ms=cfg.get("vad_start_ms", DEFAULT_VAD_START_MS),
+        hangover_ms=hangover * 1000,
+        zcr_max=cfg.get("vad_zcr_max", DEFAULT_VAD_ZCR_MAX),
+        use_webrtcvad=cfg.get("vad_use_webrtcvad", DEFAULT_VAD_USE_WEBRTCVAD),
+    )
+
+# Bounded: in a long captioning session a result that never renders must not pin its trace forever.
+_MAX_AWAITING_RENDER = 32
+_awaiting_render = collections.deque()
+_awaiting_render_lock = threading.Lock()
+
+def expect_render(trace, text):
+    evicted = None
+    with _awaiting_render_lock:
+        if len(_awaiting_render) >= _MAX_AWAITING_RENDER:
+            evicted = _awaiting_render.popleft()[1]
+        _awaiting_render.append((text, trace))
+    if evicted is not None:
+        evicted.mark_superseded()
+
+def attach_overlay_tracing(overlay_window):
     """
-    Translate text using local LibreTranslate Docker server (no API key required)
+    Marks 'overlay_shown' on the trace whose final result was just put on screen.
+    Older results still waiting were replaced before they could render (superseded).
     """
+    def _on_rendered(text, priority):
+        if priority < PRIORITY_FINAL:
+            return
+        with _awaiting_render_lock:
+            if not any(expected == text for expected, _ in _awaiting_render):
+                return
+            superseded = []
+            while True:
+                expected, trace = _awaiting_render.popleft()
+                if expected == text:
+                    break
+                superseded.append(trace)
+        for old_trace in superseded:
+            old_trace.mark_superseded()
+        trace.mark("overlay_shown")
+    overlay_window.text_rendered.connect(_on_rendered)
+
+def is_capturing():
+    if captioner is not None and captioner.is_running:
+        return True
+    return pipeline is not None and pipeline.is_capturing
+
+def _set_capture_state(job, state):
+    if job.pipeline is not None:
+        job.pipeline.set_capture_state(state)
+
+def make_utterance_job(overlay_window, trace=None, audio_source_factory=None, target_pipeline=None):
+    return UtteranceJob(trace or UtteranceTrace(), overlay_window=overlay_window, cfg=None, engine=None,
+                        audio_source_factory=audio_source_factory, pipeline=target_pipeline,
+                        show_progress=True)
+
+def track_trace(trace):
+    """Feeds the trace to the debug console ring and, once complete, to metrics."""
+    trace.add_done_callback(on_trace_done)
+    trace_recorder.record(trace)
+
+def capture_stage(job):
+    """Pipeline stage 1: calibrate and capture one utterance. The microphone is only held here."""
+    from vad import capture_utterance
+    trace, overlay_window = job.trace, job.overlay_window
+    cfg = job.cfg = get_config_snapshot()
+    overlay_window.clear_signal.emit()
+    recognizer = get_recognizer()
+    engine = job.engine = get_current_recognizer_engine()
+    engine_name = engine.short_name
+    trace.recognizer_engine = engine.name
+    device_index = cfg.get("microphone_device_index")
+    open_source = job.audio_source_factory or open_audio_source
+    stop_event = job.pipeline.stop_event if job.pipeline is not None else None
     try:
-        payload = {
-            "q": text,
-            "source": source_lang,
-            "target": target_lang
-        }
-        
-        headers = {
-            "Content-Type": "application/json"
-        }
-        
-        response = requests.post(server_url, json=payload, headers=headers, timeout=10)
-        
-        if response.status_code == 200:
-            result = response.json()
-            return result.get("translatedText", "")
-        else:
-            print(f"LibreTranslate API Error: {response.status_code} - {response.text}")
+        calibrated = noise_calibrator is not None and noise_calibrator.apply(recognizer, device_index)
+        if not calibrated:
+            _set_capture_state(job, STATE_CALIBRATING)
+            overlay_window.post_status(f"Calibrating noise ({engine_name})...")
+        with open_source(device_index) as source:
+            trace.mark("mic_open")
+            if not calibrated:
+                if noise_calibrator is not None:
+                    noise_calibrator.calibrate(recognizer, source, device_index)
+                else:
+                    recognizer.adjust_for_ambient_noise(source)
+            trace.mark("calibrated")
+            _set_capture_state(job, STATE_LISTENING)
+            overlay_window.post_status(f"Speak now ({engine_name})...")
+            next_prompt = [time.monotonic() + SPEECH_PROMPT_REFRESH]
+
+            def should_stop():
+                # Runs once per audio chunk; also keeps the 'Speak now' prompt on screen.
+                if stop_event is not None and stop_event.is_set():
+                    return True
+                now = time.monotonic()
+                if now >= next_prompt[0]:
+                    overlay_window.post_status(f"Speak now ({engine_name})...")
+                    next_prompt[0] = now + SPEECH_PROMPT_REFRESH
+                return False
+
+            detector = create_voice_activity_detector(source, cfg)
+            accumulator = capture_utterance(
+                source, detector,
+                max_seconds=cfg.get("phrase_time_limit", 30),
+                initial_timeout=cfg.get("initial_silence_timeout", DEFAULT_INITIAL_SILENCE_TIMEOUT),
+                pre_speech_ms=cfg.get("vad_pre_speech_ms", DEFAULT_VAD_PRE_SPEECH_MS),
+                should_stop=should_stop,
+                on_speech_start=lambda: trace.mark("speech_start"),
+            )
+            trace.mark("speech_end")
+        trace.audio_bytes = detector.position
+        trace.utterance_bytes = len(accumulator) if accumulator is not None else 0
+        if noise_calibrator is not None and detector.noise_floor is not None:
+            noise_calibrator.observe(detector.noise_floor, device_index)
+        if accumulator is None or not len(accumulator):
+            overlay_window.post_error("No speech detected.")
+            trace.finish("no_speech")
             return None
-            
-    except requests.RequestException as e:
-        print(f"LibreTranslate Request Error: {e}")
+        job.audio = accumulator.to_audio_data()
+        return job
+    except Exception as e:
+        overlay_window.post_error(f"Unexpected error in {engine_name} SR: {e}")
+        trace.finish("capture_error", e)
+        return None
+    finally:
+        _set_capture_state(job, STATE_IDLE)
+
+def recognize_stage(job):
+    """Pipeline stage 2: speech to text."""
+    import speech_recognition as sr
+    trace, overlay_window, engine = job.trace, job.overlay_window, job.engine
+    engine_name = engine.short_name
+    if job.show_progress:
+        overlay_window.post_status(f"Processing speech ({engine_name})...")
+    try:
+        trace.mark("recognize_request")
+        job.text = engine.recognize(job.audio, job.cfg.get("source_language", DEFAULT_SOURCE_LANGUAGE), trace=trace)
+        trace.mark("recognize_response")
+    except sr.UnknownValueError:
+        # In captioning mode coughs and background noise are routine; do not flash an error.
+        if job.show_progress:
+            overlay_window.post_error("Failed to recognize speech.")
+        trace.finish("not_recognized")
+        return None
+    except sr.RequestError as e:
+        overlay_window.post_error(f"{engine_name} API Error: {e}")
+        trace.finish("recognize_error", e)
         return None
     except Exception as e:
-        print(f"LibreTranslate Unexpected Error: {e}")
+        overlay_window.post_error(f"Unexpected error in {engine_name} SR: {e}")
+        trace.finish("recognize_error", e)
+        return None
+    finally:
+        # The recording is not needed past this point; do not keep it alive in the job.
+        job.audio = None
+    if not job.text:
+        trace.finish("not_recognized")
         return None
+    return job
+
+_PENDING_TRANSLATION = "…"
+_FAILED_TRANSLATION = "(translation failed)"
+
+def format_translation_stack(targets, results):
+    """One line per target language, always in config order, so lines do not jump as results arrive."""
+    return "\n".join(
+        f"{target.upper()}: {_PENDING_TRANSLATION if result is None else result}"
+        for target, result in zip(targets, results)
+    )
+
+def join_translated_segments(results):
+    """Translated sentences in order, up to the first one still pending; None if nothing is ready yet."""
+    parts = []
+    for result in results:
+        if result is None:
+            if parts:
+                parts.append(_PENDING_TRANSLATION)
+            break
+        parts.append(result)
+    return " ".join(parts) if parts else None
+
+def translate_progressively(job, translator, source_lang, targets, segments):
+    """
+    Translates every (segment, target) pair concurrently, first segments first,
+    and re-posts the overlay text each time a new prefix becomes readable, so a
+    long utterance shows its first sentence without waiting for the last.
+    Several targets are stacked one line each. Returns the final text, or None
+    if every target failed.
+    """
+    trace = job.trace
+    pairs = [(s, t) for s in range(len(segments)) for t in range(len(targets))]
+    results = [[None] * len(segments) for _ in targets]
+    succeeded = [0] * len(targets)
+    remaining = len(pairs)
+    unavailable = None
+    posted = None
 
-def transcribe_and_translate(overlay_window):
-    global is_listening, last_translated_text, current_config, speech_prompt_timer
-    overlay_window.update_settings_from_config(current_config)
-    is_listening = True
-    overlay_window.hide_overlay_and_clear_text()
-    listen_stop_event.clear()
-    final_transcription = ""
+    def render():
+        texts = [join_translated_segments(row) for row in results]
+        return texts[0] if len(targets) == 1 else format_translation_stack(targets, texts)
+
+    jobs = [(segments[s], source_lang, targets[t]) for s, t in pairs]
+    for index, translated, error in translator.translate_as_completed(jobs):
+        remaining -= 1
+        s, t = pairs[index]
+        if isinstance(error, TranslatorUnavailable):
+            unavailable = error
+        if translated is None:
+            print(f"[Translator] Translation of segment {s + 1}/{len(segments)} to '{targets[t]}' failed: "
+                  f"{error or translator.error_message}")
+            results[t][s] = _FAILED_TRANSLATION
+        else:
+            results[t][s] = translated
+            succeeded[t] += 1
+        if remaining and any(succeeded):
+            text = render()
+            if text != posted:
+                posted = text
+                trace.mark("first_text")
+                job.overlay_window.post_final(text)
+    if not any(succeeded) and unavailable is not None:
+        raise unavailable
+    for t in range(len(targets)):
+        if not succeeded[t]:
+            results[t] = [_FAILED_TRANSLATION]
+    return render() if any(succeeded) else None
+
+def translate_stage(job):
+    """
+    Pipeline stage 3: translate (into one or several target languages) and show the result.
+    Long text is split into sentences that are translated in parallel and shown as they arrive.
+    """
+    global last_translated_text
+    trace, overlay_window, cfg = job.trace, job.overlay_window, job.cfg
+    if job.show_progress:
+        overlay_window.post_status(f"Recognized: {job.text}")
     try:
-        overlay_window.show_text_signal.emit("Calibrating noise (Google)...", False, False)
-        try:
-            with sr.Microphone() as source:
+        translator = get_translator()
+        trace.translator_engine = translator.name
+        if job.show_progress:
+            overlay_window.post_status(f"Translating ({translator.short_name})...")
+        targets = target_language_list(cfg.get("target_language", DEFAULT_TARGET_LANGUAGE))
+        source_lang = to_translator_language(cfg.get("source_language", DEFAULT_SOURCE_LANGUAGE))
+        segments = [job.text]
+        if cfg.get("segment_translation", DEFAULT_SEGMENT_TRANSLATION):
+            segments = split_segments(
+                job.text,
+                min_chars=cfg.get("segment_min_chars", DEFAULT_SEGMENT_MIN_CHARS),
+                max_chars=cfg.get("segment_max_chars", DEFAULT_SEGMENT_MAX_CHARS),
+            ) or segments
+        trace.segments = len(segments)
+        trace.mark("translate_request")
+        if len(targets) == 1 and len(segments) == 1:
+            translated_text = translator.translate(segments[0], source_lang, targets[0])
+        else:
+            translated_text = translate_progressively(job, translator, source_lang, targets, segments)
+        trace.mark("translate_response")
+        if translated_text is None:
+            overlay_window.post_error(translator.error_message)
+            trace.finish("translate_error")
+            return None
+        last_translated_text = translated_text
+        trace.mark("first_text")
+        trace.mark("final_posted")
+        expect_render(trace, translated_text)
+        overlay_window.post_final(translated_text)
+        trace.finish("ok")
+    except TranslatorUnavailable as e:
+        # Circuit breaker open: fail fast instead of waiting out the request timeout.
+        overlay_window.post_error(str(e))
+        trace.finish("translator_unavailable", e)
+    except Exception as e:
+        overlay_window.post_error(f"Translation error: {e}")
+        trace.finish("translate_error", e)
+    return None
+
+PIPELINE_STAGES = [("capture", capture_stage), ("recognize", recognize_stage), ("translate", translate_stage)]
+
+def transcribe_and_translate(overlay_window, trace=None, audio_source_factory=None):
+    """
+    Runs one utterance through all stages in the calling thread (no overlap).
+    audio_source_factory(device_index) replaces the microphone (e.g. a WAV file in benchmarks).
+    Returns the UtteranceTrace of this utterance.
+    """
+    job = make_utterance_job(overlay_window, trace, audio_source_factory)
+    track_trace(job.trace)
+    trace = job.trace
+    for _, stage in PIPELINE_STAGES:
+        job = stage(job)
+        if job is None:
+            break
+    return trace
+
+def init_pipeline():
+    global pipeline
+    if pipeline is None:
+        pipeline = Pipeline(
+            PIPELINE_STAGES,
+            queue_size=current_config.get("pipeline_queue_size", DEFAULT_PIPELINE_QUEUE_SIZE),
+            max_pending_presses=current_config.get("pipeline_max_pending_presses", DEFAULT_PIPELINE_MAX_PENDING_PRESSES),
+        ).start()
+    return pipeline
+
+def make_caption_trace():
+    trace = UtteranceTrace(mode="continuous")
+    track_trace(trace)
+    return trace
+
+def start_continuous_captioning(overlay_window, audio_source_factory=None):
+    """
+    Hands-free mode: one open microphone, VAD-cut segments, and a dedicated
+    recognize -> translate pipeline. Settings are read when captioning starts.
+    """
+    global captioner
+    if captioner is not None and captioner.is_running:
+        return captioner
+    cfg = get_config_snapshot()
+    recognizer = get_recognizer()
+    engine = get_current_recognizer_engine()
+    device_index = cfg.get("microphone_device_index")
+    open_source = audio_source_factory or open_audio_source
+
+    def create_detector(source):
+        if not (noise_calibrator is not None and noise_calibrator.apply(recognizer, device_index)):
+            overlay_window.post_status(f"Calibrating noise ({engine.short_name})...")
+            if noise_calibrator is not None:
+                noise_calibrator.calibrate(recognizer, source, device_index)
+            else:
                 recognizer.adjust_for_ambient_noise(source)
-                overlay_window.show_text_signal.emit("Speak now (Google)...", False, False)
-                if speech_prompt_timer is not None:
-                    speech_prompt_timer.cancel()
-                speech_prompt_timer = threading.Timer(4.5, refresh_speech_prompt, [overlay_window, "Google"])
-                speech_prompt_timer.daemon = True
-                speech_prompt_timer.start()
-                max_total_time = current_config.get("phrase_time_limit", 30)
-                initial_silence = current_config.get("initial_silence_timeout", DEFAULT_INITIAL_SILENCE_TIMEOUT)
-                segment_silence = 0.20
-                start_time = time.time()
-                audio_segments = []
-                try:
-                    audio = recognizer.listen(
-                        source,
-                        timeout=initial_silence,
-                        phrase_time_limit=min(5, max_total_time)
-                    )
-                    audio_segments.append(audio)
-                except sr.WaitTimeoutError:
-                    overlay_window.show_text_signal.emit("No speech detected.", False, True)
-                    is_listening = False
-                    listen_stop_event.set()
-                    if speech_prompt_timer is not None:
-                        speech_prompt_timer.cancel()
-                        speech_prompt_timer = None
-                    return
-                while True:
-                    if time.time() - start_time > max_total_time:
-                        break
-                    try:
-                        audio = recognizer.listen(
-                            source,
-                            timeout=segment_silence,
-                            phrase_time_limit=min(5, max_total_time - (time.time() - start_time))
-                        )
-                        audio_segments.append(audio)
-                    except sr.WaitTimeoutError:
-                        break
-                if speech_prompt_timer is not None:
-                    speech_prompt_timer.cancel()
-                    speech_prompt_timer = None
-                if not audio_segments:
-                    overlay_window.show_text_signal.emit("No speech detected.", False, True)
-                    is_listening = False
-                    listen_stop_event.set()
-                    return
-                if len(audio_segments) == 1:
-                    combined_audio = audio_segments[0]
-                else:
-                    raw_data = b''.join([a.get_raw_data() for a in audio_segments])
-                    sample_rate = audio_segments[0].sample_rate
-                    sample_width = audio_segments[0].sample_width
-                    combined_audio = sr.AudioData(raw_data, sample_rate, sample_width)
-                overlay_window.show_text_signal.emit("Processing speech (Google)...", False, False)
-                final_transcription = recognizer.recognize_google(
-                    combined_audio, 
-                    language=current_config.get("source_language", DEFAULT_SOURCE_LANGUAGE)
-                )
-        except sr.UnknownValueError:
-            overlay_window.show_text_signal.emit("Failed to recognize speech.", False, True)
-            if speech_prompt_timer is not None:
-                speech_prompt_timer.cancel()
-                speech_prompt_timer = None
-        except sr.RequestError as e:
-            overlay_window.show_text_signal.emit(f"Google API Error: {e}", False, True)
-            is_listening = False
-            listen_stop_event.set()
-            if speech_prompt_timer is not None:
-                speech_prompt_timer.cancel()
-                speech_prompt_timer = None
-            return
-        except Exception as e:
-            overlay_window.show_text_signal.emit(f"Unexpected error in Google SR: {e}", False, True)
-            is_listening = False
-            listen_stop_event.set()
-            if speech_prompt_timer is not None:
-                speech_prompt_timer.cancel()
-                speech_prompt_timer = None
+        overlay_window.post_status(f"Captioning ({engine.short_name})...")
+        return create_voice_activity_detector(source, cfg, continuous=True)
+
+    def make_job(trace):
+        trace.recognizer_engine = engine.name
+        return UtteranceJob(trace, overlay_window=overlay_window, cfg=cfg, engine=engine,
+                            audio_source_factory=None, pipeline=None, show_progress=False)
+
+    def on_segment(detector):
+        # Background recalibration never gets the microphone while captioning holds it,
+        # so follow a drifting noise floor in the detector itself.
+        if detector.noise_floor is None or detector.energy_threshold <= 0:
             return
-        if final_transcription:
-            if speech_prompt_timer is not None:
-                speech_prompt_timer.cancel()
-                speech_prompt_timer = None
-            overlay_window.show_text_signal.emit(f"Recognized: {final_transcription}", False, False)
-            try:
-                overlay_window.show_text_signal.emit("Translating (LibreTranslate)...", False, False)
-                libretranslate_url = current_config.get("libretranslate_url", DEFAULT_LIBRETRANSLATE_URL)
-                target_lang = current_config.get("target_language", "en")
-                source_lang = current_config.get("source_language", DEFAULT_SOURCE_LANGUAGE)
-                if source_lang.startswith("pl"):
-                    source_lang = "pl"
-                elif source_lang.startswith("en"):
-                    source_lang = "en"
-                translated_text = translate_text_libretranslate_local(
-                    final_transcription, 
-                    source_lang=source_lang,
-                    target_lang=target_lang,
-                    server_url=libretranslate_url
-                )
-                if translated_text is None:
-                    overlay_window.show_text_signal.emit("LibreTranslate server error. Check if Docker server is running on localhost:5000", False, True)
-                    return
-                last_translated_text = translated_text
-                overlay_window.show_text_signal.emit(translated_text, False, False)
-            except Exception as e:
-                overlay_window.show_text_signal.emit(f"Translation error: {e}", False, True)
-    finally:
-        is_listening = False
-        listen_stop_event.set()
-        if speech_prompt_timer is not None:
-            speech_prompt_timer.cancel()
-            speech_prompt_timer = None
+        threshold = detector.noise_floor * recognizer.dynamic_energy_ratio
+        drift_ratio = cfg.get("noise_calibration_drift_ratio", DEFAULT_NOISE_CALIBRATION_DRIFT_RATIO)
+        ratio = threshold / detector.energy_threshold
+        if ratio > drift_ratio or ratio < 1.0 / drift_ratio:
+            print(f"[Captioning] Noise floor drift, VAD threshold {detector.energy_threshold:.0f} -> {threshold:.0f}")
+            detector.energy_threshold = threshold
+
+    def on_error(error):
+        overlay_window.post_error(f"Continuous captioning stopped: {error}")
+
+    captioner = ContinuousCaptioner(
+        PIPELINE_STAGES[1:],
+        open_source=lambda: open_source(device_index),
+        create_detector=create_detector,
+        trace_factory=make_caption_trace,
+        make_job=make_job,
+        max_segment_seconds=cfg.get("caption_max_segment_seconds", DEFAULT_CAPTION_MAX_SEGMENT_SECONDS),
+        pre_speech_ms=cfg.get("vad_pre_speech_ms", DEFAULT_VAD_PRE_SPEECH_MS),
+        queue_size=cfg.get("caption_queue_size", DEFAULT_CAPTION_QUEUE_SIZE),
+        on_error=on_error,
+        on_segment=on_segment,
+    )
+    captioner.start()
+    return captioner
+
+def stop_continuous_captioning(timeout=3.0):
+    if captioner is not None:
+        captioner.stop(timeout)
+
+def is_continuous_captioning():
+    return captioner is not None and captioner.is_running
+
+def toggle_continuous_captioning(overlay_window):
+    """Tray entry point. Returns True if captioning is on afterwards."""
+    if is_continuous_captioning():
+        # Do not hold the GUI thread while in-flight segments drain.
+        stop_continuous_captioning(timeout=0.5)
+        overlay_window.post_error("Continuous captioning off.")
+        return False
+    start_continuous_captioning(overlay_window)
+    return True
 
 def hotkey_callback_translation(overlay_window):
-    global transcription_thread, is_listening
-    if not is_listening:
-        if transcription_thread and transcription_thread.is_alive():
-            return
-        transcription_thread = threading.Thread(target=transcribe_and_translate, args=(overlay_window,))
-        transcription_thread.daemon = True
-        transcription_thread.start()
-    else:
-        pass
+    if is_continuous_captioning():
+        overlay_window.post_error("Continuous captioning is on - hotkey ignored.")
+        return
+    job = make_utterance_job(overlay_window, target_pipeline=init_pipeline())
+    track_trace(job.trace)
+    if not pipeline.submit(job):
+        job.trace.finish("rejected")
+        overlay_window.post_error("Busy - hotkey press ignored.")
 
 def hotkey_callback_copy(overlay_window):
     global last_translated_text
     if last_translated_text:
         overlay_window.copy_to_clipboard_signal.emit(last_translated_text)
-        overlay_window.show_text_signal.emit("Copied to clipboard!", False, True)
+        overlay_window.post_error("Copied to clipboard!")
     else:
-        overlay_window.show_text_signal.emit("No text to copy.", False, True)
+        overlay_window.post_error("No text to copy.")
 
 def register_hotkey_translation(hotkey_str, overlay_window):
     global active_hotkey, active_hotkey_listener
+    import keyboard
     if active_hotkey_listener:
         try:
             keyboard.remove_hotkey(active_hotkey_listener)
@@ -327,6 +839,7 @@ def register_hotkey_translation(hotkey_str, overlay_window):
 
 def register_hotkey_copy(hotkey_str, overlay_window):
     global active_copy_hotkey, active_copy_hotkey_listener
+    import keyboard
     if active_copy_hotkey_listener:
         try:
             keyboard.remove_hotkey(active_copy_hotkey_listener)
@@ -342,7 +855,22 @@ def register_hotkey_copy(hotkey_str, overlay_window):
         raise
 
 def main():
+    # --fast-start: tray + overlay first, settings window only when opened from the tray.
+    # --startup-report: print the startup timing report once the warm-up finished.
+    # --exit-after-startup: quit after the warm-up (cold-start benchmark).
     load_config()
+    STARTUP_TIMER.mark("config loaded")
+    fast_start = "--fast-start" in sys.argv or current_config.get("fast_start", DEFAULT_FAST_START)
+    startup_report = "--startup-report" in sys.argv or "--exit-after-startup" in sys.argv
+    exit_after_startup = "--exit-after-startup" in sys.argv
+    init_translation_cache()
+    init_metrics()
+    if not fast_start:
+        rebuild_translation_client()
+        init_health_monitor()
+        warm_up_recognizer_engine()
+        init_warm_microphone()
+        init_noise_calibrator()
     app = QtWidgets.QApplication(sys.argv)
     app.setQuitOnLastWindowClosed(False)
     icon_path = os.path.join(os.path.dirname(__file__), "pythonicon.ico")
@@ -365,22 +893,11 @@ def main():
         overlay_positions_map=OVERLAY_POSITIONS
     )
     overlay_window.setWindowIcon(QtGui.QIcon(icon_path))
-    try:
-        register_hotkey_translation(active_hotkey, overlay_window)
-    except Exception as e:
-        print(f"CRITICAL ERROR: Cannot register initial translation hotkey '{active_hotkey}'. The application may not work correctly. {e}")
-        QtWidgets.QMessageBox.critical(None, "Hotkey Error",
-                                       f"Failed to register initial translation hotkey: '{active_hotkey}'.\n"
-                                       "Ensure the shortcut is not already in use by another program.\n"
-                                       "The application will start, but the hotkey may not work.")
-    try:
-        register_hotkey_copy(active_copy_hotkey, overlay_window)
-    except Exception as e:
-        print(f"CRITICAL ERROR: Cannot register initial copy hotkey '{active_copy_hotkey}'. The application may not work correctly. {e}")
-        QtWidgets.QMessageBox.critical(None, "Hotkey Error",
-                                       f"Failed to register initial copy hotkey: '{active_copy_hotkey}'.\n"
-                                       "Ensure the shortcut is not already in use by another program.\n"
-                                       "The application will start, but the copy hotkey may not work.")
+    overlay_window.config_version = config_store.version
+    config_store.subscribe(lambda snapshot, changed_keys: overlay_window.apply_config_signal.emit(snapshot, changed_keys))
+    attach_overlay_tracing(overlay_window)
+    init_pipeline()
+    STARTUP_TIMER.mark("overlay created")
     tray_app = SystemTrayApp(
         app_instance=app,
         overlay_window_instance=overlay_window,
@@ -388,10 +905,72 @@ def main():
         register_hotkey_translation_func=register_hotkey_translation,
         register_hotkey_copy_func=register_hotkey_copy,
         save_config_func=save_config,
-        app_version_ref=APP_VERSION
+        flush_config_func=flush_config,
+        apply_config_changes_func=apply_config_changes,
+        app_version_ref=APP_VERSION,
+        libretranslate_url_changed_func=rebuild_translation_client,
+        recognizer_engine_changed_func=warm_up_recognizer_engine,
+        noise_calibration_status_func=get_noise_calibration_status,
+        trace_recorder=trace_recorder,
+        continuous_captioning_func=lambda: toggle_continuous_captioning(overlay_window),
+        continuous_captioning_running_func=is_continuous_captioning,
+        profiles_dir=CONFIG_DIR / "profiles" if CONFIG_DIR else None
     )
-    tray_app.show_settings_window() 
-    sys.exit(app.exec())
+    STARTUP_TIMER.mark("tray visible")
+    QtCore.QTimer.singleShot(0, lambda: STARTUP_TIMER.mark("event loop running"))
+    def register_initial_hotkeys():
+        try:
+            register_hotkey_translation(active_hotkey, overlay_window)
+        except Exception as e:
+            print(f"CRITICAL ERROR: Cannot register initial translation hotkey '{active_hotkey}'. The application may not work correctly. {e}")
+            QtWidgets.QMessageBox.critical(None, "Hotkey Error",
+                                           f"Failed to register initial translation hotkey: '{active_hotkey}'.\n"
+                                           "Ensure the shortcut is not already in use by another program.\n"
+                                           "The application will start, but the hotkey may not work.")
+        try:
+            register_hotkey_copy(active_copy_hotkey, overlay_window)
+        except Exception as e:
+            print(f"CRITICAL ERROR: Cannot register initial copy hotkey '{active_copy_hotkey}'. The application may not work correctly. {e}")
+            QtWidgets.QMessageBox.critical(None, "Hotkey Error",
+                                           f"Failed to register initial copy hotkey: '{active_copy_hotkey}'.\n"
+                                           "Ensure the shortcut is not already in use by another program.\n"
+                                           "The application will start, but the copy hotkey may not work.")
+        STARTUP_TIMER.mark("hotkeys registered")
+
+    if fast_start:
+        # After the event loop started, so a hotkey error dialog does not hold up the tray.
+        QtCore.QTimer.singleShot(0, register_initial_hotkeys)
+    else:
+        register_initial_hotkeys()
+    if not fast_start:
+        tray_app.show_settings_window()
+        STARTUP_TIMER.mark("settings window shown")
+
+    warm_up_done = threading.Event()
+    if fast_start:
+        warm_up_in_background(on_done=warm_up_done.set)
+    else:
+        warm_up_done.set()
+
+    def _check_startup_finished():
+        if not warm_up_done.is_set():
+            return
+        startup_timer.stop()
+        if startup_report:
+            print(STARTUP_TIMER.report())
+        if exit_after_startup:
+            app.quit()
+
+    startup_timer = QtCore.QTimer()
+    startup_timer.timeout.connect(_check_startup_finished)
+    startup_timer.start(20)
+    exit_code = app.exec()
+    stop_continuous_captioning()
+    if health_monitor is not None:
+        health_monitor.stop()
+    pipeline.stop()
+    flush_config()
+    sys.exit(exit_code)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
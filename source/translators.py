@@ -0,0 +1,286 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from modules import (
+    DEFAULT_TRANSLATOR_ENGINE,
+    DEFAULT_LIBRETRANSLATE_URL,
+    DEFAULT_LIBRETRANSLATE_CONNECT_TIMEOUT,
+    DEFAULT_LIBRETRANSLATE_READ_TIMEOUT,
+    DEFAULT_TRANSLATOR_MAX_WORKERS,
+    DEFAULT_TARGET_LANGUAGE,
+    DEFAULT_LIBRETRANSLATE_ROUTING,
+    DEFAULT_LIBRETRANSLATE_HEDGE,
+)
+from translation_cache import make_cache_key
+from health import CircuitBreaker, TranslatorUnavailable, BREAKER_OPEN
+
+
+def to_translator_language(code):
+    """'pl-PL' -> 'pl'. Speech recognition uses locale codes, translators use ISO 639-1."""
+    return code.split("-")[0].lower() if code else code
+
+
+def target_language_list(value):
+    """target_language setting (one code or a list of codes) -> ordered list of distinct codes."""
+    codes = [value] if isinstance(value, str) else list(value or [])
+    result = []
+    for code in codes:
+        code = code.strip() if isinstance(code, str) else ""
+        if code and code not in result:
+            result.append(code)
+    return result or [DEFAULT_TARGET_LANGUAGE]
+
+
+def url_list(value):
+    """libretranslate_url setting (one URL or a list of replica URLs) -> list of distinct URLs."""
+    urls = [value] if isinstance(value, str) else list(value or [])
+    result = []
+    for url in urls:
+        url = url.strip() if isinstance(url, str) else ""
+        if url and url not in result:
+            result.append(url)
+    return result or [DEFAULT_LIBRETRANSLATE_URL]
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_translator_executor(max_workers=DEFAULT_TRANSLATOR_MAX_WORKERS):
+    """Shared worker pool for concurrent translation calls."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="translator")
+        return _executor
+
+
+class TranslatorEngine:
+    """
+    Base class for translation backends. translate() returns the translated
+    text or None on error; translate_batch() returns a list (items may be None)
+    or None if the whole batch failed.
+    """
+    name = None
+    short_name = None
+    error_message = "Translation error."
+    # Set by backends that talk to a server; drives fail-fast and the health monitor.
+    breaker = None
+
+    def __init__(self, config, cache=None):
+        self.config = config
+        self.cache = cache
+
+    def configure(self, config, cache=None):
+        self.config = config
+        self.cache = cache
+
+    def warm_up(self):
+        pass
+
+    def request_stats(self):
+        """RequestStats.as_dict() of the backend client, or None if it does not keep any."""
+        return None
+
+    def check_health(self, timeout):
+        """Probes the backend server; returns its language list, raises if it is unhealthy."""
+        return None
+
+    def warm_up_pair(self, text, source_lang, target_lang):
+        """Uncached translation that loads the pair's model on the server; None on failure."""
+        return self._translate_uncached(text, source_lang, target_lang)
+
+    def cache_scope(self):
+        return self.name
+
+    def _translate_uncached(self, text, source_lang, target_lang):
+        raise NotImplementedError
+
+    def _translate_batch_uncached(self, texts, source_lang, target_lang):
+        return [self._translate_uncached(t, source_lang, target_lang) for t in texts]
+
+    def translate(self, text, source_lang, target_lang):
+        if self.cache is None:
+            return self._translate_uncached(text, source_lang, target_lang)
+        key = make_cache_key(text, source_lang, target_lang, self.cache_scope())
+        return self.cache.get_or_translate(
+            key, lambda: self._translate_uncached(text, source_lang, target_lang)
+        )
+
+    def translate_batch(self, texts, source_lang, target_lang):
+        texts = list(texts)
+        if self.cache is None:
+            return self._translate_batch_uncached(texts, source_lang, target_lang)
+        results = [None] * len(texts)
+        missing = []
+        for i, text in enumerate(texts):
+            cached = self.cache.get(make_cache_key(text, source_lang, target_lang, self.cache_scope()))
+            if cached is None:
+                missing.append(i)
+            else:
+                results[i] = cached
+        if missing:
+            translated = self._translate_batch_uncached([texts[i] for i in missing], source_lang, target_lang)
+            if translated is None:
+                return None
+            for i, value in zip(missing, translated):
+                results[i] = value
+                if value is not None:
+                    self.cache.put(make_cache_key(texts[i], source_lang, target_lang, self.cache_scope()), value)
+        return results
+
+    def submit(self, text, source_lang, target_lang):
+        """Runs translate() on the shared pool and returns a Future."""
+        return get_translator_executor().submit(self.translate, text, source_lang, target_lang)
+
+    def translate_concurrently(self, jobs):
+        """jobs: iterable of (text, source_lang, target_lang). Returns results in the same order."""
+        futures = [self.submit(text, source, target) for text, source, target in jobs]
+        return [f.result() for f in futures]
+
+    def translate_as_completed(self, jobs):
+        """
+        jobs: list of (text, source_lang, target_lang), all submitted at once to
+        the shared pool. Yields (index, translated_or_None, exception_or_None)
+        as each one finishes, so the slowest job sets the total latency, not the sum.
+        """
+        futures = {self.submit(text, source, target): i for i, (text, source, target) in enumerate(jobs)}
+        for future in as_completed(futures):
+            try:
+                yield futures[future], future.result(), None
+            except Exception as e:
+                yield futures[future], None, e
+
+
+class LibreTranslateEngine(TranslatorEngine):
+    name = "libretranslate_local"
+    short_name = "LibreTranslate"
+    error_message = "LibreTranslate server error. Check if Docker server is running on localhost:5000"
+
+    def __init__(self, config, cache=None):
+        super().__init__(config, cache)
+        self.client = None
+        self._client_lock = threading.Lock()
+        # Whole-service verdict of the health monitor; each replica has its own breaker in the pool.
+        self.breaker = CircuitBreaker()
+        self.fast_failures = 0
+
+    @property
+    def server_urls(self):
+        return url_list(self.config.get("libretranslate_url", DEFAULT_LIBRETRANSLATE_URL))
+
+    @property
+    def server_url(self):
+        return self.server_urls[0]
+
+    def cache_scope(self):
+        # Replicas serve the same models, so the cache is shared across the whole set.
+        return " ".join(sorted(self.server_urls))
+
+    def rebuild_client(self, server_url=None):
+        """
+        (Re)create the client, e.g. after the URL(s) changed in settings: an
+        EndpointPool of pooled LibreTranslate clients, one per replica.
+        """
+        from translation_client import LibreTranslateClient
+        from endpoint_pool import EndpointPool
+        urls = url_list(server_url) if server_url is not None else self.server_urls
+        with self._client_lock:
+            old_client = self.client
+            self.client = EndpointPool(
+                [
+                    LibreTranslateClient(
+                        url,
+                        connect_timeout=self.config.get("libretranslate_connect_timeout", DEFAULT_LIBRETRANSLATE_CONNECT_TIMEOUT),
+                        read_timeout=self.config.get("libretranslate_read_timeout", DEFAULT_LIBRETRANSLATE_READ_TIMEOUT),
+                    )
+                    for url in urls
+                ],
+                routing=self.config.get("libretranslate_routing", DEFAULT_LIBRETRANSLATE_ROUTING),
+                hedge=self.config.get("libretranslate_hedge", DEFAULT_LIBRETRANSLATE_HEDGE),
+            )
+            # New server(s) (or new settings): health is unknown until proven otherwise.
+            self.breaker.reset()
+        if old_client is not None:
+            old_client.close()
+        print(f"[Translator] LibreTranslate client ready for {', '.join(urls)}")
+        return self.client
+
+    def get_client(self):
+        client = self.client
+        if client is None or client.server_urls != self.server_urls:
+            client = self.rebuild_client()
+        return client
+
+    def request_stats(self):
+        client = self.client
+        return client.request_stats() if client is not None else None
+
+    def endpoint_status(self):
+        client = self.client
+        return client.endpoint_status() if client is not None else []
+
+    def check_health(self, timeout):
+        return self.get_client().languages(timeout)
+
+    def warm_up_pair(self, text, source_lang, target_lang):
+        # Bypasses routing: the health monitor warms up every replica it just saw healthy.
+        return self.get_client().warm_up(text, source_lang, target_lang)
+
+    def _ensure_available(self):
+        if self.breaker.state == BREAKER_OPEN:
+            self.fast_failures += 1
+            raise TranslatorUnavailable(f"{self.short_name} server is not responding - will retry automatically.")
+
+    def _translate_uncached(self, text, source_lang, target_lang):
+        self._ensure_available()
+        return self.get_client().translate(text, source_lang=source_lang, target_lang=target_lang)
+
+    def _translate_batch_uncached(self, texts, source_lang, target_lang):
+        self._ensure_available()
+        return self.get_client().translate_batch(texts, source_lang=source_lang, target_lang=target_lang)
+
+
+class FakeTranslatorEngine(TranslatorEngine):
+    """In-process fake backend for tests and benchmarks: '[target] text' after an optional delay."""
+    name = "fake_local"
+    short_name = "Fake"
+    error_message = "Fake translator error."
+
+    def _translate_uncached(self, text, source_lang, target_lang):
+        latency = float(self.config.get("fake_translator_latency", 0.0))
+        if latency > 0:
+            time.sleep(latency)
+        return f"[{target_lang}] {text}"
+
+    def _translate_batch_uncached(self, texts, source_lang, target_lang):
+        latency = float(self.config.get("fake_translator_latency", 0.0))
+        if latency > 0:
+            time.sleep(latency)
+        return [f"[{target_lang}] {text}" for text in texts]
+
+
+TRANSLATOR_ENGINE_CLASSES = {
+    LibreTranslateEngine.name: LibreTranslateEngine,
+    FakeTranslatorEngine.name: FakeTranslatorEngine,
+}
+
+_engine_instances = {}
+_engine_instances_lock = threading.Lock()
+
+
+def get_translator_engine(config, cache=None):
+    """Returns the long-lived engine instance selected by config['translator_engine']."""
+    name = config.get("translator_engine", DEFAULT_TRANSLATOR_ENGINE)
+    if name not in TRANSLATOR_ENGINE_CLASSES:
+        print(f"[Translator] Unknown translator engine '{name}', using '{DEFAULT_TRANSLATOR_ENGINE}'.")
+        name = DEFAULT_TRANSLATOR_ENGINE
+    with _engine_instances_lock:
+        engine = _engine_instances.get(name)
+        if engine is None:
+            engine = TRANSLATOR_ENGINE_CLASSES[name](config, cache)
+            _engine_instances[name] = engine
+        else:
+            engine.configure(config, cache)
+    return engine
@@ -2,29 +2,53 @@ from PyQt6 import QtWidgets, QtCore, QtGui
 import sys
 import os
 
-try:
-	import keyboard
-except Exception:
-	keyboard = None
-
-from gui import SettingsWindow
 from modules import APP_NAME, APP_VERSION, OVERLAY_POSITIONS
 
 
+def _keyboard():
+	# Imported on first use so the tray comes up without loading the hook library.
+	try:
+		import keyboard
+		return keyboard
+	except Exception:
+		return None
+
+
 class SystemTrayApp:
 	def __init__(self, app_instance, overlay_window_instance,
 				 current_config_ref,
 				 register_hotkey_translation_func,
 				 register_hotkey_copy_func,
 				 save_config_func,
-				 app_version_ref=APP_VERSION):
+				 flush_config_func=None,
+				 apply_config_changes_func=None,
+				 app_version_ref=APP_VERSION,
+				 libretranslate_url_changed_func=None,
+				 recognizer_engine_changed_func=None,
+				 noise_calibration_status_func=None,
+				 trace_recorder=None,
+				 continuous_captioning_func=None,
+				 continuous_captioning_running_func=None,
+				 profiles_dir=None):
 		self.app = app_instance
 		self.overlay_window = overlay_window_instance
 		self.current_config_ref = current_config_ref
 		self.register_hotkey_translation_func = register_hotkey_translation_func
 		self.register_hotkey_copy_func = register_hotkey_copy_func
 		self.save_config_func = save_config_func
+		self.flush_config_func = flush_config_func
+		self.apply_config_changes_func = apply_config_changes_func
 		self.app_version = app_version_ref
+		self.libretranslate_url_changed_func = libretranslate_url_changed_func
+		self.recognizer_engine_changed_func = recognizer_engine_changed_func
+		self.noise_calibration_status_func = noise_calibration_status_func
+		self.trace_recorder = trace_recorder
+		self.continuous_captioning_func = continuous_captioning_func
+		self.continuous_captioning_running_func = continuous_captioning_running_func
+		self.continuous_captioning_action = None
+		self.profiles_dir = profiles_dir
+		self.profiler = None
+		self.profiler_action = None
 
 		self.tray_icon = QtWidgets.QSystemTrayIcon(self.app)
 		self.settings_window = None
@@ -44,9 +68,23 @@ class SystemTrayApp:
 		self.tray_icon.setIcon(icon)
 		
 		self.menu = QtWidgets.QMenu()
+		if self.continuous_captioning_func is not None:
+			self.continuous_captioning_action = QtGui.QAction("Start Continuous Captioning", self.app)
+			self.continuous_captioning_action.triggered.connect(self.toggle_continuous_captioning)
+			self.menu.addAction(self.continuous_captioning_action)
+			self.menu.aboutToShow.connect(self._update_continuous_captioning_action)
+			self.menu.addSeparator()
 		settings_action = QtGui.QAction("Open Settings", self.app)
 		settings_action.triggered.connect(self.show_settings_window)
 		self.menu.addAction(settings_action)
+		if self.trace_recorder is not None:
+			debug_console_action = QtGui.QAction("Debug Console", self.app)
+			debug_console_action.triggered.connect(self.show_debug_console)
+			self.menu.addAction(debug_console_action)
+		if self.profiles_dir is not None:
+			self.profiler_action = QtGui.QAction("Start Profiler", self.app)
+			self.profiler_action.triggered.connect(self.toggle_profiler)
+			self.menu.addAction(self.profiler_action)
 		self.menu.addSeparator()
 		exit_action = QtGui.QAction("Exit", self.app)
 		exit_action.triggered.connect(self.quit_app)
@@ -78,8 +116,31 @@ class SystemTrayApp:
 					2000
 				)
 
+	def libretranslate_url_changed(self, new_url):
+		if self.libretranslate_url_changed_func:
+			try:
+				self.libretranslate_url_changed_func(new_url)
+			except Exception as e:
+				print(f"[Tray] Error while rebuilding translation client: {e}")
+
+	def recognizer_engine_changed(self):
+		if self.recognizer_engine_changed_func:
+			try:
+				self.recognizer_engine_changed_func()
+			except Exception as e:
+				print(f"[Tray] Error while preparing recognizer engine: {e}")
+
+	def noise_calibration_status(self):
+		if self.noise_calibration_status_func:
+			try:
+				return self.noise_calibration_status_func()
+			except Exception:
+				pass
+		return []
+
 	def show_settings_window(self):
 		if self.settings_window is None:
+			from gui import SettingsWindow
 			self.settings_window = SettingsWindow(self, self.current_config_ref,
 							  self.register_hotkey_translation_internal,
 							  self.register_hotkey_copy_internal,
@@ -89,6 +150,51 @@ class SystemTrayApp:
 		self.settings_window.raise_()
 		self.settings_window.activateWindow()
 
+	def show_debug_console(self):
+		if self.trace_recorder is None:
+			return
+		if self.debug_console_window is None:
+			from debug_console import DebugConsoleWindow
+			self.debug_console_window = DebugConsoleWindow(self.trace_recorder)
+		self.debug_console_window.show()
+		self.debug_console_window.raise_()
+		self.debug_console_window.activateWindow()
+
+	def _update_continuous_captioning_action(self, running=None):
+		# Captioning can also stop on its own (microphone error), so re-read the state.
+		if running is None:
+			running = bool(self.continuous_captioning_running_func and self.continuous_captioning_running_func())
+		self.continuous_captioning_action.setText(
+			"Stop Continuous Captioning" if running else "Start Continuous Captioning")
+
+	def toggle_continuous_captioning(self):
+		try:
+			running = self.continuous_captioning_func()
+		except Exception as e:
+			print(f"[Tray] Error while toggling continuous captioning: {e}")
+			self.tray_icon.showMessage("OverlayTranslator", f"Continuous captioning error: {e}",
+									   QtWidgets.QSystemTrayIcon.MessageIcon.Warning, 3000)
+			running = False
+		self._update_continuous_captioning_action(running)
+
+	def toggle_profiler(self):
+		from profiler import SamplingProfiler
+		if self.profiler is not None and self.profiler.is_running:
+			self.profiler.stop()
+			self.profiler_action.setText("Start Profiler")
+			try:
+				path = self.profiler.save(self.profiles_dir)
+				print(f"[Profiler] {self.profiler.samples} samples written to {path}")
+				self.tray_icon.showMessage("OverlayTranslator", f"Profile saved:\n{path}",
+					QtWidgets.QSystemTrayIcon.MessageIcon.Information, 4000)
+			except Exception as e:
+				print(f"[Profiler] Error saving profile: {e}")
+			return
+		self.profiler = SamplingProfiler()
+		self.profiler.start()
+		self.profiler_action.setText("Stop Profiler (save profile)")
+		print("[Profiler] Sampling started.")
+
 	def register_hotkey_translation_internal(self, new_hotkey_str):
 		try:
 			self.register_hotkey_translation_func(new_hotkey_str, self.overlay_window)
@@ -131,16 +237,49 @@ class SystemTrayApp:
 				f"Failed to set shortcut '{new_hotkey_str.upper()}'.\nError: {e}")
 			return False
 
+	def apply_config_changes(self, changes, replace=False):
+		"""
+		Applies a whole changeset (reset to defaults, imported profile) in one
+		transaction. Hotkeys are re-registered only if they changed.
+		Raises ValueError if the changeset is invalid; nothing is applied then.
+		"""
+		keyboard = _keyboard()
+		if keyboard:
+			for key in ("hotkey_translate", "hotkey_copy"):
+				if changes.get(key) and changes[key] != self.current_config_ref.get(key):
+					keyboard.parse_hotkey(changes[key])
+		changed = self.apply_config_changes_func(changes, replace=replace)
+		if "hotkey_translate" in changed:
+			try:
+				self.register_hotkey_translation_func(self.current_config_ref["hotkey_translate"], self.overlay_window)
+			except (ValueError, KeyError) as e:
+				print(f"[Tray] Cannot register translation hotkey: {e}")
+		if "hotkey_copy" in changed:
+			try:
+				self.register_hotkey_copy_func(self.current_config_ref["hotkey_copy"], self.overlay_window)
+			except (ValueError, KeyError) as e:
+				print(f"[Tray] Cannot register copy hotkey: {e}")
+		if changed & {"libretranslate_url", "libretranslate_routing", "libretranslate_hedge"}:
+			self.libretranslate_url_changed(self.current_config_ref["libretranslate_url"])
+		if "recognizer_engine" in changed:
+			self.recognizer_engine_changed()
+		return changed
+
 	def quit_app(self):
 		try:
 			self.save_config_func()
+			if self.flush_config_func:
+				self.flush_config_func()
 		except Exception:
 			pass
 		try:
+			keyboard = _keyboard()
 			if keyboard:
 				keyboard.unhook_all()
 		except Exception:
 			pass
+		if self.profiler is not None and self.profiler.is_running:
+			self.toggle_profiler()
 		if self.debug_console_window:
 			try:
 				self.debug_console_window.close()
@@ -0,0 +1,219 @@
+import collections
+import wave
+
+import numpy as np
+
+from audio_buffer import AudioAccumulator
+from modules import (
+    DEFAULT_VAD_FRAME_MS,
+    DEFAULT_VAD_START_MS,
+    DEFAULT_VAD_HANGOVER,
+    DEFAULT_VAD_ZCR_MAX,
+    DEFAULT_VAD_PRE_SPEECH_MS,
+)
+
+try:
+    import webrtcvad
+    HAS_WEBRTCVAD = True
+except ImportError:
+    HAS_WEBRTCVAD = False
+
+_DTYPES = {1: np.int8, 2: np.int16, 4: np.int32}
+
+
+class VoiceActivityDetector:
+    """
+    Frame-based speech start/end detector over a raw PCM stream.
+    A frame counts as speech when its RMS is above energy_threshold and its
+    zero-crossing rate is below zcr_max (rejects hiss/clicks); if webrtcvad is
+    installed and enabled it must agree as well. Speech starts after start_ms
+    of consecutive speech frames and ends after hangover_ms of non-speech.
+    """
+
+    def __init__(self, sample_rate, sample_width=2, energy_threshold=300.0,
+                 frame_ms=DEFAULT_VAD_FRAME_MS, start_ms=DEFAULT_VAD_START_MS,
+                 hangover_ms=DEFAULT_VAD_HANGOVER * 1000, zcr_max=DEFAULT_VAD_ZCR_MAX,
+                 use_webrtcvad=False, webrtcvad_mode=2):
+        self.sample_rate = sample_rate
+        self.sample_width = sample_width
+        self.dtype = _DTYPES[sample_width]
+        self.energy_threshold = float(energy_threshold)
+        self.zcr_max = float(zcr_max)
+        self.frame_samples = max(1, int(sample_rate * frame_ms / 1000))
+        self.frame_bytes = self.frame_samples * sample_width
+        self.frame_ms = frame_ms
+        self.start_frames = max(1, int(round(start_ms / frame_ms)))
+        self.hangover_frames = max(1, int(round(hangover_ms / frame_ms)))
+
+        self._webrtc = None
+        if use_webrtcvad and HAS_WEBRTCVAD and sample_width == 2 \
+                and sample_rate in (8000, 16000, 32000, 48000) and frame_ms in (10, 20, 30):
+            self._webrtc = webrtcvad.Vad(webrtcvad_mode)
+
+        self.noise_floor = None
+        self.reset()
+
+    def reset(self):
+        self.in_speech = False
+        self._speech_run = 0
+        self._silence_run = 0
+        self._remainder = b""
+        self.position = 0
+        self.speech_start = None
+        self.speech_end = None
+
+    def frame_features(self, pcm):
+        """(rms, zcr) arrays for every whole frame in pcm (a bytes-like object)."""
+        samples = np.frombuffer(pcm, dtype=self.dtype)
+        n_frames = len(samples) // self.frame_samples
+        frames = samples[:n_frames * self.frame_samples].reshape(n_frames, self.frame_samples).astype(np.float64)
+        rms = np.sqrt(np.mean(frames * frames, axis=1))
+        signs = np.signbit(frames)
+        zcr = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / float(self.frame_samples)
+        return rms, zcr
+
+    def speech_flags(self, pcm):
+        rms, zcr = self.frame_features(pcm)
+        flags = (rms > self.energy_threshold) & (zcr < self.zcr_max)
+        if self._webrtc is not None:
+            for i in np.nonzero(flags)[0]:
+                frame = pcm[i * self.frame_bytes:(i + 1) * self.frame_bytes]
+                flags[i] = self._webrtc.is_speech(bytes(frame), self.sample_rate)
+        # Only frames below the energy threshold are noise; a loud frame rejected
+        # for its zero-crossing rate (hiss, fricatives) would inflate the floor.
+        quiet = rms[rms <= self.energy_threshold]
+        if len(quiet):
+            level = float(np.mean(quiet))
+            self.noise_floor = level if self.noise_floor is None else 0.9 * self.noise_floor + 0.1 * level
+        return flags
+
+    def process(self, chunk):
+        """
+        Feeds raw PCM. Returns a list of ("start" | "end", byte_position) events,
+        positions counted from the first byte ever processed.
+        """
+        data = self._remainder + bytes(chunk) if self._remainder else chunk
+        usable = len(data) - len(data) % self.frame_bytes
+        self._remainder = bytes(data[usable:])
+        if usable == 0:
+            return []
+        events = []
+        base = self.position
+        for i, is_speech in enumerate(self.speech_flags(memoryview(data)[:usable])):
+            frame_end = base + (i + 1) * self.frame_bytes
+            if is_speech:
+                self._speech_run += 1
+                self._silence_run = 0
+                if not self.in_speech and self._speech_run >= self.start_frames:
+                    self.in_speech = True
+                    self.speech_start = frame_end - self._speech_run * self.frame_bytes
+                    events.append(("start", self.speech_start))
+            else:
+                self._speech_run = 0
+                self._silence_run += 1
+                if self.in_speech and self._silence_run >= self.hangover_frames:
+                    self.in_speech = False
+                    self.speech_end = frame_end - self._silence_run * self.frame_bytes
+                    events.append(("end", self.speech_end))
+        self.position = base + usable
+        return events
+
+
+def warm_up(sample_rate=16000):
+    """Runs one detector pass over silence, so numpy's first-call setup is not paid on a hotkey press."""
+    VoiceActivityDetector(sample_rate).process(bytes(sample_rate // 5))
+
+
+def measure_noise_floor(pcm, sample_rate, sample_width=2, frame_ms=DEFAULT_VAD_FRAME_MS):
+    """
+    Mean frame RMS of ambient audio: the statistic VoiceActivityDetector.noise_floor
+    tracks, so stored calibrations and live observations compare like for like.
+    Frames louder than twice the median (a cough, a door) are left out. None if
+    pcm holds less than one frame.
+    """
+    rms, _ = VoiceActivityDetector(sample_rate, sample_width, frame_ms=frame_ms).frame_features(pcm)
+    if not len(rms):
+        return None
+    quiet = rms[rms <= 2 * np.median(rms)]
+    return float(np.mean(quiet)) if len(quiet) else float(np.median(rms))
+
+
+def capture_utterance(source, detector, max_seconds, initial_timeout,
+                      pre_speech_ms=DEFAULT_VAD_PRE_SPEECH_MS, should_stop=None, on_speech_start=None):
+    """
+    Reads from an sr.AudioSource until the detector reports end of speech,
+    max_seconds of speech were captured, or no speech started within
+    initial_timeout seconds. Returns an AudioAccumulator, or None if no speech.
+    on_speech_start() is called once when the detector first reports speech.
+    Timing is derived from the audio itself, so WAV-backed sources can run
+    faster than real time.
+    """
+    bytes_per_second = source.SAMPLE_RATE * source.SAMPLE_WIDTH
+    pre_speech = collections.deque()
+    pre_speech_bytes = 0
+    pre_speech_limit = int(bytes_per_second * pre_speech_ms / 1000)
+    initial_limit = int(bytes_per_second * initial_timeout)
+    accumulator = None
+    read = 0
+
+    while True:
+        if should_stop is not None and should_stop():
+            break
+        chunk = source.stream.read(source.CHUNK)
+        if not chunk:
+            break
+        chunk_start = read
+        read += len(chunk)
+        events = detector.process(chunk)
+
+        if accumulator is None:
+            start = next((pos for kind, pos in events if kind == "start"), None)
+            if start is None:
+                pre_speech.append((chunk_start, chunk))
+                pre_speech_bytes += len(chunk)
+                while pre_speech and pre_speech_bytes - len(pre_speech[0][1]) >= pre_speech_limit:
+                    pre_speech_bytes -= len(pre_speech.popleft()[1])
+                if read >= initial_limit:
+                    return None
+                continue
+            if on_speech_start is not None:
+                on_speech_start()
+            accumulator = AudioAccumulator(source.SAMPLE_RATE, source.SAMPLE_WIDTH, max_seconds=max_seconds)
+            keep_from = max(0, start - pre_speech_limit)
+            keep_from -= keep_from % source.SAMPLE_WIDTH
+            for buffered_start, buffered in pre_speech:
+                if buffered_start + len(buffered) > keep_from:
+                    accumulator.append(memoryview(buffered)[max(0, keep_from - buffered_start):])
+            pre_speech.clear()
+            accumulator.append(memoryview(chunk)[max(0, keep_from - chunk_start):])
+            events = [e for e in events if e[1] > start]
+        else:
+            accumulator.append(chunk)
+
+        if any(kind == "end" for kind, _ in events) or accumulator.is_full:
+            break
+
+    return accumulator
+
+
+def read_wav(path):
+    """(pcm_bytes, sample_rate, sample_width) of a mono WAV file, e.g. a VAD test fixture."""
+    with wave.open(str(path), 'rb') as wav:
+        if wav.getnchannels() != 1:
+            raise ValueError(f"{path}: expected mono audio, got {wav.getnchannels()} channels")
+        return wav.readframes(wav.getnframes()), wav.getframerate(), wav.getsampwidth()
+
+
+def detect_speech_segments(pcm, sample_rate, sample_width=2, chunk_bytes=4096, **detector_kwargs):
+    """[(start_s, end_s)] of every speech segment in pcm; end_s is None if speech runs to the end."""
+    detector = VoiceActivityDetector(sample_rate, sample_width, **detector_kwargs)
+    bytes_per_second = float(sample_rate * sample_width)
+    segments = []
+    view = memoryview(pcm)
+    for offset in range(0, len(view), chunk_bytes):
+        for kind, position in detector.process(view[offset:offset + chunk_bytes]):
+            if kind == "start":
+                segments.append([position / bytes_per_second, None])
+            elif segments:
+                segments[-1][1] = position / bytes_per_second
+    return [tuple(segment) for segment in segments]
@@ -0,0 +1,54 @@
+import math
+import os
+import random
+import struct
+import sys
+import wave
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "source"))
+
+SAMPLE_RATE = 16000
+NOISE_LEVEL = 40
+SPEECH_LEVEL = 4000
+
+
+def _speech_sample(t):
+    """Voiced, syllable-modulated harmonic signal: loud with a low zero-crossing rate, like speech."""
+    envelope = 0.6 + 0.4 * math.sin(2 * math.pi * 4 * t)
+    tone = sum(math.sin(2 * math.pi * 140 * k * t) / k for k in range(1, 5))
+    return SPEECH_LEVEL * envelope * tone / 2
+
+
+def write_wav(path, layout, sample_rate=SAMPLE_RATE, seed=0):
+    """
+    Mono 16-bit WAV from a layout of (kind, seconds) blocks over low background
+    noise. kind: "silence", "speech" or "hiss" (loud white noise, high zero-crossing rate).
+    """
+    rng = random.Random(seed)
+    samples = []
+    for kind, seconds in layout:
+        for i in range(int(seconds * sample_rate)):
+            value = rng.gauss(0, NOISE_LEVEL)
+            if kind == "speech":
+                value += _speech_sample(i / sample_rate)
+            elif kind == "hiss":
+                value += rng.gauss(0, SPEECH_LEVEL / 2)
+            samples.append(max(-32768, min(32767, int(value))))
+    with wave.open(str(path), 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(struct.pack(f"<{len(samples)}h", *samples))
+    return path
+
+
+@pytest.fixture
+def wav_fixture(tmp_path):
+    """wav_fixture(layout) -> path of a WAV file written from the layout (see write_wav)."""
+    counter = iter(range(1000))
+
+    def make(layout, **kwargs):
+        return write_wav(tmp_path / f"fixture-{next(counter)}.wav", layout, **kwargs)
+    return make
@@ -0,0 +1,27 @@
+from audio_buffer import AudioAccumulator
+
+
+def test_append_stops_at_max_seconds():
+    accumulator = AudioAccumulator(sample_rate=100, sample_width=2, max_seconds=1)
+    assert accumulator.append(b"\1" * 150) == 150
+    assert accumulator.append(b"\2" * 150) == 50
+    assert accumulator.is_full
+    assert accumulator.append(b"\3" * 10) == 0
+    assert bytes(accumulator.view()) == b"\1" * 150 + b"\2" * 50
+    assert accumulator.duration == 1.0
+
+
+def test_nothing_is_allocated_up_front():
+    accumulator = AudioAccumulator(sample_rate=48000, sample_width=2, max_seconds=120)
+    accumulator.append(b"\0" * 960)
+    assert len(accumulator.view().obj) == 960
+
+
+def test_earlier_view_survives_later_appends():
+    accumulator = AudioAccumulator(sample_rate=100, sample_width=2)
+    accumulator.append(b"ab")
+    view = accumulator.view()
+    accumulator.append(b"cd" * 1000)
+    assert bytes(view) == b"ab"
+    assert len(accumulator) == 2002
+    assert accumulator.reallocations == 1
@@ -0,0 +1,167 @@
+import json
+import time
+
+import pytest
+
+import config_store
+from config_store import ConfigStore, ConfigValidationError, validate_config_changes
+from modules import DEFAULT_CONFIG_STRUCT
+
+
+@pytest.fixture
+def base():
+    return dict(DEFAULT_CONFIG_STRUCT)
+
+
+def errors_of(changes, base):
+    with pytest.raises(ConfigValidationError) as info:
+        validate_config_changes(changes, base)
+    return info.value.errors
+
+
+def test_defaults_are_valid(base):
+    validate_config_changes({}, base)
+    validate_config_changes(dict(base), base)
+
+
+def test_unknown_key(base):
+    assert errors_of({"no_such_setting": 1}, base) == ["Unknown setting 'no_such_setting'"]
+
+
+def test_optional_keys_are_accepted(base):
+    validate_config_changes({
+        "vosk_model_paths": {"pl": "models/pl"},
+        "google_speech_endpoint": "http://localhost:9000/recognize",
+        "fake_translator_latency": 0.2,
+        "config_save_debounce": 1,
+        "pipeline_queue_size": 8,
+        "pipeline_max_pending_presses": 2,
+    }, base)
+
+
+def test_optional_keys_are_type_checked(base):
+    errors = errors_of({"pipeline_queue_size": "eight", "vosk_model_paths": ["models/pl"]}, base)
+    assert len(errors) == 2
+
+
+def test_type_mismatch(base):
+    errors = errors_of({"font_size": "big", "translation_cache_enabled": 1}, base)
+    assert errors == ["Invalid value for 'font_size': 'big'", "Invalid value for 'translation_cache_enabled': 1"]
+
+
+def test_int_and_float_are_interchangeable(base):
+    validate_config_changes({"overlay_display_time": 3, "font_size": 14.0}, base)
+
+
+def test_bool_is_not_a_number(base):
+    assert errors_of({"font_size": True}, base)
+
+
+def test_target_language_string_or_list(base):
+    validate_config_changes({"target_language": ["en", "de"]}, base)
+    assert errors_of({"target_language": []}, base)
+    assert errors_of({"target_language": ["en", ""]}, base)
+
+
+def test_libretranslate_urls(base):
+    validate_config_changes({"libretranslate_url": ["http://a:5000", "https://b"]}, base)
+    assert errors_of({"libretranslate_url": "ftp://a"}, base) == ["Invalid LibreTranslate URL 'ftp://a'"]
+    assert errors_of({"libretranslate_url": ["http://a:5000", "b"]}, base) == ["Invalid LibreTranslate URL 'b'"]
+
+
+def test_hotkeys_must_differ(base):
+    errors = errors_of({"hotkey_copy": base["hotkey_translate"]}, base)
+    assert errors == [f"Translation and copy hotkeys must differ ('{base['hotkey_translate']}')"]
+
+
+def test_enumerated_settings(base):
+    errors = errors_of({
+        "overlay_position": "nowhere",
+        "libretranslate_routing": "random",
+        "recognizer_audio_codec": "mp3",
+    }, base)
+    assert errors == [
+        "Unknown overlay position 'nowhere'",
+        "Unknown LibreTranslate routing 'random'",
+        "Unknown recognizer audio codec 'mp3'",
+    ]
+
+
+def test_every_problem_is_reported(base):
+    assert len(errors_of({"bogus": 1, "font_size": "x", "overlay_position": "nowhere"}, base)) == 3
+
+
+@pytest.fixture
+def make_store(tmp_path):
+    stores = []
+
+    def make(data=None, debounce=0.05):
+        path = tmp_path / "settings.json"
+        store = ConfigStore(path, dict(data or DEFAULT_CONFIG_STRUCT), debounce=debounce)
+        stores.append(store)
+        return store
+    yield make
+    for store in stores:
+        store.close()
+
+
+def wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def test_burst_of_saves_is_written_once(make_store):
+    store = make_store(debounce=0.1)
+    for size in range(10, 30):
+        store.data["font_size"] = size
+        store.request_save()
+    assert store.save_requests == 20
+    assert wait_for(lambda: store.write_count == 1)
+    time.sleep(0.2)
+    assert store.write_count == 1
+    assert json.loads(store.path.read_text(encoding="utf-8"))["font_size"] == 29
+
+
+def test_flush_on_close_writes_pending_changes(make_store):
+    store = make_store(debounce=60.0)
+    store.data["font_size"] = 31
+    store.request_save()
+    assert store.write_count == 0
+    store.close()
+    assert store.write_count == 1
+    assert json.loads(store.path.read_text(encoding="utf-8"))["font_size"] == 31
+
+
+def test_failed_write_keeps_the_old_file(make_store, monkeypatch):
+    store = make_store(debounce=60.0)
+    store.apply_changes({"font_size": 20})
+    original = store.path.read_bytes()
+
+    def interrupted_replace(src, dst):
+        raise OSError("disk full")
+    monkeypatch.setattr(config_store.os, "replace", interrupted_replace)
+    store.apply_changes({"font_size": 40})
+
+    assert store.path.read_bytes() == original
+    assert not store.path.with_name(store.path.name + ".tmp").exists()
+    assert store.write_count == 1
+
+
+def test_publish_reports_only_changed_keys(make_store):
+    store = make_store(debounce=60.0)
+    events = []
+    store.subscribe(lambda snapshot, changed: events.append((snapshot.version, changed)))
+    store.request_save()
+    store.data["font_size"] = 25
+    store.data["target_language"] = ["en", "de"]
+    store.request_save()
+    assert events == [(1, frozenset({"font_size", "target_language"}))]
+    snapshot = store.snapshot()
+    assert snapshot["font_size"] == 25
+    # The snapshot holds its own copy: later edits of the live config do not leak into it.
+    store.data["target_language"].append("fr")
+    assert snapshot["target_language"] == ["en", "de"]
@@ -0,0 +1,118 @@
+import pytest
+
+from endpoint_pool import EndpointPool
+from health import TranslatorUnavailable, BREAKER_OPEN
+
+
+class FakeClient:
+    """Stands in for LibreTranslateClient: returns a canned answer, or None like a failed request."""
+
+    def __init__(self, server_url, answer="ok"):
+        self.server_url = server_url
+        self.answer = answer
+        self.breaker = None
+        self.calls = 0
+        self.closed = False
+
+    def translate(self, text, source_lang="pl", target_lang="en"):
+        self.calls += 1
+        if self.answer is None:
+            self.breaker.record_failure()
+            return None
+        return f"{self.answer}:{text}"
+
+    def close(self):
+        self.closed = True
+
+
+def make_pool(*answers, **kwargs):
+    clients = [FakeClient(f"http://replica-{i}", answer) for i, answer in enumerate(answers)]
+    return EndpointPool(clients, **kwargs), clients
+
+
+def urls(endpoints):
+    return [endpoint.url for endpoint in endpoints]
+
+
+def test_lowest_ewma_first():
+    pool, _ = make_pool("a", "b", "c")
+    for endpoint, ewma in zip(pool.endpoints, (0.3, 0.1, 0.2)):
+        endpoint.ewma = ewma
+    assert urls(pool.candidates("pl", "en")) == ["http://replica-1", "http://replica-2", "http://replica-0"]
+
+
+def test_ewma_is_weighted_by_outstanding_requests():
+    pool, _ = make_pool("a", "b")
+    pool.endpoints[0].ewma, pool.endpoints[0].outstanding = 0.1, 3
+    pool.endpoints[1].ewma = 0.2
+    assert urls(pool.candidates("pl", "en"))[0] == "http://replica-1"
+
+
+def test_least_outstanding_policy():
+    pool, _ = make_pool("a", "b", routing="least_outstanding")
+    pool.endpoints[0].ewma, pool.endpoints[0].outstanding = 0.1, 2
+    pool.endpoints[1].ewma, pool.endpoints[1].outstanding = 0.5, 1
+    assert urls(pool.candidates("pl", "en"))[0] == "http://replica-1"
+
+
+def test_only_replicas_with_the_pair():
+    pool, _ = make_pool("a", "b")
+    pool.endpoints[0].set_languages([{"code": "pl", "targets": ["en"]}])
+    pool.endpoints[1].set_languages([{"code": "pl", "targets": ["de"]}])
+    assert urls(pool.candidates("pl", "de")) == ["http://replica-1"]
+
+
+def test_unknown_pair_falls_back_to_every_replica():
+    pool, _ = make_pool("a", "b")
+    for endpoint in pool.endpoints:
+        endpoint.set_languages([{"code": "pl", "targets": ["en"]}])
+    assert len(pool.candidates("ja", "ko")) == 2
+
+
+def test_tripped_replicas_are_skipped():
+    pool, _ = make_pool("a", "b")
+    pool.endpoints[0].breaker.trip()
+    assert urls(pool.candidates("pl", "en")) == ["http://replica-1"]
+
+
+def test_all_tripped_raises_until_a_trial_is_allowed():
+    pool, _ = make_pool("a", "b")
+    now = [0.0]
+    for endpoint in pool.endpoints:
+        endpoint.breaker.clock = lambda: now[0]
+        endpoint.breaker.trip()
+    with pytest.raises(TranslatorUnavailable):
+        pool.candidates("pl", "en")
+    assert pool.rejected == 1
+    now[0] += pool.endpoints[0].breaker.reset_timeout
+    assert len(pool.candidates("pl", "en")) == 1
+
+
+def test_failed_request_fails_over_to_the_next_replica():
+    pool, clients = make_pool(None, "b")
+    pool.endpoints[0].ewma = 0.01
+    pool.endpoints[1].ewma = 0.02
+    assert pool.translate("tekst") == "b:tekst"
+    assert clients[0].calls == 1
+    assert pool.failovers == 1
+
+
+def test_failing_replica_trips_and_stops_getting_traffic():
+    pool, clients = make_pool(None, "b")
+    for _ in range(10):
+        pool.endpoints[0].ewma = 0.0
+        assert pool.translate("tekst") == "b:tekst"
+    assert pool.endpoints[0].breaker.state == BREAKER_OPEN
+    assert clients[0].calls == pool.endpoints[0].breaker.failure_threshold
+
+
+def test_close_closes_every_client():
+    pool, clients = make_pool("a", "b", hedge=True)
+    pool.close()
+    assert all(client.closed for client in clients)
+
+
+def test_hedged_call_after_close_runs_directly():
+    pool, clients = make_pool("a", "b", hedge=True)
+    pool.close()
+    assert pool.translate("tekst") in ("a:tekst", "b:tekst")
@@ -0,0 +1,80 @@
+import pytest
+
+from health import BREAKER_CLOSED, BREAKER_HALF_OPEN, BREAKER_OPEN, CircuitBreaker
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def breaker(clock):
+    return CircuitBreaker(failure_threshold=3, reset_timeout=10.0, clock=clock)
+
+
+def test_opens_after_consecutive_failures(breaker):
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == BREAKER_CLOSED
+    assert breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state == BREAKER_OPEN
+    assert not breaker.allow_request()
+    assert breaker.rejected == 1
+
+
+def test_success_resets_the_failure_count(breaker):
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == BREAKER_CLOSED
+
+
+def test_single_trial_after_reset_timeout(breaker, clock):
+    breaker.trip()
+    clock.now += 9.9
+    assert not breaker.allow_request()
+    clock.now += 0.1
+    assert breaker.allow_request()
+    assert breaker.state == BREAKER_HALF_OPEN
+    # Only one trial request at a time.
+    assert not breaker.allow_request()
+
+
+def test_trial_success_closes(breaker, clock):
+    breaker.trip()
+    clock.now += 10.0
+    assert breaker.allow_request()
+    breaker.record_success()
+    assert breaker.state == BREAKER_CLOSED
+    assert breaker.allow_request()
+
+
+def test_trial_failure_reopens_for_a_full_timeout(breaker, clock):
+    breaker.trip()
+    clock.now += 10.0
+    assert breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state == BREAKER_OPEN
+    clock.now += 5.0
+    assert not breaker.allow_request()
+    clock.now += 5.0
+    assert breaker.allow_request()
+
+
+def test_reset_closes_an_open_breaker(breaker):
+    breaker.trip()
+    breaker.reset()
+    assert breaker.state == BREAKER_CLOSED
+    assert breaker.allow_request()
@@ -0,0 +1,107 @@
+import json
+import random
+import struct
+import time
+
+import pytest
+
+import noise_calibration
+from conftest import NOISE_LEVEL, SAMPLE_RATE
+from noise_calibration import NoiseCalibrator
+
+
+class FakeRecognizer:
+    energy_threshold = 300.0
+    dynamic_energy_ratio = 1.5
+
+
+class FakeStream:
+    def __init__(self, on_read=None):
+        self.on_read = on_read
+        self.rng = random.Random(0)
+
+    def read(self, frames):
+        if self.on_read is not None:
+            self.on_read()
+        samples = [int(self.rng.gauss(0, NOISE_LEVEL)) for _ in range(frames)]
+        return struct.pack(f"<{frames}h", *samples)
+
+
+class FakeSource:
+    SAMPLE_RATE = SAMPLE_RATE
+    SAMPLE_WIDTH = 2
+    CHUNK = 1024
+
+    def __init__(self, on_read=None):
+        self.stream = FakeStream(on_read)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+@pytest.fixture
+def path(tmp_path):
+    return tmp_path / "noise_calibration.json"
+
+
+def test_calibrate_stores_threshold_from_noise_floor(path):
+    calibrator = NoiseCalibrator(path, duration=0.5)
+    recognizer = FakeRecognizer()
+    threshold = calibrator.calibrate(recognizer, FakeSource(), device_index=3)
+    entry = json.loads(path.read_text(encoding="utf-8"))["3"]
+    assert entry["noise_floor"] == pytest.approx(NOISE_LEVEL, rel=0.1)
+    assert threshold == recognizer.energy_threshold == entry["energy_threshold"]
+    assert not path.with_name(path.name + ".tmp").exists()
+
+
+def test_interrupted_measurement_is_discarded(path):
+    calibrator = NoiseCalibrator(path, duration=0.5)
+    recognizer = FakeRecognizer()
+    reads = []
+    source = FakeSource(on_read=lambda: reads.append(1))
+    assert calibrator.calibrate(recognizer, source, interrupted=lambda: len(reads) >= 2) is None
+    assert recognizer.energy_threshold == 300.0
+    assert calibrator.status() == []
+    assert not path.exists()
+
+
+def test_background_recalibration_skips_a_sample_taken_during_capture(path):
+    busy = [False]
+
+    def start_capture():
+        busy[0] = True  # hotkey pressed while the calibrator listens
+
+    calibrator = NoiseCalibrator(path, duration=0.2, is_busy_func=lambda: busy[0],
+                                 source_factory=lambda device_index: FakeSource(on_read=start_capture))
+    calibrator.request_recalibration()
+    calibrator.start(check_interval=0.01)
+    try:
+        time.sleep(0.2)
+        assert calibrator.status() == []
+        calibrator.source_factory = lambda device_index: FakeSource()
+        busy[0] = False
+        calibrator.request_recalibration()
+        deadline = time.monotonic() + 2
+        while not calibrator.status() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        status, = calibrator.status()
+        assert status["device"] == "default" and not status["pending"]
+    finally:
+        calibrator.stop()
+
+
+def test_failed_save_keeps_the_old_file(path, monkeypatch):
+    calibrator = NoiseCalibrator(path, duration=0.2)
+    calibrator.calibrate(FakeRecognizer(), FakeSource())
+    original = path.read_bytes()
+
+    def interrupted_replace(src, dst):
+        raise OSError("disk full")
+    monkeypatch.setattr(noise_calibration.os, "replace", interrupted_replace)
+    calibrator.calibrate(FakeRecognizer(), FakeSource(), device_index=1)
+
+    assert path.read_bytes() == original
+    assert not path.with_name(path.name + ".tmp").exists()
@@ -0,0 +1,59 @@
+import os
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+QtWidgets = pytest.importorskip("PyQt6.QtWidgets")
+
+from config_store import ConfigSnapshot
+from modules import DEFAULT_CONFIG_STRUCT, OVERLAY_POSITIONS
+from overlay import OverlayWindow
+
+LONG_TEXT = ("The overlay wraps long translations over several lines, so its height "
+             "has to come from the same padding the label is styled with. ") * 3
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+
+def make_overlay(config):
+    return OverlayWindow(
+        initial_width=config["overlay_min_width"],
+        initial_height=config["overlay_short_text_min_height"],
+        initial_position_key=config["overlay_position"],
+        font_size=config["font_size"],
+        text_color=config["text_color"],
+        background_color=config["background_color"],
+        padding=config["padding"],
+        overlay_min_width=config["overlay_min_width"],
+        overlay_max_width=config["overlay_max_width"],
+        overlay_min_height=config["overlay_min_height"],
+        overlay_max_height=config["overlay_max_height"],
+        overlay_short_text_min_height=config["overlay_short_text_min_height"],
+        overlay_short_text_max_height=config["overlay_short_text_max_height"],
+        overlay_display_time=config["overlay_display_time"],
+        overlay_positions_map=OVERLAY_POSITIONS,
+    )
+
+
+def label_height(overlay, width):
+    overlay.label.setText(LONG_TEXT)
+    overlay.label.ensurePolished()
+    return overlay.label.heightForWidth(width)
+
+
+def test_label_height_matches_layout_cache_after_construction(app):
+    config = DEFAULT_CONFIG_STRUCT
+    overlay = make_overlay(config)
+    width, height = overlay.layout_cache.measure(
+        LONG_TEXT, config["font_size"], config["padding"],
+        config["overlay_min_width"], config["overlay_max_width"], config["overlay_min_height"])
+    assert height > config["overlay_min_height"]
+    assert label_height(overlay, width) <= height
+
+    # The label must already carry the style measure() is written for, not only after a style change.
+    restyled = make_overlay(config)
+    restyled.apply_config_snapshot(ConfigSnapshot(1, dict(config)), {"padding"})
+    assert label_height(overlay, width) == label_height(restyled, width)
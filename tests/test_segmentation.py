@@ -0,0 +1,49 @@
+from segmentation import split_segments
+
+
+def test_short_text_is_one_segment():
+    assert split_segments("  Hello   there. ", min_chars=120) == ["Hello there."]
+
+
+def test_empty_text():
+    assert split_segments("   ") == []
+
+
+def test_splits_on_sentences():
+    text = "The first sentence is long enough to stand alone. The second one is also long enough here."
+    assert split_segments(text, min_chars=10, max_chars=200) == [
+        "The first sentence is long enough to stand alone.",
+        "The second one is also long enough here.",
+    ]
+
+
+def test_short_sentences_ride_with_the_next():
+    text = "Yes. OK. The actual content of the utterance follows after these."
+    assert split_segments(text, min_chars=10, max_chars=200) == [text]
+
+
+def test_long_sentence_splits_on_clauses():
+    clause = "this clause has quite a few words in it"
+    text = ", ".join([clause] * 6) + "."
+    segments = split_segments(text, min_chars=10, max_chars=100)
+    assert len(segments) > 1
+    assert all(len(segment) <= 100 for segment in segments)
+    assert " ".join(segments) == text
+
+
+def test_unpunctuated_text_is_word_wrapped():
+    text = " ".join(["word"] * 100)
+    segments = split_segments(text, min_chars=10, max_chars=50)
+    assert all(len(segment) <= 50 for segment in segments)
+    assert " ".join(segments) == text
+
+
+def test_overlong_word_stays_whole():
+    word = "x" * 80
+    segments = split_segments(f"short start {word} end", min_chars=10, max_chars=50)
+    assert word in segments
+
+
+def test_join_gives_back_normalized_text():
+    text = "One.  Two,\nthree;  four!  " + "five six seven " * 30 + "eight? nine."
+    assert " ".join(split_segments(text, min_chars=20, max_chars=60)) == " ".join(text.split())
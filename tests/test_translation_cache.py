@@ -0,0 +1,102 @@
+import threading
+import time
+
+import pytest
+
+from translation_cache import TranslationCache, make_cache_key
+
+
+def wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.001)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = TranslationCache(tmp_path / "cache.sqlite3")
+    yield cache
+    cache.close()
+
+
+def test_key_normalizes_whitespace_not_case():
+    assert make_cache_key(" Dzień  dobry\n", "pl", "en", "u") == make_cache_key("Dzień dobry", "pl", "en", "u")
+    assert make_cache_key("dzień dobry", "pl", "en", "u") != make_cache_key("Dzień dobry", "pl", "en", "u")
+
+
+def test_memory_then_disk_hits(tmp_path, cache):
+    cache.put("k", "v")
+    assert cache.get("k") == "v"
+    cache.close()
+    reopened = TranslationCache(tmp_path / "cache.sqlite3")
+    try:
+        assert reopened.get("k") == "v"
+        assert reopened.get("k") == "v"
+        stats = reopened.stats()
+        assert (stats["disk_hits"], stats["memory_hits"]) == (1, 1)
+    finally:
+        reopened.close()
+
+
+def test_concurrent_callers_share_one_translation(cache):
+    release = threading.Event()
+    calls = []
+
+    def translate():
+        calls.append(1)
+        release.wait(2)
+        return "hello"
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_translate("k", translate)))
+               for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    wait_for(lambda: cache.stats()["coalesced"] == 3)
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert results == ["hello"] * 4
+    assert len(calls) == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_error_reaches_every_waiting_caller(cache):
+    release = threading.Event()
+
+    def translate():
+        release.wait(2)
+        raise RuntimeError("server down")
+
+    errors = []
+
+    def call():
+        try:
+            cache.get_or_translate("k", translate)
+        except RuntimeError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=call) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    wait_for(lambda: cache.stats()["coalesced"] == 2)
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert len(errors) == 3
+
+
+def test_hit_counts_are_exact_under_concurrency(cache):
+    cache.put("k", "v")
+    lookups = 2000
+
+    def worker():
+        for _ in range(lookups):
+            cache.get("k")
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert cache.stats()["memory_hits"] == 8 * lookups
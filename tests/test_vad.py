@@ -0,0 +1,83 @@
+import pytest
+
+from conftest import NOISE_LEVEL
+from vad import VoiceActivityDetector, detect_speech_segments, measure_noise_floor, read_wav
+
+FRAME = 0.03
+VAD_SETTINGS = {"energy_threshold": 300.0, "frame_ms": 30, "start_ms": 90, "hangover_ms": 400}
+
+
+def segments_of(path, **overrides):
+    pcm, rate, width = read_wav(path)
+    return detect_speech_segments(pcm, rate, width, **dict(VAD_SETTINGS, **overrides))
+
+
+def test_single_utterance_start_and_end(wav_fixture):
+    path = wav_fixture([("silence", 1.0), ("speech", 1.5), ("silence", 1.0)])
+    (start, end), = segments_of(path)
+    assert start == pytest.approx(1.0, abs=FRAME)
+    assert end == pytest.approx(2.5, abs=FRAME)
+
+
+def test_silence_only_has_no_segments(wav_fixture):
+    assert segments_of(wav_fixture([("silence", 2.0)])) == []
+
+
+def test_pause_shorter_than_hangover_is_bridged(wav_fixture):
+    path = wav_fixture([("silence", 0.5), ("speech", 0.6), ("silence", 0.2), ("speech", 0.6), ("silence", 1.0)])
+    (start, end), = segments_of(path)
+    assert start == pytest.approx(0.5, abs=FRAME)
+    assert end == pytest.approx(1.9, abs=FRAME)
+
+
+def test_pause_longer_than_hangover_splits(wav_fixture):
+    path = wav_fixture([("silence", 0.5), ("speech", 0.6), ("silence", 0.8), ("speech", 0.6), ("silence", 1.0)])
+    first, second = segments_of(path)
+    assert first == pytest.approx((0.5, 1.1), abs=FRAME)
+    assert second == pytest.approx((1.9, 2.5), abs=FRAME)
+
+
+def test_end_is_reported_only_after_the_hangover(wav_fixture):
+    # 0.3 s of trailing silence is shorter than the 0.4 s hangover: speech never ends.
+    path = wav_fixture([("silence", 0.5), ("speech", 1.0), ("silence", 0.3)])
+    (start, end), = segments_of(path)
+    assert start == pytest.approx(0.5, abs=FRAME)
+    assert end is None
+
+
+def test_burst_shorter_than_start_ms_is_ignored(wav_fixture):
+    path = wav_fixture([("silence", 0.5), ("speech", 0.03), ("silence", 1.0)])
+    assert segments_of(path) == []
+
+
+def test_chunk_size_does_not_change_positions(wav_fixture):
+    path = wav_fixture([("silence", 0.7), ("speech", 0.8), ("silence", 0.9)])
+    assert segments_of(path, chunk_bytes=333) == segments_of(path, chunk_bytes=16000)
+
+
+def test_hiss_is_not_speech_and_not_noise_floor(wav_fixture):
+    pcm, rate, width = read_wav(wav_fixture([("silence", 0.5), ("hiss", 1.0), ("silence", 0.5)]))
+    detector = VoiceActivityDetector(rate, width, **VAD_SETTINGS)
+    assert detector.process(pcm) == []
+    # Loud frames rejected for their zero-crossing rate must not raise the noise floor.
+    assert detector.noise_floor == pytest.approx(NOISE_LEVEL, rel=0.2)
+
+
+def test_measure_noise_floor_matches_vad_floor(wav_fixture):
+    pcm, rate, width = read_wav(wav_fixture([("silence", 1.0)]))
+    detector = VoiceActivityDetector(rate, width, **VAD_SETTINGS)
+    detector.process(pcm)
+    assert measure_noise_floor(pcm, rate, width) == pytest.approx(NOISE_LEVEL, rel=0.1)
+    assert measure_noise_floor(pcm, rate, width) == pytest.approx(detector.noise_floor, rel=0.1)
+
+
+def test_read_wav_rejects_stereo(tmp_path):
+    import wave
+    path = tmp_path / "stereo.wav"
+    with wave.open(str(path), 'wb') as wav:
+        wav.setnchannels(2)
+        wav.setsampwidth(2)
+        wav.setframerate(16000)
+        wav.writeframes(b"\0" * 400)
+    with pytest.raises(ValueError):
+        read_wav(path)